@@ -1,18 +1,48 @@
+import asyncio
+from contextlib import AbstractContextManager, nullcontext
+from datetime import datetime
+from pathlib import Path
+from typing import Annotated
+from uuid import UUID
+
 import typer
 
 from numbat.api.app import AppBuilder
+from numbat.api.channels import SocketChannelsBroker
+from numbat.benchmarks.load import LoadOperation, LoadTester, LoadTestError
+from numbat.benchmarks.render import LoadReportTableBuilder, ReportTableBuilder
+from numbat.benchmarks.runner import (
+    BaselineComparator,
+    BaselineStore,
+    BenchmarkRunner,
+    BenchmarkSuite,
+)
 from numbat.cli import CliBuilder
 from numbat.config.builder import ConfigBuilder
 from numbat.config.errors import ConfigError
+from numbat.config.models import ChannelsBackendType, ChannelsConfig
 from numbat.console import FallbackConsoleBuilder
 from numbat.server import Server
+from numbat.services.events.channels import EventsChannels
 
 cli = CliBuilder().build()
 
 
-@cli.command()
-def main() -> None:
+def _broker(config: ChannelsConfig) -> AbstractContextManager[None]:
+    if config.backend != ChannelsBackendType.SOCKET:
+        return nullcontext()
+
+    return SocketChannelsBroker(
+        config.socket, stamped=EventsChannels.names()
+    ).threaded()
+
+
+@cli.callback(invoke_without_command=True)
+def main(context: typer.Context) -> None:
     """Run main entry point."""
+    if context.invoked_subcommand is not None:
+        return
+
     console = FallbackConsoleBuilder().build()
 
     try:
@@ -31,12 +61,147 @@ def main() -> None:
 
     try:
         server = Server(app, config.server)
-        server.run()
+
+        with _broker(config.events.channels):
+            server.run()
     except Exception as ex:
         console.print("Failed to run server!")
         console.print_exception()
         raise typer.Exit(3) from ex
 
 
+@cli.command()
+def bench(  # noqa: PLR0913
+    only: Annotated[
+        list[str] | None,
+        typer.Option(help="Run only benchmarks with names matching these patterns."),
+    ] = None,
+    quick: Annotated[  # noqa: FBT002
+        bool, typer.Option(help="Use smaller inputs and skip the slowest benchmarks.")
+    ] = False,
+    rounds: Annotated[
+        int, typer.Option(min=1, help="Number of measured rounds of each benchmark.")
+    ] = 5,
+    warmup: Annotated[
+        int, typer.Option(min=0, help="Number of warmup rounds of each benchmark.")
+    ] = 1,
+    save: Annotated[
+        Path | None, typer.Option(help="Save the results as a baseline to this file.")
+    ] = None,
+    compare: Annotated[
+        Path | None,
+        typer.Option(help="Compare the results with the baseline in this file."),
+    ] = None,
+    tolerance: Annotated[
+        float,
+        typer.Option(min=0, help="Relative slowdown that is not flagged."),
+    ] = 0.2,
+) -> None:
+    """Run the benchmark suite and print a report."""
+    console = FallbackConsoleBuilder().build()
+
+    benchmarks = BenchmarkSuite(quick=quick).build(only)
+    runner = BenchmarkRunner(rounds=rounds, warmup=warmup)
+    store = BaselineStore()
+
+    try:
+        baseline = store.load(compare) if compare is not None else None
+    except (OSError, ValueError) as ex:
+        console.print("Failed to load baseline!")
+        console.print_exception()
+        raise typer.Exit(1) from ex
+
+    with console.status("Running benchmarks..."):
+        report = asyncio.run(runner.run(benchmarks))
+
+    comparison = (
+        BaselineComparator(tolerance).compare(baseline, report)
+        if baseline is not None
+        else None
+    )
+
+    console.print(ReportTableBuilder(report, comparison).build())
+
+    if save is not None:
+        store.save(save, report)
+
+    if comparison is not None and comparison.regressions:
+        names = ", ".join(change.name for change in comparison.regressions)
+        console.print(f"Regressions found: {names}")
+        raise typer.Exit(2)
+
+
+@cli.command()
+def loadtest(  # noqa: PLR0913
+    event: Annotated[
+        UUID, typer.Argument(help="Identifier of the prerecorded event to test with.")
+    ],
+    url: Annotated[
+        str, typer.Option(help="Base URL of the running service.")
+    ] = "http://localhost:10600",
+    concurrency: Annotated[
+        int, typer.Option(min=1, help="Number of requests kept in flight.")
+    ] = 16,
+    duration: Annotated[
+        float, typer.Option(min=0, help="Number of seconds to send requests for.")
+    ] = 30,
+    list_: Annotated[
+        int, typer.Option("--list", min=0, help="Weight of listing prerecordings.")
+    ] = 1,
+    head: Annotated[
+        int, typer.Option(min=0, help="Weight of HEAD requests for prerecordings.")
+    ] = 1,
+    download: Annotated[
+        int, typer.Option(min=0, help="Weight of downloading prerecordings.")
+    ] = 1,
+    upload: Annotated[
+        int, typer.Option(min=0, help="Weight of uploading prerecordings.")
+    ] = 0,
+    upload_start: Annotated[
+        list[datetime] | None,
+        typer.Option(
+            help="Start of an instance whose prerecording uploads can replace."
+        ),
+    ] = None,
+    size: Annotated[
+        int, typer.Option(min=1, help="Number of bytes of uploaded prerecordings.")
+    ] = 1024**2,
+    seed: Annotated[
+        int | None, typer.Option(help="Seed of the random choice of operations.")
+    ] = None,
+) -> None:
+    """Drive a running service with a mix of requests and report latency."""
+    console = FallbackConsoleBuilder().build()
+
+    tester = LoadTester(
+        url=url,
+        event=event,
+        mix={
+            LoadOperation.LIST: list_,
+            LoadOperation.HEAD: head,
+            LoadOperation.DOWNLOAD: download,
+            LoadOperation.UPLOAD: upload,
+        },
+        concurrency=concurrency,
+        duration=duration,
+        uploads=upload_start or [],
+        size=size,
+        seed=seed,
+    )
+
+    try:
+        with console.status("Running load test..."):
+            report = asyncio.run(tester.run())
+    except LoadTestError as ex:
+        console.print(str(ex))
+        raise typer.Exit(1) from ex
+    except Exception as ex:
+        console.print("Failed to run load test!")
+        console.print_exception()
+        raise typer.Exit(2) from ex
+
+    console.print(LoadReportTableBuilder(report).build())
+
+
 if __name__ == "__main__":
     cli()
@@ -1,20 +1,47 @@
-from collections.abc import Callable, Sequence
+import os
+from collections.abc import Callable, Mapping, Sequence
 from contextlib import AbstractAsyncContextManager
 
 from litestar import Litestar
 from litestar.channels import ChannelsPlugin
+from litestar.channels.backends.base import ChannelsBackend
 from litestar.channels.backends.memory import MemoryChannelsBackend
+from litestar.middleware import DefineMiddleware
 from litestar.openapi import OpenAPIConfig
 from litestar.plugins import PluginProtocol
+from litestar.types import Middleware
 
-from numbat.api.lifespans import SuppressHTTPXLoggingLifespan, TestLifespan
+from numbat.api.bandwidth import BandwidthLimiter
+from numbat.api.channels import SocketChannelsBackend
+from numbat.api.lifespans import (
+    AmberLifespan,
+    EventsLifespan,
+    MonitorLifespan,
+    ScheduleLifespan,
+    SuppressHTTPXLoggingLifespan,
+    TestLifespan,
+    TracingLifespan,
+)
+from numbat.api.middleware import TracingMiddleware
 from numbat.api.openapi import OpenAPIConfigBuilder
 from numbat.api.plugins.pydantic import PydanticPlugin
 from numbat.api.routes.router import router
-from numbat.config.models import Config
+from numbat.api.streams import StreamMeter
+from numbat.config.builder import ConfigBuilder
+from numbat.config.models import ChannelsBackendType, Config, TracingExporterType
 from numbat.services.apis.beaver.service import BeaverService
 from numbat.services.data.amber.service import AmberService
+from numbat.services.entities.prerecordings.service import PrerecordingsService
+from numbat.services.events.channels import EventsChannels
+from numbat.services.events.dispatcher import EventsDispatcher
+from numbat.services.events.service import EventsService
+from numbat.services.schedule.service import ScheduleService
 from numbat.state import State
+from numbat.utils.memory import AllocationProfiler
+from numbat.utils.metrics import Registry
+from numbat.utils.monitor import LoopMonitor
+from numbat.utils.profiler import SamplingProfiler
+from numbat.utils.tracing import Exporter, MemoryExporter, OTLPFileExporter, Tracer
 
 
 class AppBuilder:
@@ -34,33 +61,144 @@ class AppBuilder:
         return [
             TestLifespan,
             SuppressHTTPXLoggingLifespan,
+            ScheduleLifespan,
+            EventsLifespan,
+            AmberLifespan,
+            TracingLifespan,
+            MonitorLifespan,
         ]
 
     def _build_openapi_config(self) -> OpenAPIConfig:
         return OpenAPIConfigBuilder().build()
 
-    def _build_plugins(self) -> Sequence[PluginProtocol]:
+    def _build_channels_backend(self) -> ChannelsBackend:
+        config = self._config.events.channels
+
+        match config.backend:
+            case ChannelsBackendType.MEMORY:
+                return MemoryChannelsBackend()
+            case ChannelsBackendType.SOCKET:
+                return SocketChannelsBackend(config.socket)
+
+    def _build_channels(self) -> ChannelsPlugin:
+        return ChannelsPlugin(
+            backend=self._build_channels_backend(), channels=EventsChannels.names()
+        )
+
+    def _build_tracing_exporter(self) -> Exporter | None:
+        config = self._config.tracing
+
+        match config.exporter:
+            case TracingExporterType.NONE:
+                return None
+            case TracingExporterType.MEMORY:
+                return MemoryExporter()
+            case TracingExporterType.FILE:
+                return OTLPFileExporter(config.file)
+
+    def _build_tracer(self) -> Tracer:
+        return Tracer(self._build_tracing_exporter())
+
+    def _build_middleware(self, tracer: Tracer) -> Sequence[Middleware]:
         return [
-            ChannelsPlugin(backend=MemoryChannelsBackend(), channels=["events"]),
+            DefineMiddleware(TracingMiddleware, tracer=tracer),
+        ]
+
+    def _build_plugins(self, channels: ChannelsPlugin) -> Sequence[PluginProtocol]:
+        return [
+            channels,
             PydanticPlugin(),
         ]
 
-    def _build_initial_state(self) -> State:
+    def _build_metrics_labels(self) -> Mapping[str, str]:
+        if self._config.server.workers == 1:
+            return {}
+
+        return {"worker": str(os.getpid())}
+
+    def _build_initial_state(self, channels: ChannelsPlugin, tracer: Tracer) -> State:
+        metrics = Registry(labels=self._build_metrics_labels())
+        beaver = BeaverService(
+            config=self._config.beaver,
+            priority=self._config.priority,
+            metrics=metrics,
+            tracer=tracer,
+        )
+
+        amber = AmberService(
+            config=self._config.amber,
+            priority=self._config.priority,
+            metrics=metrics,
+            tracer=tracer,
+        )
+
+        dispatcher = EventsDispatcher(
+            channels=channels, config=self._config.events, metrics=metrics
+        )
+
+        schedule = ScheduleService(
+            beaver=beaver,
+            config=self._config.schedule,
+            metrics=metrics,
+            shared=self._config.server.workers > 1,
+        )
+
         return State(
             {
-                "amber": AmberService(config=self._config.amber),
-                "beaver": BeaverService(config=self._config.beaver),
+                "allocations": AllocationProfiler(),
+                "amber": amber,
+                "bandwidth": BandwidthLimiter(
+                    config=self._config.bandwidth,
+                    priority=self._config.priority,
+                    trusted=self._config.server.trusted,
+                    metrics=metrics,
+                ),
+                "beaver": beaver,
                 "config": self._config,
+                "dispatcher": dispatcher,
+                "metrics": metrics,
+                "monitor": LoopMonitor(
+                    config=self._config.monitor,
+                    executors={"amber": amber.executor},
+                    metrics=metrics,
+                ),
+                "prerecordings": PrerecordingsService(
+                    amber=amber,
+                    beaver=beaver,
+                    schedule=schedule,
+                    events=EventsService(dispatcher=dispatcher),
+                    priority=self._config.priority,
+                    metrics=metrics,
+                    tracer=tracer,
+                ),
+                "profiler": SamplingProfiler(
+                    interval=self._config.admin.profiler.interval
+                ),
+                "schedule": schedule,
+                "streams": StreamMeter(metrics=metrics),
+                "tracer": tracer,
             }
         )
 
     def build(self) -> Litestar:
         """Build the app."""
+        channels = self._build_channels()
+        tracer = self._build_tracer()
+
         return Litestar(
             route_handlers=[router],
             debug=self._config.debug,
             lifespan=self._build_lifespan(),
+            middleware=self._build_middleware(tracer),
             openapi_config=self._build_openapi_config(),
-            plugins=self._build_plugins(),
-            state=self._build_initial_state(),
+            plugins=self._build_plugins(channels),
+            state=self._build_initial_state(channels, tracer),
         )
+
+
+def build() -> Litestar:
+    """Build the app from the configuration in the environment.
+
+    Worker processes of the server use this as the app factory.
+    """
+    return AppBuilder(ConfigBuilder().build()).build()
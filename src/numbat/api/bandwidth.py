@@ -0,0 +1,219 @@
+import asyncio
+import ipaddress
+import time
+from collections.abc import AsyncGenerator, Mapping, Sequence
+
+from numbat.api.streams import Direction
+from numbat.config.models import BandwidthConfig, PriorityConfig
+from numbat.utils.metrics import Registry
+from numbat.utils.priority import CURRENT_PRIORITY, Priority
+
+
+class TokenBucket:
+    """Token bucket that refills at a constant rate.
+
+    Taking more tokens than available puts the bucket in debt,
+    so that concurrent consumers share the rate fairly.
+
+    Args:
+        rate: Number of tokens added per second.
+        burst: Maximum number of tokens in the bucket.
+
+    """
+
+    def __init__(self, rate: float, burst: float) -> None:
+        self._rate = rate
+        self._burst = burst
+        self._tokens = burst
+        self._updated = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        elapsed = now - self._updated
+        self._tokens = min(self._burst, self._tokens + elapsed * self._rate)
+        self._updated = now
+
+    @property
+    def full(self) -> bool:
+        """Whether the bucket is full, so it wasn't used for a while."""
+        self._refill()
+        return self._tokens >= self._burst
+
+    def take(self, amount: float) -> float:
+        """Take tokens and return how many seconds to wait before using them."""
+        self._refill()
+        self._tokens -= amount
+        return max(0.0, -self._tokens / self._rate)
+
+
+class TrustedAddresses:
+    """Addresses of peers that are trusted, like proxies in front of the service.
+
+    Args:
+        trusted: Trusted addresses and networks, `*` to trust all of them.
+            A string can hold several of them separated by commas.
+
+    """
+
+    def __init__(self, trusted: str | Sequence[str] | None) -> None:
+        if isinstance(trusted, str):
+            trusted = [host.strip() for host in trusted.split(",")]
+
+        hosts = list(trusted or [])
+
+        self._all = "*" in hosts
+        self._literals: set[str] = set()
+        self._networks: list[ipaddress.IPv4Network | ipaddress.IPv6Network] = []
+
+        for host in hosts:
+            try:
+                self._networks.append(ipaddress.ip_network(host))
+            except ValueError:
+                self._literals.add(host)
+
+    def __contains__(self, address: str | None) -> bool:
+        """Check if an address is trusted."""
+        if self._all:
+            return True
+
+        if not address:
+            return False
+
+        try:
+            parsed = ipaddress.ip_address(address)
+        except ValueError:
+            return address in self._literals
+
+        return any(parsed in network for network in self._networks)
+
+
+class BandwidthLimiter:
+    """Limiter of the bandwidth used by streamed transfers.
+
+    Each client is limited separately, except for urgent transfers.
+    All transfers are limited by the total limit,
+    but bulk transfers can't use the reserved share of it.
+
+    Args:
+        config: Configuration for bandwidth limiting.
+        priority: Configuration for prioritizing work.
+        trusted: Addresses of peers trusted to send the identity header.
+        metrics: Registry of metrics.
+
+    """
+
+    SLICE = 64 * 1024
+    """Maximum number of bytes passed on at once when limiting."""
+
+    CLIENTS = 1024
+    """Number of client buckets above which idle ones are forgotten."""
+
+    def __init__(
+        self,
+        config: BandwidthConfig,
+        priority: PriorityConfig,
+        trusted: str | Sequence[str] | None,
+        metrics: Registry,
+    ) -> None:
+        bulk = config.total * (1 - priority.reserved) if config.total else None
+
+        self._config = config
+        self._trusted = TrustedAddresses(trusted)
+        self._total = self._make_bucket(config.total)
+        self._bulk = self._make_bucket(bulk)
+        self._clients: dict[str, TokenBucket] = {}
+
+        self._paced = metrics.counter(
+            "numbat_bandwidth_paced_seconds",
+            "Time transfers were paused to stay within the bandwidth limits.",
+            ["direction"],
+        )
+
+    def _make_bucket(self, rate: float | None) -> TokenBucket | None:
+        return TokenBucket(rate, rate) if rate is not None else None
+
+    def _get_client_bucket(self, client: str) -> TokenBucket | None:
+        rate = self._config.clients.get(client, self._config.client)
+
+        if rate is None:
+            return None
+
+        bucket = self._clients.get(client)
+
+        if bucket is None:
+            if len(self._clients) >= self.CLIENTS:
+                self._clients = {
+                    key: value for key, value in self._clients.items() if not value.full
+                }
+
+            bucket = self._clients[client] = TokenBucket(rate, rate)
+
+        return bucket
+
+    def _take(self, client: str, priority: Priority, amount: int) -> float:
+        buckets = [self._total]
+
+        if priority >= Priority.BULK:
+            buckets.append(self._bulk)
+
+        if priority > Priority.URGENT:
+            buckets.append(self._get_client_bucket(client))
+
+        return max(
+            (bucket.take(amount) for bucket in buckets if bucket is not None),
+            default=0.0,
+        )
+
+    async def _pace(
+        self, data: AsyncGenerator[bytes], client: str, direction: Direction
+    ) -> AsyncGenerator[bytes]:
+        counter = self._paced.labels(direction=direction)
+
+        try:
+            async for chunk in data:
+                for start in range(0, len(chunk), self.SLICE):
+                    piece = chunk[start : start + self.SLICE]
+                    delay = self._take(client, CURRENT_PRIORITY.get(), len(piece))
+
+                    if delay > 0:
+                        counter.inc(delay)
+                        await asyncio.sleep(delay)
+
+                    yield piece
+        finally:
+            await data.aclose()
+
+    @property
+    def enabled(self) -> bool:
+        """Whether any limits are configured."""
+        return (
+            self._total is not None
+            or self._config.client is not None
+            or bool(self._config.clients)
+        )
+
+    def identify(self, headers: Mapping[str, str], address: str | None) -> str:
+        """Identify a client by its identity header or its address.
+
+        The identity header is only honoured from trusted addresses,
+        as anyone else could change it to get around their limit.
+        """
+        if self._config.identity is not None and address in self._trusted:
+            identity = headers.get(self._config.identity)
+
+            if identity:
+                return identity
+
+        return address or ""
+
+    def limit(
+        self, data: AsyncGenerator[bytes], client: str, direction: Direction
+    ) -> AsyncGenerator[bytes]:
+        """Pass on the data no faster than the limits allow.
+
+        The priority of the current context is checked for every chunk of data.
+        """
+        if not self.enabled:
+            return data
+
+        return self._pace(data, client, direction)
@@ -0,0 +1,459 @@
+import asyncio
+import logging
+import struct
+import threading
+from collections import deque
+from collections.abc import AsyncGenerator, Collection, Generator, Iterable
+from contextlib import contextmanager, suppress
+from enum import IntEnum
+from pathlib import Path
+from typing import override
+
+from litestar.channels.backends.base import ChannelsBackend
+
+from numbat.utils.stamps import Stamper
+
+logger = logging.getLogger(__name__)
+
+
+class Operation(IntEnum):
+    """Operations exchanged between the broker and its clients."""
+
+    SUBSCRIBE = 1
+    UNSUBSCRIBE = 2
+    PUBLISH = 3
+    EVENT = 4
+    ACKNOWLEDGE = 5
+
+
+class FrameCodec:
+    """Codec for frames exchanged between the broker and its clients.
+
+    Each frame starts with a header holding the operation and the length of the body.
+    The body holds the names of the channels and optionally the data.
+    """
+
+    HEADER = struct.Struct("!BI")
+    NAMES = struct.Struct("!I")
+    SEPARATOR = "\n"
+
+    def encode(
+        self, operation: Operation, channels: Iterable[str], data: bytes = b""
+    ) -> bytes:
+        """Encode a frame."""
+        names = self.SEPARATOR.join(channels).encode()
+        body = self.NAMES.pack(len(names)) + names + data
+        return self.HEADER.pack(operation, len(body)) + body
+
+    def decode(self, body: bytes) -> tuple[list[str], bytes]:
+        """Decode the body of a frame into channels and data."""
+        (length,) = self.NAMES.unpack_from(body)
+        start = self.NAMES.size
+        names = body[start : start + length].decode()
+        channels = names.split(self.SEPARATOR) if names else []
+        return channels, body[start + length :]
+
+    async def read(self, reader: asyncio.StreamReader) -> tuple[Operation, bytes]:
+        """Read the next frame from a stream."""
+        operation, length = self.HEADER.unpack(
+            await reader.readexactly(self.HEADER.size)
+        )
+        return Operation(operation), await reader.readexactly(length)
+
+
+class BrokerClient:
+    """Client connected to the broker with its own queue of frames to send.
+
+    Frames are sent by a task of the client,
+    so a slow client doesn't hold up the others while its queue has room.
+    A client whose queue stays full for too long is disconnected.
+
+    Args:
+        writer: Stream to send frames to.
+        size: Maximum number of frames waiting to be sent.
+        timeout: Seconds to wait for room in a full queue before disconnecting.
+
+    """
+
+    def __init__(self, writer: asyncio.StreamWriter, size: int, timeout: float) -> None:
+        self.subscriptions: set[str] = set()
+        self._writer = writer
+        self._timeout = timeout
+        self._queue: asyncio.Queue[bytes] = asyncio.Queue(maxsize=size)
+        self._closed = False
+        self._waiting = 0
+        self._task = asyncio.create_task(self._run())
+
+    async def _run(self) -> None:
+        try:
+            while True:
+                self._writer.write(await self._queue.get())
+                await self._writer.drain()
+        except ConnectionError:
+            self._writer.close()
+
+    def offer(self, frame: bytes) -> bool:
+        """Queue a frame to send if there is room and return whether it was queued."""
+        if self._closed:
+            return True
+
+        # Frames already waiting for room go first, so frames stay in order
+        if self._waiting:
+            return False
+
+        try:
+            self._queue.put_nowait(frame)
+        except asyncio.QueueFull:
+            return False
+
+        return True
+
+    async def send(self, frame: bytes) -> None:
+        """Queue a frame to send, disconnecting the client if it is too far behind."""
+        if self.offer(frame):
+            return
+
+        self._waiting += 1
+
+        try:
+            await asyncio.wait_for(self._queue.put(frame), self._timeout)
+        except TimeoutError:
+            logger.warning("Disconnecting channels client that fell behind")
+            self.close()
+        finally:
+            self._waiting -= 1
+
+    def close(self) -> None:
+        """Stop sending frames and disconnect the client."""
+        self._closed = True
+        self._task.cancel()
+        self._writer.close()
+
+
+class SocketChannelsBroker:
+    """Broker passing events between processes over a Unix domain socket.
+
+    Every published event is forwarded to all clients subscribed to its channels,
+    including the client that published it.
+    Subscriptions are acknowledged, so that clients can wait until they take effect.
+
+    Events published to stamped channels are stamped again by the broker,
+    so their identifiers increase in the order all clients receive them,
+    no matter which client published them.
+
+    Args:
+        path: Path of the socket to listen on.
+        stamped: Names of the channels with stamped events.
+        queue: Maximum number of frames waiting to be sent to a single client.
+        timeout: Seconds to wait for room in the queue of a client
+            before disconnecting it.
+
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        stamped: Collection[str] = (),
+        queue: int = 1024,
+        timeout: float = 5,
+    ) -> None:
+        self._path = path
+        self._stamped = frozenset(stamped)
+        self._queue = queue
+        self._timeout = timeout
+        self._codec = FrameCodec()
+        self._stamper = Stamper()
+        self._clients: set[BrokerClient] = set()
+        self._server: asyncio.Server | None = None
+
+    async def _publish(self, channels: Iterable[str], data: bytes) -> None:
+        channels = list(channels)
+
+        if not self._stamped.isdisjoint(channels):
+            data = self._stamper.restamp(data)
+
+        frames = {
+            channel: self._codec.encode(Operation.EVENT, [channel], data)
+            for channel in channels
+        }
+
+        behind = [
+            client.send(frame)
+            for client in list(self._clients)
+            for channel, frame in frames.items()
+            if channel in client.subscriptions and not client.offer(frame)
+        ]
+
+        # Only clients that are behind hold up the publisher, and only for a while
+        if behind:
+            await asyncio.gather(*behind)
+
+    async def _handle(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        client = BrokerClient(writer, self._queue, self._timeout)
+        self._clients.add(client)
+
+        try:
+            while True:
+                operation, body = await self._codec.read(reader)
+                channels, data = self._codec.decode(body)
+
+                match operation:
+                    case Operation.SUBSCRIBE:
+                        client.subscriptions.update(channels)
+                        await client.send(self._codec.encode(Operation.ACKNOWLEDGE, []))
+                    case Operation.UNSUBSCRIBE:
+                        client.subscriptions.difference_update(channels)
+                    case Operation.PUBLISH:
+                        await self._publish(channels, data)
+                    case Operation.EVENT | Operation.ACKNOWLEDGE:
+                        pass
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            self._clients.discard(client)
+            client.close()
+
+    async def start(self) -> None:
+        """Start listening on the socket."""
+        self._path.unlink(missing_ok=True)
+        self._server = await asyncio.start_unix_server(self._handle, self._path)
+
+    async def stop(self) -> None:
+        """Stop listening on the socket and disconnect all clients."""
+        if self._server is None:
+            return
+
+        self._server.close()
+
+        for client in list(self._clients):
+            client.close()
+
+        await self._server.wait_closed()
+        self._server = None
+        self._path.unlink(missing_ok=True)
+
+    @contextmanager
+    def threaded(self) -> Generator[None]:
+        """Run the broker in a background thread for the duration of the context."""
+        loop = asyncio.new_event_loop()
+        thread = threading.Thread(
+            target=loop.run_forever, name="channels-broker", daemon=True
+        )
+        thread.start()
+
+        asyncio.run_coroutine_threadsafe(self.start(), loop).result()
+
+        try:
+            yield
+        finally:
+            asyncio.run_coroutine_threadsafe(self.stop(), loop).result()
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join()
+            loop.close()
+
+
+class SocketChannelsBackend(ChannelsBackend):
+    """Channels backend that passes events through a broker on a Unix domain socket.
+
+    If the connection to the broker is lost, the backend keeps reconnecting
+    and subscribes to its channels again.
+    Events might be lost meanwhile, so it passes a gap marker to all its channels
+    when the connection is lost and again once it is back.
+
+    Args:
+        path: Path of the socket the broker listens on.
+
+    """
+
+    DELAYS = (0.1, 5.0)
+    """Initial and maximum number of seconds to wait between reconnection attempts."""
+
+    def __init__(self, path: Path) -> None:
+        self._path = path
+        self._codec = FrameCodec()
+        self._channels: set[str] = set()
+        self._reader: asyncio.StreamReader | None = None
+        self._writer: asyncio.StreamWriter | None = None
+        self._queue: asyncio.Queue[tuple[str, bytes]] | None = None
+        self._acknowledgements: deque[asyncio.Future[None]] = deque()
+        self._resubscription: asyncio.Future[None] | None = None
+        self._task: asyncio.Task | None = None
+
+    async def _receive(self, reader: asyncio.StreamReader) -> None:
+        with suppress(asyncio.IncompleteReadError, ConnectionError):
+            while True:
+                operation, body = await self._codec.read(reader)
+
+                match operation:
+                    case Operation.EVENT if self._queue is not None:
+                        channels, data = self._codec.decode(body)
+
+                        for channel in channels:
+                            self._queue.put_nowait((channel, data))
+                    case Operation.ACKNOWLEDGE if self._acknowledgements:
+                        acknowledgement = self._acknowledgements.popleft()
+
+                        if not acknowledgement.done():
+                            acknowledgement.set_result(None)
+
+                        # Mark the gap again once events pass through the broker
+                        if acknowledgement is self._resubscription:
+                            self._resubscription = None
+                            self._mark_gap()
+                    case _:
+                        pass
+
+    def _mark_gap(self) -> None:
+        if self._queue is None:
+            return
+
+        for channel in self._channels:
+            self._queue.put_nowait((channel, Stamper.GAP))
+
+    def _disconnect(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+
+        # Subscriptions that were not acknowledged yet might have been lost
+        while self._acknowledgements:
+            acknowledgement = self._acknowledgements.popleft()
+
+            if acknowledgement is self._resubscription:
+                acknowledgement.cancel()
+            elif not acknowledgement.done():
+                msg = "Lost connection to the channels broker"
+                acknowledgement.set_exception(ConnectionError(msg))
+
+        self._resubscription = None
+
+    async def _reconnect(self) -> None:
+        delay, limit = self.DELAYS
+
+        while True:
+            try:
+                self._reader, self._writer = await asyncio.open_unix_connection(
+                    self._path
+                )
+            except OSError:
+                await asyncio.sleep(delay)
+                delay = min(2 * delay, limit)
+            else:
+                break
+
+        logger.info("Reconnected to the channels broker at %s", self._path)
+
+        if self._channels:
+            self._resubscription = asyncio.get_running_loop().create_future()
+            self._acknowledgements.append(self._resubscription)
+            self._writer.write(
+                self._codec.encode(Operation.SUBSCRIBE, list(self._channels))
+            )
+
+    async def _run(self) -> None:
+        while True:
+            if self._reader is not None:
+                await self._receive(self._reader)
+
+            logger.warning(
+                "Lost connection to the channels broker at %s, reconnecting",
+                self._path,
+            )
+
+            self._disconnect()
+            self._mark_gap()
+
+            await self._reconnect()
+
+    async def _send(
+        self, operation: Operation, channels: Iterable[str], data: bytes = b""
+    ) -> None:
+        if self._writer is None:
+            msg = "Backend not yet initialized. Did you forget to call on_startup?"
+            raise RuntimeError(msg)
+
+        if self._writer.is_closing():
+            msg = "Not connected to the channels broker"
+            raise ConnectionError(msg)
+
+        self._writer.write(self._codec.encode(operation, channels, data))
+        await self._writer.drain()
+
+    @override
+    async def on_startup(self) -> None:
+        self._reader, self._writer = await asyncio.open_unix_connection(self._path)
+        self._queue = asyncio.Queue()
+        self._task = asyncio.create_task(self._run())
+
+    @override
+    async def on_shutdown(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+
+            with suppress(asyncio.CancelledError):
+                await self._task
+
+            self._task = None
+
+        while self._acknowledgements:
+            self._acknowledgements.popleft().cancel()
+
+        if self._writer is not None:
+            self._writer.close()
+
+            with suppress(ConnectionError):
+                await self._writer.wait_closed()
+
+            self._writer = None
+
+        self._reader = None
+        self._queue = None
+
+    @override
+    async def publish(self, data: bytes, channels: Iterable[str]) -> None:
+        try:
+            await self._send(Operation.PUBLISH, channels, data)
+        except ConnectionError:
+            # Receivers are told about the gap once the connection is back
+            logger.warning("Dropped event published while disconnected from broker")
+
+    @override
+    async def subscribe(self, channels: Iterable[str]) -> None:
+        channels = list(channels)
+        self._channels.update(channels)
+
+        acknowledgement = asyncio.get_running_loop().create_future()
+        self._acknowledgements.append(acknowledgement)
+
+        try:
+            await self._send(Operation.SUBSCRIBE, channels)
+        except:
+            self._acknowledgements.remove(acknowledgement)
+            raise
+
+        await acknowledgement
+
+    @override
+    async def unsubscribe(self, channels: Iterable[str]) -> None:
+        channels = list(channels)
+        self._channels.difference_update(channels)
+
+        if self._writer is None:
+            return
+
+        with suppress(ConnectionError):
+            await self._send(Operation.UNSUBSCRIBE, channels)
+
+    @override
+    async def stream_events(self) -> AsyncGenerator[tuple[str, bytes]]:
+        if self._queue is None:
+            msg = "Backend not yet initialized. Did you forget to call on_startup?"
+            raise RuntimeError(msg)
+
+        while True:
+            yield await self._queue.get()
+
+    @override
+    async def get_history(self, channel: str, limit: int | None = None) -> list[bytes]:
+        return []
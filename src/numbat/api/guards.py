@@ -0,0 +1,33 @@
+import secrets
+
+from litestar.connection import ASGIConnection
+from litestar.handlers import BaseRouteHandler
+
+from numbat.api.exceptions import NotFoundException, UnauthorizedException
+
+
+class AdminGuard:
+    """Guard for admin endpoints.
+
+    Admin endpoints are hidden unless enabled in the configuration.
+    The configured token must be sent as a bearer token,
+    and without a token nobody is let in.
+    """
+
+    async def __call__(
+        self, connection: ASGIConnection, handler: BaseRouteHandler
+    ) -> None:
+        """Check whether the connection can reach the handler."""
+        config = connection.app.state.config.admin
+
+        if not config.enabled:
+            raise NotFoundException
+
+        scheme, _, token = connection.headers.get("Authorization", "").partition(" ")
+
+        if (
+            not config.token
+            or scheme.lower() != "bearer"
+            or not secrets.compare_digest(token.encode(), config.token.encode())
+        ):
+            raise UnauthorizedException
@@ -1,5 +1,6 @@
+import asyncio
 import logging
-from contextlib import AbstractAsyncContextManager
+from contextlib import AbstractAsyncContextManager, suppress
 from types import TracebackType
 from typing import cast, override
 
@@ -58,3 +59,99 @@ class SuppressHTTPXLoggingLifespan(Lifespan):
         traceback: TracebackType | None,
     ) -> None:
         self.logger.disabled = self.previously_disabled
+
+
+class ScheduleLifespan(Lifespan):
+    """Lifespan that keeps the local schedule mirror refreshed."""
+
+    @override
+    async def __aenter__(self) -> None:
+        self.task = (
+            asyncio.create_task(self.state.schedule.run())
+            if self.state.config.schedule.enabled
+            else None
+        )
+
+    @override
+    async def __aexit__(
+        self,
+        exception_type: type[BaseException] | None,
+        exception: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        if self.task is None:
+            return
+
+        self.task.cancel()
+
+        with suppress(asyncio.CancelledError):
+            await self.task
+
+
+class EventsLifespan(Lifespan):
+    """Lifespan that stops dispatching app events on shutdown."""
+
+    @override
+    async def __aenter__(self) -> None:
+        return
+
+    @override
+    async def __aexit__(
+        self,
+        exception_type: type[BaseException] | None,
+        exception: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.state.dispatcher.close()
+
+
+class AmberLifespan(Lifespan):
+    """Lifespan that stops the thread pool of the amber service on shutdown."""
+
+    @override
+    async def __aenter__(self) -> None:
+        return
+
+    @override
+    async def __aexit__(
+        self,
+        exception_type: type[BaseException] | None,
+        exception: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.state.amber.close()
+
+
+class TracingLifespan(Lifespan):
+    """Lifespan that closes the tracer on shutdown."""
+
+    @override
+    async def __aenter__(self) -> None:
+        return
+
+    @override
+    async def __aexit__(
+        self,
+        exception_type: type[BaseException] | None,
+        exception: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.state.tracer.close()
+
+
+class MonitorLifespan(Lifespan):
+    """Lifespan that monitors the event loop and thread pools."""
+
+    @override
+    async def __aenter__(self) -> None:
+        if self.state.config.monitor.enabled:
+            self.state.monitor.start()
+
+    @override
+    async def __aexit__(
+        self,
+        exception_type: type[BaseException] | None,
+        exception: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.state.monitor.stop()
@@ -0,0 +1,90 @@
+from litestar.datastructures import Headers, MutableScopeHeaders
+from litestar.types import ASGIApp, Message, Receive, Scope, Send
+
+from numbat.utils.timing import CURRENT_TIMINGS, TimingCollector
+from numbat.utils.tracing import SpanContext, SpanKind, Tracer
+
+
+class TracingMiddleware:
+    """Middleware that records a span for each HTTP request.
+
+    The span lasts until the response is fully sent, including streamed bodies,
+    and continues the trace from the `traceparent` header of the request.
+
+    Args:
+        app: Next ASGI app in the chain.
+        tracer: Tracer to record spans with.
+
+    """
+
+    def __init__(self, app: ASGIApp, tracer: Tracer) -> None:
+        self._app = app
+        self._tracer = tracer
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Handle an ASGI call."""
+        if scope["type"] != "http" or not self._tracer.enabled:
+            await self._app(scope, receive, send)
+            return
+
+        method = scope.get("method", "GET")
+        route = scope.get("path_template") or scope["path"]
+        parent = SpanContext.parse(Headers.from_scope(scope).get("traceparent"))
+
+        with self._tracer.span(
+            f"{method} {route}",
+            kind=SpanKind.SERVER,
+            parent=parent,
+            attributes={
+                "http.request.method": method,
+                "http.route": route,
+                "url.path": scope["path"],
+            },
+        ) as span:
+
+            async def traced(message: Message) -> None:
+                if span is not None and message["type"] == "http.response.start":
+                    span.set("http.response.status_code", message["status"])
+
+                await send(message)
+
+            await self._app(scope, receive, traced)
+
+
+class ServerTimingMiddleware:
+    """Middleware that adds a `Server-Timing` header to responses.
+
+    The header holds the times that services spent in each stage of handling
+    the request until the response started. It is only added if timing is enabled.
+
+    Args:
+        app: Next ASGI app in the chain.
+
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self._app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Handle an ASGI call."""
+        config = scope["litestar_app"].state.config
+
+        if scope["type"] != "http" or not config.timing.enabled:
+            await self._app(scope, receive, send)
+            return
+
+        collector = TimingCollector()
+        token = CURRENT_TIMINGS.set(collector)
+
+        async def timed(message: Message) -> None:
+            if message["type"] == "http.response.start" and (
+                header := collector.header()
+            ):
+                MutableScopeHeaders.from_message(message).add("Server-Timing", header)
+
+            await send(message)
+
+        try:
+            await self._app(scope, receive, timed)
+        finally:
+            CURRENT_TIMINGS.reset(token)
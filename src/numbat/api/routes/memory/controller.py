@@ -0,0 +1,124 @@
+from collections.abc import Mapping
+from typing import Annotated
+
+from litestar import Controller as BaseController
+from litestar import handlers
+from litestar.datastructures import ResponseHeader
+from litestar.di import Provide
+from litestar.params import Parameter
+from litestar.response import Response
+from litestar.status_codes import HTTP_200_OK, HTTP_204_NO_CONTENT
+
+from numbat.api.exceptions import (
+    BadRequestException,
+    ConflictException,
+    NotFoundException,
+    UnauthorizedException,
+)
+from numbat.api.routes.memory import errors as e
+from numbat.api.routes.memory import models as m
+from numbat.api.routes.memory.service import Service
+from numbat.models.base import Jsonable, Serializable
+from numbat.services.profiling.service import ProfilingService
+from numbat.state import State
+
+
+class DependenciesBuilder:
+    """Builder for the dependencies of the controller."""
+
+    async def _build_service(self, state: State) -> Service:
+        return Service(
+            profiling=ProfilingService(
+                profiler=state.profiler,
+                allocations=state.allocations,
+                config=state.config.admin.profiler,
+            )
+        )
+
+    def build(self) -> Mapping[str, Provide]:
+        """Build the dependencies."""
+        return {
+            "service": Provide(self._build_service),
+        }
+
+
+class Controller(BaseController):
+    """Controller for the memory endpoint."""
+
+    dependencies = DependenciesBuilder().build()
+
+    @handlers.post(
+        "/start",
+        summary="Start tracing allocations",
+        status_code=HTTP_204_NO_CONTENT,
+        raises=[BadRequestException, NotFoundException, UnauthorizedException],
+    )
+    async def start(
+        self,
+        service: Service,
+        frames: Annotated[
+            Jsonable[m.StartRequestFrames] | None,
+            Parameter(
+                description="Number of frames to keep for each allocation. Default is 1.",
+            ),
+        ] = None,
+    ) -> None:
+        """Start tracing allocations, forgetting previous snapshots."""
+        request = m.StartRequest(frames=frames.root if frames else 1)
+
+        try:
+            await service.start(request)
+        except e.ValidationError as ex:
+            raise BadRequestException from ex
+
+    @handlers.post(
+        "/stop",
+        summary="Stop tracing allocations",
+        status_code=HTTP_204_NO_CONTENT,
+        raises=[NotFoundException, UnauthorizedException],
+    )
+    async def stop(self, service: Service) -> None:
+        """Stop tracing allocations."""
+        request = m.StopRequest()
+
+        await service.stop(request)
+
+    @handlers.get(
+        "/snapshot",
+        summary="Get allocations snapshot",
+        status_code=HTTP_200_OK,
+        response_headers=[
+            ResponseHeader(
+                name="Cache-Control",
+                value="no-store",
+                required=True,
+            ),
+        ],
+        raises=[
+            BadRequestException,
+            ConflictException,
+            NotFoundException,
+            UnauthorizedException,
+        ],
+    )
+    async def snapshot(
+        self,
+        service: Service,
+        limit: Annotated[
+            Jsonable[m.SnapshotRequestLimit] | None,
+            Parameter(
+                description="Maximum number of allocation sites to return. Default is 10.",
+            ),
+        ] = None,
+    ) -> Response[Serializable[m.SnapshotResponseResults]]:
+        """Get top allocation sites and their changes since the previous snapshot."""
+        request = m.SnapshotRequest(limit=limit.root if limit else 10)
+
+        try:
+            response = await service.snapshot(request)
+        except e.ValidationError as ex:
+            raise BadRequestException from ex
+        except e.NotRunningError as ex:
+            raise ConflictException from ex
+
+        return Response(Serializable(response.results))
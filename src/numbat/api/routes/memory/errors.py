@@ -0,0 +1,10 @@
+class ServiceError(Exception):
+    """Base class for service errors."""
+
+
+class ValidationError(ServiceError):
+    """Raised when a validation error occurs."""
+
+
+class NotRunningError(ServiceError):
+    """Raised when allocations are not being traced."""
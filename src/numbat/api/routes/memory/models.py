@@ -0,0 +1,113 @@
+from collections.abc import Sequence
+from typing import Self
+
+from numbat.models.base import SerializableModel, datamodel
+from numbat.utils import memory
+
+
+class AllocationSite(SerializableModel):
+    """Place in code where memory was allocated."""
+
+    file: str
+    """Path of the file."""
+
+    line: int
+    """Line in the file."""
+
+    size: int
+    """Number of bytes allocated and not freed yet."""
+
+    count: int
+    """Number of blocks allocated and not freed yet."""
+
+    size_diff: int | None
+    """Change of the size since the previous snapshot."""
+
+    count_diff: int | None
+    """Change of the count since the previous snapshot."""
+
+    @classmethod
+    def map(cls, site: memory.AllocationSite) -> Self:
+        """Map from internal representation."""
+        return cls(
+            file=site.file,
+            line=site.line,
+            size=site.size,
+            count=site.count,
+            size_diff=site.size_diff,
+            count_diff=site.count_diff,
+        )
+
+
+class AllocationSnapshot(SerializableModel):
+    """Snapshot of traced allocations."""
+
+    current: int
+    """Number of bytes allocated and not freed yet."""
+
+    peak: int
+    """Maximum number of bytes allocated at once since tracing started."""
+
+    top: Sequence[AllocationSite]
+    """Sites with most memory allocated."""
+
+    diff: Sequence[AllocationSite] | None
+    """Sites with the largest changes since the previous snapshot, if there was one."""
+
+    @classmethod
+    def map(cls, snapshot: memory.AllocationSnapshot) -> Self:
+        """Map from internal representation."""
+        return cls(
+            current=snapshot.current,
+            peak=snapshot.peak,
+            top=[AllocationSite.map(site) for site in snapshot.top],
+            diff=[AllocationSite.map(site) for site in snapshot.diff]
+            if snapshot.diff is not None
+            else None,
+        )
+
+
+type StartRequestFrames = int
+
+type SnapshotRequestLimit = int
+
+type SnapshotResponseResults = AllocationSnapshot
+
+
+@datamodel
+class StartRequest:
+    """Request to start tracing allocations."""
+
+    frames: StartRequestFrames
+    """Number of frames to keep for each allocation."""
+
+
+@datamodel
+class StartResponse:
+    """Response for starting to trace allocations."""
+
+
+@datamodel
+class StopRequest:
+    """Request to stop tracing allocations."""
+
+
+@datamodel
+class StopResponse:
+    """Response for stopping to trace allocations."""
+
+
+@datamodel
+class SnapshotRequest:
+    """Request to take a snapshot of traced allocations."""
+
+    limit: SnapshotRequestLimit
+    """Maximum number of allocation sites to return."""
+
+
+@datamodel
+class SnapshotResponse:
+    """Response for taking a snapshot of traced allocations."""
+
+    results: SnapshotResponseResults
+    """Snapshot compared with the previous one."""
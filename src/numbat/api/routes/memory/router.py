@@ -0,0 +1,15 @@
+from litestar import Router
+
+from numbat.api.guards import AdminGuard
+from numbat.api.routes.memory.controller import Controller
+
+router = Router(
+    path="/admin/memory",
+    tags=["Admin"],
+    route_handlers=[
+        Controller,
+    ],
+    guards=[
+        AdminGuard(),
+    ],
+)
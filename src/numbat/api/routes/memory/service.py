@@ -0,0 +1,57 @@
+from collections.abc import Generator
+from contextlib import contextmanager
+
+from numbat.api.routes.memory import errors as e
+from numbat.api.routes.memory import models as m
+from numbat.services.profiling import errors as pe
+from numbat.services.profiling import models as pm
+from numbat.services.profiling.service import ProfilingService
+
+
+class Service:
+    """Service for the memory endpoint."""
+
+    def __init__(self, profiling: ProfilingService) -> None:
+        self._profiling = profiling
+
+    @contextmanager
+    def _handle_errors(self) -> Generator[None]:
+        try:
+            yield
+        except pe.ValidationError as ex:
+            raise e.ValidationError from ex
+        except pe.NotRunningError as ex:
+            raise e.NotRunningError from ex
+        except pe.ServiceError as ex:
+            raise e.ServiceError from ex
+
+    async def start(self, request: m.StartRequest) -> m.StartResponse:
+        """Start tracing allocations."""
+        start_request = pm.StartAllocationsRequest(frames=request.frames)
+
+        with self._handle_errors():
+            await self._profiling.start_allocations(start_request)
+
+        return m.StartResponse()
+
+    async def stop(self, request: m.StopRequest) -> m.StopResponse:
+        """Stop tracing allocations."""
+        stop_request = pm.StopAllocationsRequest()
+
+        with self._handle_errors():
+            await self._profiling.stop_allocations(stop_request)
+
+        return m.StopResponse()
+
+    async def snapshot(self, request: m.SnapshotRequest) -> m.SnapshotResponse:
+        """Take a snapshot of traced allocations."""
+        snapshot_request = pm.SnapshotAllocationsRequest(limit=request.limit)
+
+        with self._handle_errors():
+            snapshot_response = await self._profiling.snapshot_allocations(
+                snapshot_request
+            )
+
+        return m.SnapshotResponse(
+            results=m.AllocationSnapshot.map(snapshot_response.snapshot)
+        )
@@ -0,0 +1,53 @@
+from collections.abc import Mapping
+
+from litestar import Controller as BaseController
+from litestar import handlers
+from litestar.datastructures import ResponseHeader
+from litestar.di import Provide
+from litestar.response import Response
+from litestar.status_codes import HTTP_200_OK
+
+from numbat.api.routes.metrics import models as m
+from numbat.api.routes.metrics.service import Service
+from numbat.services.metrics.service import MetricsService
+from numbat.state import State
+
+
+class DependenciesBuilder:
+    """Builder for the dependencies of the controller."""
+
+    async def _build_service(self, state: State) -> Service:
+        return Service(metrics=MetricsService(registry=state.metrics))
+
+    def build(self) -> Mapping[str, Provide]:
+        """Build the dependencies."""
+        return {
+            "service": Provide(self._build_service),
+        }
+
+
+class Controller(BaseController):
+    """Controller for the metrics endpoint."""
+
+    dependencies = DependenciesBuilder().build()
+
+    @handlers.get(
+        summary="Get metrics",
+        status_code=HTTP_200_OK,
+        response_description="Request fulfilled, metrics in Prometheus format follow",
+        response_headers=[
+            ResponseHeader(
+                name="Cache-Control",
+                value="no-store",
+                required=True,
+            ),
+        ],
+        media_type="text/plain; version=0.0.4; charset=utf-8",
+    )
+    async def get(self, service: Service) -> Response[str]:
+        """Get metrics in the Prometheus text exposition format."""
+        request = m.GetRequest()
+
+        response = await service.get(request)
+
+        return Response(response.content)
@@ -0,0 +1,16 @@
+from numbat.models.base import datamodel
+
+type GetResponseContent = str
+
+
+@datamodel
+class GetRequest:
+    """Request to get metrics."""
+
+
+@datamodel
+class GetResponse:
+    """Response for getting metrics."""
+
+    content: GetResponseContent
+    """Metrics in the Prometheus text exposition format."""
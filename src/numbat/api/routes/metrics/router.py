@@ -0,0 +1,11 @@
+from litestar import Router
+
+from numbat.api.routes.metrics.controller import Controller
+
+router = Router(
+    path="/metrics",
+    tags=["Metrics"],
+    route_handlers=[
+        Controller,
+    ],
+)
@@ -0,0 +1,31 @@
+from collections.abc import Generator
+from contextlib import contextmanager
+
+from numbat.api.routes.metrics import errors as e
+from numbat.api.routes.metrics import models as m
+from numbat.services.metrics import errors as me
+from numbat.services.metrics import models as mm
+from numbat.services.metrics.service import MetricsService
+
+
+class Service:
+    """Service for the metrics endpoint."""
+
+    def __init__(self, metrics: MetricsService) -> None:
+        self._metrics = metrics
+
+    @contextmanager
+    def _handle_errors(self) -> Generator[None]:
+        try:
+            yield
+        except me.ServiceError as ex:
+            raise e.ServiceError from ex
+
+    async def get(self, request: m.GetRequest) -> m.GetResponse:
+        """Get metrics."""
+        render_request = mm.RenderRequest()
+
+        with self._handle_errors():
+            render_response = await self._metrics.render(render_request)
+
+        return m.GetResponse(content=render_response.content)
@@ -18,13 +18,14 @@ from litestar.openapi.spec import (
 from litestar.params import Parameter
 from litestar.response import Response, Stream
 from litestar.status_codes import HTTP_200_OK, HTTP_204_NO_CONTENT
+from pydantic import TypeAdapter
 
 from numbat.api.exceptions import BadRequestException, NotFoundException
 from numbat.api.routes.prerecordings import errors as e
 from numbat.api.routes.prerecordings import models as m
 from numbat.api.routes.prerecordings.service import Service
+from numbat.api.streams import Direction
 from numbat.models.base import Jsonable, Serializable
-from numbat.services.entities.prerecordings.service import PrerecordingsService
 from numbat.state import State
 
 
@@ -62,13 +63,50 @@ class UploadOperation(Operation):
         )
 
 
+class DownloadHeadersEncoder:
+    """Encoder for the headers of prerecording download responses.
+
+    Args:
+        head: Whether to encode the headers of responses to `HEAD` requests.
+
+    """
+
+    def __init__(self, *, head: bool = False) -> None:
+        if head:
+            self._type = TypeAdapter(m.HeadDownloadResponseType)
+            self._size = TypeAdapter(m.HeadDownloadResponseSize)
+            self._tag = TypeAdapter(m.HeadDownloadResponseTag)
+            self._modified = TypeAdapter(m.HeadDownloadResponseModified)
+        else:
+            self._type = TypeAdapter(m.DownloadResponseType)
+            self._size = TypeAdapter(m.DownloadResponseSize)
+            self._tag = TypeAdapter(m.DownloadResponseTag)
+            self._modified = TypeAdapter(m.DownloadResponseModified)
+
+    def encode(
+        self, response: m.DownloadResponse | m.HeadDownloadResponse
+    ) -> dict[str, str]:
+        """Encode the headers of a response."""
+        return {
+            "Content-Type": str(self._type.dump_python(response.type, mode="json")),
+            "Content-Length": str(self._size.dump_python(response.size, mode="json")),
+            "ETag": str(self._tag.dump_python(response.tag, mode="json")),
+            "Last-Modified": str(
+                self._modified.dump_python(response.modified, mode="json")
+            ),
+        }
+
+
+DOWNLOAD_HEADERS_ENCODER = DownloadHeadersEncoder()
+
+HEAD_DOWNLOAD_HEADERS_ENCODER = DownloadHeadersEncoder(head=True)
+
+
 class DependenciesBuilder:
     """Builder for the dependencies of the controller."""
 
     async def _build_service(self, state: State) -> Service:
-        return Service(
-            prerecordings=PrerecordingsService(amber=state.amber, beaver=state.beaver)
-        )
+        return Service(prerecordings=state.prerecordings, tracer=state.tracer)
 
     def build(self) -> Mapping[str, Provide]:
         """Build the dependencies."""
@@ -189,37 +227,30 @@ class Controller(BaseController):
                 description="Start datetime of the event instance in event timezone.",
             ),
         ],
+        state: State,
+        request: Request,
     ) -> Stream:
         """Download a prerecording."""
-        request = m.DownloadRequest(event=event.root, start=start.root)
+        req = m.DownloadRequest(event=event.root, start=start.root)
 
         try:
-            response = await service.download(request)
+            response = await service.download(req)
         except e.ValidationError as ex:
             raise BadRequestException from ex
         except e.NotFoundError as ex:
             raise NotFoundException from ex
 
-        def dump(value: Serializable) -> str:
-            return str(value.model_dump(mode="json", round_trip=True))
-
         try:
-            headers = {
-                "Content-Type": dump(
-                    Serializable[m.DownloadResponseType](response.type),
-                ),
-                "Content-Length": dump(
-                    Serializable[m.DownloadResponseSize](response.size),
-                ),
-                "ETag": dump(
-                    Serializable[m.DownloadResponseTag](response.tag),
-                ),
-                "Last-Modified": dump(
-                    Serializable[m.DownloadResponseModified](response.modified),
-                ),
-            }
-
-            return Stream(response.data, headers=headers)
+            headers = DOWNLOAD_HEADERS_ENCODER.encode(response)
+            client = state.bandwidth.identify(
+                request.headers, request.client.host if request.client else None
+            )
+            data = state.streams.meter(
+                state.bandwidth.limit(response.data, client, Direction.DOWNLOAD),
+                Direction.DOWNLOAD,
+            )
+
+            return Stream(data, headers=headers)
         except:
             await response.data.aclose()
             raise
@@ -278,23 +309,7 @@ class Controller(BaseController):
         except e.NotFoundError as ex:
             raise NotFoundException from ex
 
-        def dump(value: Serializable) -> str:
-            return str(value.model_dump(mode="json", round_trip=True))
-
-        headers = {
-            "Content-Type": dump(
-                Serializable[m.HeadDownloadResponseType](response.type),
-            ),
-            "Content-Length": dump(
-                Serializable[m.HeadDownloadResponseSize](response.size),
-            ),
-            "ETag": dump(
-                Serializable[m.HeadDownloadResponseTag](response.tag),
-            ),
-            "Last-Modified": dump(
-                Serializable[m.HeadDownloadResponseModified](response.modified),
-            ),
-        }
+        headers = HEAD_DOWNLOAD_HEADERS_ENCODER.encode(response)
 
         return cast("None", Response(None, headers=headers))
 
@@ -305,7 +320,7 @@ class Controller(BaseController):
         raises=[BadRequestException],
         operation_class=UploadOperation,
     )
-    async def upload(
+    async def upload(  # noqa: PLR0913
         self,
         service: Service,
         event: Annotated[
@@ -327,10 +342,17 @@ class Controller(BaseController):
                 description="Type of the prerecording data.",
             ),
         ],
+        state: State,
         request: Request,
     ) -> None:
         """Upload a prerecording."""
-        data = request.stream()
+        stream = request.stream()
+        client = state.bandwidth.identify(
+            request.headers, request.client.host if request.client else None
+        )
+        data = state.streams.meter(
+            state.bandwidth.limit(stream, client, Direction.UPLOAD), Direction.UPLOAD
+        )
 
         try:
             req = m.UploadRequest(
@@ -343,6 +365,7 @@ class Controller(BaseController):
                 raise BadRequestException from ex
         finally:
             await data.aclose()
+            await stream.aclose()
 
     @handlers.delete(
         "/{event:str}/{start:str}",
@@ -1,5 +1,6 @@
 from litestar import Router
 
+from numbat.api.middleware import ServerTimingMiddleware
 from numbat.api.routes.prerecordings.controller import Controller
 
 router = Router(
@@ -8,4 +9,7 @@ router = Router(
     route_handlers=[
         Controller,
     ],
+    middleware=[
+        ServerTimingMiddleware,
+    ],
 )
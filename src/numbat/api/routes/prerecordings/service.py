@@ -6,13 +6,20 @@ from numbat.api.routes.prerecordings import models as m
 from numbat.services.entities.prerecordings import errors as pe
 from numbat.services.entities.prerecordings import models as pm
 from numbat.services.entities.prerecordings.service import PrerecordingsService
+from numbat.utils.tracing import Tracer, traced
 
 
 class Service:
     """Service for the prerecordings endpoint."""
 
-    def __init__(self, prerecordings: PrerecordingsService) -> None:
+    def __init__(self, prerecordings: PrerecordingsService, tracer: Tracer) -> None:
         self._prerecordings = prerecordings
+        self._tracer = tracer
+
+    @property
+    def tracer(self) -> Tracer:
+        """Tracer to record spans with."""
+        return self._tracer
 
     @contextmanager
     def _handle_errors(self) -> Generator[None]:
@@ -25,6 +32,7 @@ class Service:
         except pe.ServiceError as ex:
             raise e.ServiceError from ex
 
+    @traced("api.prerecordings.list")
     async def list(self, request: m.ListRequest) -> m.ListResponse:
         """List prerecordings."""
         list_request = pm.ListRequest(
@@ -51,6 +59,7 @@ class Service:
             )
         )
 
+    @traced("api.prerecordings.download")
     async def download(self, request: m.DownloadRequest) -> m.DownloadResponse:
         """Download a prerecording."""
         download_request = pm.DownloadRequest(event=request.event, start=request.start)
@@ -70,6 +79,7 @@ class Service:
             await download_response.content.data.aclose()
             raise
 
+    @traced("api.prerecordings.headdownload")
     async def headdownload(
         self, request: m.HeadDownloadRequest
     ) -> m.HeadDownloadResponse:
@@ -88,6 +98,7 @@ class Service:
             modified=download_response.content.modified,
         )
 
+    @traced("api.prerecordings.upload")
     async def upload(self, request: m.UploadRequest) -> m.UploadResponse:
         """Upload a prerecording."""
         upload_request = pm.UploadRequest(
@@ -101,6 +112,7 @@ class Service:
 
         return m.UploadResponse()
 
+    @traced("api.prerecordings.delete")
     async def delete(self, request: m.DeleteRequest) -> m.DeleteResponse:
         """Delete a prerecording."""
         delete_request = pm.DeleteRequest(event=request.event, start=request.start)
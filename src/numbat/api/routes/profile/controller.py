@@ -0,0 +1,100 @@
+from collections.abc import Mapping
+from typing import Annotated
+
+from litestar import Controller as BaseController
+from litestar import handlers
+from litestar.datastructures import ResponseHeader
+from litestar.di import Provide
+from litestar.params import Parameter
+from litestar.response import Response
+from litestar.status_codes import HTTP_200_OK
+
+from numbat.api.exceptions import (
+    BadRequestException,
+    ConflictException,
+    NotFoundException,
+    UnauthorizedException,
+)
+from numbat.api.routes.profile import errors as e
+from numbat.api.routes.profile import models as m
+from numbat.api.routes.profile.service import Service
+from numbat.models.base import Jsonable
+from numbat.services.profiling import models as pm
+from numbat.services.profiling.service import ProfilingService
+from numbat.state import State
+
+
+class DependenciesBuilder:
+    """Builder for the dependencies of the controller."""
+
+    async def _build_service(self, state: State) -> Service:
+        return Service(
+            profiling=ProfilingService(
+                profiler=state.profiler,
+                allocations=state.allocations,
+                config=state.config.admin.profiler,
+            )
+        )
+
+    def build(self) -> Mapping[str, Provide]:
+        """Build the dependencies."""
+        return {
+            "service": Provide(self._build_service),
+        }
+
+
+class Controller(BaseController):
+    """Controller for the profile endpoint."""
+
+    dependencies = DependenciesBuilder().build()
+
+    @handlers.get(
+        summary="Get profile",
+        status_code=HTTP_200_OK,
+        response_description="Request fulfilled, profile follows",
+        response_headers=[
+            ResponseHeader(
+                name="Cache-Control",
+                value="no-store",
+                required=True,
+            ),
+        ],
+        raises=[
+            BadRequestException,
+            ConflictException,
+            NotFoundException,
+            UnauthorizedException,
+        ],
+        media_type="text/plain; charset=utf-8",
+    )
+    async def get(
+        self,
+        service: Service,
+        duration: Annotated[
+            Jsonable[m.GetRequestDuration] | None,
+            Parameter(
+                description="Number of seconds to profile for. Default is 10.",
+            ),
+        ] = None,
+        fmt: Annotated[
+            Jsonable[m.GetRequestFormat] | None,
+            Parameter(
+                query="format",
+                description="Format of the profile. Default is collapsed stacks.",
+            ),
+        ] = None,
+    ) -> Response[str]:
+        """Profile all threads of the app with a sampling profiler."""
+        request = m.GetRequest(
+            duration=duration.root if duration else 10,
+            format=fmt.root if fmt else pm.ProfileFormat.COLLAPSED,
+        )
+
+        try:
+            response = await service.get(request)
+        except e.ValidationError as ex:
+            raise BadRequestException from ex
+        except e.BusyError as ex:
+            raise ConflictException from ex
+
+        return Response(response.content, media_type=response.type)
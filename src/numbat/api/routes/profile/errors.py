@@ -0,0 +1,10 @@
+class ServiceError(Exception):
+    """Base class for service errors."""
+
+
+class ValidationError(ServiceError):
+    """Raised when a validation error occurs."""
+
+
+class BusyError(ServiceError):
+    """Raised when a profile is already being recorded."""
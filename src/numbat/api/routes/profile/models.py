@@ -0,0 +1,32 @@
+from numbat.models.base import datamodel
+from numbat.services.profiling import models as pm
+
+type GetRequestDuration = float
+
+type GetRequestFormat = pm.ProfileFormat
+
+type GetResponseType = str
+
+type GetResponseContent = str
+
+
+@datamodel
+class GetRequest:
+    """Request to get a profile."""
+
+    duration: GetRequestDuration
+    """Number of seconds to profile for."""
+
+    format: GetRequestFormat
+    """Format of the profile."""
+
+
+@datamodel
+class GetResponse:
+    """Response for getting a profile."""
+
+    type: GetResponseType
+    """Media type of the profile."""
+
+    content: GetResponseContent
+    """Content of the profile."""
@@ -0,0 +1,15 @@
+from litestar import Router
+
+from numbat.api.guards import AdminGuard
+from numbat.api.routes.profile.controller import Controller
+
+router = Router(
+    path="/admin/profile",
+    tags=["Admin"],
+    route_handlers=[
+        Controller,
+    ],
+    guards=[
+        AdminGuard(),
+    ],
+)
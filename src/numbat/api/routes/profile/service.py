@@ -0,0 +1,40 @@
+from collections.abc import Generator
+from contextlib import contextmanager
+
+from numbat.api.routes.profile import errors as e
+from numbat.api.routes.profile import models as m
+from numbat.services.profiling import errors as pe
+from numbat.services.profiling import models as pm
+from numbat.services.profiling.service import ProfilingService
+
+
+class Service:
+    """Service for the profile endpoint."""
+
+    def __init__(self, profiling: ProfilingService) -> None:
+        self._profiling = profiling
+
+    @contextmanager
+    def _handle_errors(self) -> Generator[None]:
+        try:
+            yield
+        except pe.ValidationError as ex:
+            raise e.ValidationError from ex
+        except pe.BusyError as ex:
+            raise e.BusyError from ex
+        except pe.ServiceError as ex:
+            raise e.ServiceError from ex
+
+    async def get(self, request: m.GetRequest) -> m.GetResponse:
+        """Get a profile."""
+        profile_request = pm.ProfileRequest(
+            duration=request.duration, format=request.format
+        )
+
+        with self._handle_errors():
+            profile_response = await self._profiling.profile(profile_request)
+
+        return m.GetResponse(
+            type=profile_response.profile.type,
+            content=profile_response.profile.content,
+        )
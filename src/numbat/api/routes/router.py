@@ -1,15 +1,21 @@
 from litestar import Router
 
+from numbat.api.routes.memory.router import router as memory
+from numbat.api.routes.metrics.router import router as metrics
 from numbat.api.routes.ping.router import router as ping
 from numbat.api.routes.prerecordings.router import router as prerecordings
+from numbat.api.routes.profile.router import router as profile
 from numbat.api.routes.sse.router import router as sse
 from numbat.api.routes.test.router import router as test
 
 router = Router(
     path="/",
     route_handlers=[
+        memory,
+        metrics,
         ping,
         prerecordings,
+        profile,
         sse,
         test,
     ],
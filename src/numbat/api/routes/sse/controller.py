@@ -4,18 +4,18 @@ from typing import Annotated
 
 from litestar import Controller as BaseController
 from litestar import handlers
-from litestar.channels import ChannelsPlugin
 from litestar.datastructures import ResponseHeader
 from litestar.di import Provide
 from litestar.openapi.spec import OpenAPIResponse, OpenAPIType, Operation, Schema
 from litestar.params import Parameter
-from litestar.response import ServerSentEvent, ServerSentEventMessage
+from litestar.response import Stream
 from litestar.status_codes import HTTP_200_OK
 
 from numbat.api.routes.sse import models as m
 from numbat.api.routes.sse.service import Service
 from numbat.models.base import Jsonable
 from numbat.services.events.service import EventsService
+from numbat.state import State
 
 
 @dataclass
@@ -39,8 +39,8 @@ class SubscribeOperation(Operation):
 class DependenciesBuilder:
     """Builder for the dependencies of the controller."""
 
-    async def _build_service(self, channels: ChannelsPlugin) -> Service:
-        return Service(events=EventsService(channels=channels))
+    async def _build_service(self, state: State) -> Service:
+        return Service(events=EventsService(dispatcher=state.dispatcher))
 
     def build(self) -> Mapping[str, Provide]:
         """Build the dependencies."""
@@ -69,6 +69,11 @@ class Controller(BaseController):
                 value="keep-alive",
                 required=True,
             ),
+            ResponseHeader(
+                name="X-Accel-Buffering",
+                value="no",
+                required=True,
+            ),
         ],
         media_type="text/event-stream",
         operation_class=SubscribeOperation,
@@ -82,13 +87,30 @@ class Controller(BaseController):
                 description="Types of events to subscribe to.",
             ),
         ] = None,
-    ) -> ServerSentEvent:
+        event: Annotated[
+            Jsonable[m.SubscribeRequestEvent] | None,
+            Parameter(
+                description="Identifier of the event to subscribe to events about.",
+            ),
+        ] = None,
+        last: Annotated[
+            Jsonable[m.SubscribeRequestLast] | None,
+            Parameter(
+                header="Last-Event-ID",
+                description="Identifier of the last event received before.",
+            ),
+        ] = None,
+    ) -> Stream:
         """Get a stream of Server-Sent Events."""
-        request = m.SubscribeRequest(types=types.root if types else None)
+        request = m.SubscribeRequest(
+            types=types.root if types else None,
+            event=event.root if event else None,
+            last=last.root if last else None,
+        )
 
         response = await service.subscribe(request)
 
-        return ServerSentEvent(
-            ServerSentEventMessage(data=message.event.model_dump_json(round_trip=True))
-            async for message in response.messages
+        return Stream(
+            (message.frame async for message in response.messages),
+            media_type="text/event-stream",
         )
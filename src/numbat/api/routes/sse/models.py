@@ -1,6 +1,7 @@
 from collections.abc import AsyncIterator
 from collections.abc import Set as AbstractSet
 from typing import Annotated
+from uuid import UUID
 
 from pydantic import BeforeValidator
 
@@ -16,6 +17,25 @@ class EventMessage:
     event: em.Event
     """Event that occurred."""
 
+    frame: bytes
+    """Server-Sent Event frame with the event."""
+
+
+@datamodel
+class ResyncMessage:
+    """Message telling the client to fetch the state again."""
+
+    frame: bytes
+    """Server-Sent Event frame with the message."""
+
+
+@datamodel
+class HeartbeatMessage:
+    """Message keeping an idle connection alive."""
+
+    frame: bytes
+    """Server-Sent Event frame with the message."""
+
 
 type SubscribeRequestTypes = Annotated[
     AbstractSet[EventType] | None,
@@ -25,7 +45,13 @@ type SubscribeRequestTypes = Annotated[
     ),
 ]
 
-type SubscribeResponseMessages = AsyncIterator[EventMessage]
+type SubscribeRequestEvent = UUID | None
+
+type SubscribeRequestLast = str | None
+
+type SubscribeResponseMessages = AsyncIterator[
+    EventMessage | ResyncMessage | HeartbeatMessage
+]
 
 
 @datamodel
@@ -35,6 +61,12 @@ class SubscribeRequest:
     types: SubscribeRequestTypes
     """Types of events to subscribe to."""
 
+    event: SubscribeRequestEvent
+    """Identifier of the event to subscribe to events about."""
+
+    last: SubscribeRequestLast
+    """Identifier of the last event received before."""
+
 
 @datamodel
 class SubscribeResponse:
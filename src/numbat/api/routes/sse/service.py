@@ -22,16 +22,27 @@ class Service:
             raise e.ServiceError from ex
 
     async def _subscribe(
-        self, types: m.SubscribeRequestTypes
-    ) -> AsyncGenerator[m.EventMessage]:
-        subscribe_request = em.SubscribeRequest(types=types)
+        self,
+        types: m.SubscribeRequestTypes,
+        event: m.SubscribeRequestEvent,
+        last: m.SubscribeRequestLast,
+    ) -> AsyncGenerator[m.EventMessage | m.ResyncMessage | m.HeartbeatMessage]:
+        subscribe_request = em.SubscribeRequest(types=types, event=event, last=last)
 
         with self._handle_errors():
             subscribe_response = await self._events.subscribe(subscribe_request)
 
-            async for event in subscribe_response.events:
-                yield m.EventMessage(event=event)
+            async for message in subscribe_response.messages:
+                match message:
+                    case em.Message():
+                        yield m.EventMessage(event=message.event, frame=message.frame)
+                    case em.Resync():
+                        yield m.ResyncMessage(frame=message.frame)
+                    case em.Heartbeat():
+                        yield m.HeartbeatMessage(frame=message.frame)
 
     async def subscribe(self, request: m.SubscribeRequest) -> m.SubscribeResponse:
         """Subscribe to event messages."""
-        return m.SubscribeResponse(messages=self._subscribe(request.types))
+        return m.SubscribeResponse(
+            messages=self._subscribe(request.types, request.event, request.last)
+        )
@@ -3,7 +3,6 @@ from typing import Annotated
 
 from litestar import Controller as BaseController
 from litestar import handlers
-from litestar.channels import ChannelsPlugin
 from litestar.di import Provide
 from litestar.params import Parameter
 from litestar.response import Response
@@ -13,14 +12,18 @@ from numbat.api.routes.test import errors as e
 from numbat.api.routes.test import models as m
 from numbat.api.routes.test.service import Service
 from numbat.models.base import Jsonable, Serializable
+from numbat.services.events.service import EventsService
 from numbat.services.test.service import TestService
+from numbat.state import State
 
 
 class DependenciesBuilder:
     """Builder for the dependencies of the controller."""
 
-    async def _build_service(self, channels: ChannelsPlugin) -> Service:
-        return Service(test=TestService(channels=channels))
+    async def _build_service(self, state: State) -> Service:
+        return Service(
+            test=TestService(events=EventsService(dispatcher=state.dispatcher))
+        )
 
     def build(self) -> Mapping[str, Provide]:
         """Build the dependencies."""
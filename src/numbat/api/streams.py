@@ -0,0 +1,49 @@
+from collections.abc import AsyncGenerator
+from enum import StrEnum
+
+from numbat.utils.metrics import Registry
+
+
+class Direction(StrEnum):
+    """Direction of transferred data."""
+
+    DOWNLOAD = "download"
+    UPLOAD = "upload"
+
+
+class StreamMeter:
+    """Meter of the data passing through streamed transfers.
+
+    Args:
+        metrics: Registry of metrics.
+
+    """
+
+    def __init__(self, metrics: Registry) -> None:
+        self._bytes = metrics.counter(
+            "numbat_stream_bytes",
+            "Number of bytes streamed.",
+            ["direction"],
+        )
+        self._active = metrics.gauge(
+            "numbat_streams_active",
+            "Number of streams in progress.",
+            ["direction"],
+        )
+
+    async def meter(
+        self, data: AsyncGenerator[bytes], direction: Direction
+    ) -> AsyncGenerator[bytes]:
+        """Pass on the data while counting it."""
+        counter = self._bytes.labels(direction=direction)
+        active = self._active.labels(direction=direction)
+
+        active.inc()
+
+        try:
+            async for chunk in data:
+                counter.inc(len(chunk))
+                yield chunk
+        finally:
+            active.dec()
+            await data.aclose()
@@ -0,0 +1,66 @@
+import time
+from abc import ABC, abstractmethod
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass
+from enum import StrEnum
+
+
+class BenchmarkGroup(StrEnum):
+    """Groups of benchmarks."""
+
+    MICRO = "micro"
+    """Single functions on in-memory data."""
+
+    MACRO = "macro"
+    """Whole requests through the app against local stand-ins."""
+
+
+@dataclass(frozen=True)
+class Sample:
+    """Measurement of a single round of a benchmark."""
+
+    operations: int
+    """Number of operations done in the round."""
+
+    seconds: float
+    """Number of seconds the round took."""
+
+    bytes: int = 0
+    """Number of bytes transferred in the round."""
+
+
+class Benchmark(ABC):
+    """Base class for benchmarks.
+
+    The runner calls `setup` once, then `run` for each round, then `teardown`.
+    Only the time measured by `run` itself is taken into account.
+    """
+
+    name: str
+    """Name of the benchmark, stable between runs to compare them."""
+
+    group: BenchmarkGroup
+    """Group of the benchmark."""
+
+    rounds: int | None = None
+    """Maximum number of measured rounds, if fewer than usual are enough."""
+
+    async def setup(self) -> None:  # noqa: B027
+        """Prepare for the rounds."""
+
+    @abstractmethod
+    async def run(self) -> Sample:
+        """Run a single round."""
+
+    async def teardown(self) -> None:  # noqa: B027
+        """Clean up after the rounds."""
+
+
+def measure[T](function: Callable[[T], object], items: Sequence[T]) -> Sample:
+    """Call the function with each item and measure the time it took."""
+    start = time.perf_counter()
+
+    for item in items:
+        function(item)
+
+    return Sample(operations=len(items), seconds=time.perf_counter() - start)
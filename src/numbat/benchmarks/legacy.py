@@ -0,0 +1,108 @@
+import bisect
+import threading
+from collections.abc import Mapping, Sequence
+from datetime import datetime
+from uuid import UUID
+
+from pydantic import TypeAdapter
+
+from numbat.api.routes.prerecordings import models as rm
+from numbat.models.base import Serializable
+from numbat.services.entities.prerecordings.utils import ContentTypeChecker
+from numbat.utils.metrics import Histogram, PrometheusFormatter
+from numbat.utils.mime import MimeType, MimeTypeParser
+
+
+def encode_key(event: UUID, start: datetime) -> str:
+    """Encode an object key of a prerecording with a model built for each call."""
+    return f"{event}/{TypeAdapter(datetime).dump_python(start, mode='json')}"
+
+
+def decode_key(key: str) -> tuple[UUID, datetime] | None:
+    """Decode an object key of a prerecording with a model built for each call."""
+    split = key.find("/")
+    prefix, name = key[: split + 1], key[split + 1 :]
+
+    try:
+        event = UUID(prefix[:-1])
+        start = TypeAdapter(datetime).validate_python(name)
+    except ValueError:
+        return None
+
+    return event, start
+
+
+def parse_content_type(value: str) -> MimeType:
+    """Parse a content type with a parser built for each call."""
+    return MimeTypeParser().parse(value)
+
+
+def check_content_type(value: str) -> MimeType | None:
+    """Parse a content type and return it only if it is supported, without caching."""
+    parsed = parse_content_type(value)
+    return parsed if ContentTypeChecker().check(parsed) else None
+
+
+def encode_download_headers(response: rm.HeadDownloadResponse) -> Mapping[str, str]:
+    """Encode the headers of a `HEAD` download response with models for each call."""
+
+    def dump(value: Serializable) -> str:
+        return str(value.model_dump(mode="json", round_trip=True))
+
+    return {
+        "Content-Type": dump(
+            Serializable[rm.HeadDownloadResponseType](response.type),
+        ),
+        "Content-Length": dump(
+            Serializable[rm.HeadDownloadResponseSize](response.size),
+        ),
+        "ETag": dump(
+            Serializable[rm.HeadDownloadResponseTag](response.tag),
+        ),
+        "Last-Modified": dump(
+            Serializable[rm.HeadDownloadResponseModified](response.modified),
+        ),
+    }
+
+
+class LockedHistogram:
+    """Histogram that takes a single lock for every observation.
+
+    Args:
+        buckets: Upper bounds of the buckets.
+
+    """
+
+    def __init__(self, buckets: Sequence[float] = Histogram.DEFAULT_BUCKETS) -> None:
+        self._lock = threading.Lock()
+        self._buckets = buckets
+        self._counts = [0] * len(buckets)
+        self._count = 0
+        self._sum = 0.0
+
+    def observe(self, value: float) -> None:
+        """Observe a value."""
+        index = bisect.bisect_left(self._buckets, value)
+
+        with self._lock:
+            if index < len(self._counts):
+                self._counts[index] += 1
+
+            self._count += 1
+            self._sum += value
+
+    def render(self, name: str) -> Sequence[str]:
+        """Render the samples of the histogram in the Prometheus text format."""
+        lines: list[str] = []
+        cumulative = 0
+
+        for bucket, count in zip(self._buckets, self._counts, strict=True):
+            cumulative += count
+            bound = PrometheusFormatter.format_value(bucket)
+            lines.append(f'{name}_bucket{{le="{bound}"}} {cumulative}')
+
+        lines.append(f'{name}_bucket{{le="+Inf"}} {self._count}')
+        lines.append(f"{name}_sum {PrometheusFormatter.format_value(self._sum)}")
+        lines.append(f"{name}_count {self._count}")
+
+        return lines
@@ -0,0 +1,288 @@
+import asyncio
+import random
+import statistics
+import time
+from collections.abc import Mapping, Sequence
+from dataclasses import dataclass
+from datetime import datetime
+from enum import StrEnum
+from uuid import UUID
+
+from httpx import AsyncClient, HTTPError, Limits, Response, Timeout
+
+
+class LoadOperation(StrEnum):
+    """Operations sent to the service during a load test."""
+
+    LIST = "list"
+    HEAD = "head"
+    DOWNLOAD = "download"
+    UPLOAD = "upload"
+
+
+class LoadTestError(Exception):
+    """Base class for load test errors."""
+
+
+class EmptyMixError(LoadTestError):
+    """Raised when no operation has a positive weight."""
+
+    def __init__(self) -> None:
+        super().__init__("At least one operation must have a positive weight.")
+
+
+class NoPrerecordingsError(LoadTestError):
+    """Raised when there are no prerecordings to send HEAD requests for or download."""
+
+    def __init__(self, event: UUID) -> None:
+        super().__init__(f"Event {event} has no prerecordings to download.")
+
+
+class NoUploadTargetsError(LoadTestError):
+    """Raised when uploads are in the mix but there are no instances to upload to."""
+
+    def __init__(self) -> None:
+        super().__init__("Uploads need at least one instance to upload to.")
+
+
+@dataclass(frozen=True)
+class LoadOperationStats:
+    """Statistics of a single operation in a load test."""
+
+    operation: LoadOperation | None
+    """Operation the statistics are for, none for all operations together."""
+
+    requests: int
+    """Number of requests sent."""
+
+    errors: int
+    """Number of requests that failed or got an error response."""
+
+    bytes: int
+    """Number of bytes of content transferred."""
+
+    p50: float | None
+    """Median latency in seconds."""
+
+    p95: float | None
+    """95th percentile of latency in seconds."""
+
+    p99: float | None
+    """99th percentile of latency in seconds."""
+
+
+@dataclass(frozen=True)
+class LoadReport:
+    """Results of a load test."""
+
+    duration: float
+    """Number of seconds the load test ran for."""
+
+    concurrency: int
+    """Number of requests kept in flight."""
+
+    operations: Sequence[LoadOperationStats]
+    """Statistics of each operation in the mix."""
+
+    total: LoadOperationStats
+    """Statistics of all operations together."""
+
+
+@dataclass
+class _Record:
+    latencies: list[float]
+    errors: int = 0
+    bytes: int = 0
+
+
+class LoadTester:
+    """Drives a running service with a mix of prerecording requests.
+
+    The given number of workers send requests one after another until time runs out,
+    so that many requests are kept in flight at all times.
+    Each request is picked at random with the weights of the mix.
+    HEAD requests and downloads target existing prerecordings of the event,
+    while uploads go only to the given instances,
+    as they replace their prerecordings.
+
+    Args:
+        url: Base URL of the service.
+        event: Identifier of the prerecorded event to send requests for.
+        mix: Weights of the operations.
+        concurrency: Number of requests kept in flight.
+        duration: Number of seconds to send requests for.
+        uploads: Start datetimes of instances to upload prerecordings to.
+        size: Number of bytes of uploaded prerecordings.
+        seed: Seed of the random choice of operations.
+
+    """
+
+    CONTENT_TYPE = "audio/ogg"
+    """Content type of uploaded prerecordings."""
+
+    def __init__(  # noqa: PLR0913
+        self,
+        url: str,
+        event: UUID,
+        mix: Mapping[LoadOperation, int],
+        concurrency: int,
+        duration: float,
+        uploads: Sequence[datetime] = (),
+        size: int = 1024**2,
+        seed: int | None = None,
+    ) -> None:
+        self._url = url
+        self._event = event
+        self._mix = {operation: weight for operation, weight in mix.items() if weight}
+        self._concurrency = concurrency
+        self._duration = duration
+        self._uploads = uploads
+        self._data = bytes(size)
+        self._random = random.Random(seed)  # noqa: S311
+        self._starts: Sequence[str] = []
+
+    def _path(self, start: str | None = None) -> str:
+        path = f"/prerecordings/{self._event}"
+        return path if start is None else f"{path}/{start}"
+
+    async def _prepare(self, client: AsyncClient) -> None:
+        if not self._mix:
+            raise EmptyMixError
+
+        if LoadOperation.UPLOAD in self._mix and not self._uploads:
+            raise NoUploadTargetsError
+
+        response = await client.get(self._path(), params={"limit": "100"})
+        response.raise_for_status()
+
+        self._starts = [
+            prerecording["start"] for prerecording in response.json()["prerecordings"]
+        ]
+
+        needed = self._mix.keys() & {LoadOperation.HEAD, LoadOperation.DOWNLOAD}
+
+        if needed and not self._starts:
+            raise NoPrerecordingsError(self._event)
+
+    async def _send(self, client: AsyncClient, operation: LoadOperation) -> int:
+        match operation:
+            case LoadOperation.LIST:
+                response = await client.get(self._path())
+                return self._check(response, len(response.content))
+            case LoadOperation.HEAD:
+                start = self._random.choice(self._starts)
+                response = await client.head(self._path(start))
+                return self._check(response, 0)
+            case LoadOperation.DOWNLOAD:
+                start = self._random.choice(self._starts)
+
+                async with client.stream("GET", self._path(start)) as response:
+                    size = 0
+
+                    async for chunk in response.aiter_raw():
+                        size += len(chunk)
+
+                return self._check(response, size)
+            case LoadOperation.UPLOAD:
+                start = self._random.choice(self._uploads).isoformat()
+                response = await client.put(
+                    self._path(start),
+                    content=self._data,
+                    headers={"Content-Type": self.CONTENT_TYPE},
+                )
+                return self._check(response, len(self._data))
+
+    def _check(self, response: Response, size: int) -> int:
+        response.raise_for_status()
+        return size
+
+    async def _work(
+        self,
+        client: AsyncClient,
+        deadline: float,
+        records: Mapping[LoadOperation, _Record],
+    ) -> None:
+        operations = list(self._mix.keys())
+        weights = list(self._mix.values())
+
+        while time.perf_counter() < deadline:
+            operation = self._random.choices(operations, weights)[0]
+            record = records[operation]
+            start = time.perf_counter()
+
+            try:
+                record.bytes += await self._send(client, operation)
+            except HTTPError:
+                record.errors += 1
+
+            record.latencies.append(time.perf_counter() - start)
+
+    def _percentiles(
+        self, latencies: Sequence[float]
+    ) -> tuple[float | None, float | None, float | None]:
+        if not latencies:
+            return None, None, None
+
+        if len(latencies) == 1:
+            return latencies[0], latencies[0], latencies[0]
+
+        quantiles = statistics.quantiles(latencies, n=100, method="inclusive")
+        return quantiles[49], quantiles[94], quantiles[98]
+
+    def _stats(
+        self, operation: LoadOperation | None, record: _Record
+    ) -> LoadOperationStats:
+        p50, p95, p99 = self._percentiles(record.latencies)
+
+        return LoadOperationStats(
+            operation=operation,
+            requests=len(record.latencies),
+            errors=record.errors,
+            bytes=record.bytes,
+            p50=p50,
+            p95=p95,
+            p99=p99,
+        )
+
+    async def run(self) -> LoadReport:
+        """Run the load test and collect the results."""
+        records = {operation: _Record(latencies=[]) for operation in self._mix}
+
+        async with AsyncClient(
+            base_url=self._url,
+            timeout=Timeout(60),
+            limits=Limits(
+                max_connections=self._concurrency,
+                max_keepalive_connections=self._concurrency,
+            ),
+        ) as client:
+            await self._prepare(client)
+
+            start = time.perf_counter()
+            deadline = start + self._duration
+
+            await asyncio.gather(
+                *[
+                    self._work(client, deadline, records)
+                    for _ in range(self._concurrency)
+                ]
+            )
+
+            duration = time.perf_counter() - start
+
+        total = _Record(
+            latencies=[
+                latency for record in records.values() for latency in record.latencies
+            ],
+            errors=sum(record.errors for record in records.values()),
+            bytes=sum(record.bytes for record in records.values()),
+        )
+
+        return LoadReport(
+            duration=duration,
+            concurrency=self._concurrency,
+            operations=[
+                self._stats(operation, record) for operation, record in records.items()
+            ],
+            total=self._stats(None, total),
+        )
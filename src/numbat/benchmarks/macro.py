@@ -0,0 +1,299 @@
+import asyncio
+import time
+from contextlib import AsyncExitStack
+from datetime import datetime, timedelta
+from typing import Any, cast, override
+
+from httpx import ASGITransport, AsyncClient
+from litestar import Litestar
+
+from numbat.api.app import AppBuilder
+from numbat.benchmarks.base import Benchmark, BenchmarkGroup, Sample
+from numbat.config.models import (
+    AmberBackendType,
+    AmberConfig,
+    BeaverBackendType,
+    BeaverConfig,
+    BeaverFakeConfig,
+    Config,
+    FaultsConfig,
+    MonitorConfig,
+)
+from numbat.models.events import prerecordings as ev
+from numbat.services.apis.beaver import models as bm
+from numbat.services.apis.beaver.fake import FakeSchedule
+from numbat.services.data.amber import models as am
+from numbat.services.events.dispatcher import EventsDispatcher, Subscription
+
+
+class OfflineApp:
+    """App running against local stand-ins, with a client to send requests.
+
+    Requests are passed to the app directly in the same event loop,
+    without a server or network in between.
+    The schedule has a single event with an instance every quarter of an hour,
+    so any number of prerecordings can be stored for it.
+    Faults can be injected into the stand-ins, to measure the app under them.
+
+    Args:
+        amber: Configuration for injecting faults into the amber database.
+        beaver: Configuration for injecting faults into the beaver service.
+
+    """
+
+    PERIOD = 15 * 60
+    """Number of seconds between instances of the event."""
+
+    CONTENT_TYPE = "audio/ogg"
+    """Content type of uploaded prerecordings."""
+
+    def __init__(
+        self,
+        amber: FaultsConfig | None = None,
+        beaver: FaultsConfig | None = None,
+    ) -> None:
+        self._config = Config(
+            amber=AmberConfig(
+                backend=AmberBackendType.MEMORY, faults=amber or FaultsConfig()
+            ),
+            beaver=BeaverConfig(
+                backend=BeaverBackendType.FAKE,
+                fake=BeaverFakeConfig(
+                    duration=self.PERIOD, events=1, period=self.PERIOD
+                ),
+                faults=beaver or FaultsConfig(),
+            ),
+            debug=False,
+            monitor=MonitorConfig(enabled=False),
+        )
+        self._event = FakeSchedule(self._config.beaver.fake).events[0]
+        self._app = AppBuilder(self._config).build()
+        self._client = AsyncClient(
+            transport=ASGITransport(app=cast("Any", self._app)),
+            base_url="http://numbat",
+        )
+        self._stack = AsyncExitStack()
+
+    @property
+    def event(self) -> bm.Event:
+        """Event that prerecordings are stored for."""
+        return self._event
+
+    @property
+    def app(self) -> Litestar:
+        """App under test."""
+        return self._app
+
+    @property
+    def client(self) -> AsyncClient:
+        """Client to send requests to the app with."""
+        return self._client
+
+    async def start(self) -> None:
+        """Run the startup of the app."""
+        await self._stack.enter_async_context(self._app.lifespan())
+        await self._stack.enter_async_context(self._client)
+
+    async def stop(self) -> None:
+        """Run the shutdown of the app."""
+        await self._stack.aclose()
+
+    def start_of(self, index: int) -> datetime:
+        """Start datetime of the instance with the given index."""
+        return FakeSchedule.ANCHOR + timedelta(seconds=self.PERIOD * index)
+
+    def path(self, index: int = 0) -> str:
+        """Path of the prerecording of the instance with the given index."""
+        return f"/prerecordings/{self._event.id}/{self.start_of(index).isoformat()}"
+
+    def list_path(self) -> str:
+        """Path to list prerecordings of the event."""
+        return f"/prerecordings/{self._event.id}"
+
+    async def upload(self, data: bytes, index: int = 0) -> None:
+        """Upload a prerecording through the app."""
+        response = await self._client.put(
+            self.path(index),
+            content=data,
+            headers={"Content-Type": self.CONTENT_TYPE},
+        )
+        response.raise_for_status()
+
+    async def seed(self, count: int, size: int) -> None:
+        """Store prerecordings for the first instances of the event.
+
+        Only the first one is uploaded through the app,
+        the rest are copied from it directly in the amber database.
+        """
+        await self.upload(bytes(size))
+
+        amber = self._app.state.amber
+        source = f"{self._event.id}/{self.start_of(0).isoformat()}"
+        semaphore = asyncio.Semaphore(64)
+
+        async def copy(index: int) -> None:
+            destination = f"{self._event.id}/{self.start_of(index).isoformat()}"
+
+            async with semaphore:
+                await amber.copy(am.CopyRequest(source=source, destination=destination))
+
+        await asyncio.gather(*[copy(index) for index in range(1, count)])
+
+
+class ListBenchmark(Benchmark):
+    """Listing and filtering prerecordings of an event through the app."""
+
+    group = BenchmarkGroup.MACRO
+    rounds = 3
+
+    def __init__(self, count: int) -> None:
+        self.name = f"list.{count}"
+        self._count = count
+        self._app = OfflineApp()
+
+    @override
+    async def setup(self) -> None:
+        await self._app.start()
+        await self._app.seed(self._count, 1024)
+
+    @override
+    async def run(self) -> Sample:
+        start = time.perf_counter()
+
+        response = await self._app.client.get(
+            self._app.list_path(), params={"limit": "10"}
+        )
+        response.raise_for_status()
+
+        return Sample(operations=self._count, seconds=time.perf_counter() - start)
+
+    @override
+    async def teardown(self) -> None:
+        await self._app.stop()
+
+
+class FanoutBenchmark(Benchmark):
+    """Passing events from publishers to many subscribers."""
+
+    name = "sse.fanout"
+    group = BenchmarkGroup.MACRO
+
+    EVENTS = 50
+    """Number of events published in each round."""
+
+    def __init__(self, subscribers: int) -> None:
+        self._app = OfflineApp()
+        self._subscribers = subscribers
+        self._subscriptions: list[Subscription] = []
+        self._stack = AsyncExitStack()
+
+    @property
+    def _dispatcher(self) -> EventsDispatcher:
+        return self._app.app.state.dispatcher
+
+    @override
+    async def setup(self) -> None:
+        await self._app.start()
+
+        for _ in range(self._subscribers):
+            subscription = await self._stack.enter_async_context(
+                self._dispatcher.subscribe(None)
+            )
+            self._subscriptions.append(subscription)
+
+    @override
+    async def run(self) -> Sample:
+        event = ev.PrerecordingUploadedEvent(
+            data=ev.PrerecordingUploadedEventData(
+                event=self._app.event.id,
+                start=self._app.start_of(0),
+                size=0,
+                tag="",
+            )
+        )
+
+        async def receive(index: int) -> None:
+            for _ in range(self.EVENTS):
+                await self._subscriptions[index].get()
+
+        start = time.perf_counter()
+
+        tasks = [
+            asyncio.create_task(receive(index)) for index in range(self._subscribers)
+        ]
+
+        for _ in range(self.EVENTS):
+            await self._dispatcher.publish(event)
+
+        await asyncio.gather(*tasks)
+
+        return Sample(
+            operations=self._subscribers * self.EVENTS,
+            seconds=time.perf_counter() - start,
+        )
+
+    @override
+    async def teardown(self) -> None:
+        await self._stack.aclose()
+        await self._app.stop()
+
+
+class DownloadBenchmark(Benchmark):
+    """Downloading a prerecording through the app."""
+
+    name = "e2e.download"
+    group = BenchmarkGroup.MACRO
+
+    def __init__(self, size: int) -> None:
+        self._app = OfflineApp()
+        self._size = size
+
+    @override
+    async def setup(self) -> None:
+        await self._app.start()
+        await self._app.seed(1, self._size)
+
+    @override
+    async def run(self) -> Sample:
+        start = time.perf_counter()
+
+        response = await self._app.client.get(self._app.path())
+        response.raise_for_status()
+
+        return Sample(
+            operations=1,
+            seconds=time.perf_counter() - start,
+            bytes=len(response.content),
+        )
+
+    @override
+    async def teardown(self) -> None:
+        await self._app.stop()
+
+
+class UploadBenchmark(Benchmark):
+    """Uploading a prerecording through the app."""
+
+    name = "e2e.upload"
+    group = BenchmarkGroup.MACRO
+
+    def __init__(self, size: int) -> None:
+        self._app = OfflineApp()
+        self._data = bytes(size)
+
+    @override
+    async def setup(self) -> None:
+        await self._app.start()
+
+    @override
+    async def run(self) -> Sample:
+        start = time.perf_counter()
+        await self._app.upload(self._data)
+
+        return Sample(
+            operations=1, seconds=time.perf_counter() - start, bytes=len(self._data)
+        )
+
+    @override
+    async def teardown(self) -> None:
+        await self._app.stop()
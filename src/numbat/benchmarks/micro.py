@@ -0,0 +1,314 @@
+import asyncio
+import time
+from collections.abc import AsyncGenerator, Generator, Sequence
+from datetime import UTC, datetime, timedelta
+from typing import override
+from uuid import UUID, uuid5
+
+from numbat.api.routes.prerecordings import models as rm
+from numbat.api.routes.prerecordings.controller import DownloadHeadersEncoder
+from numbat.benchmarks import legacy
+from numbat.benchmarks.base import Benchmark, BenchmarkGroup, Sample, measure
+from numbat.services.entities.prerecordings.utils import ContentTypeChecker, KeyCodec
+from numbat.utils import asyncify, syncify
+from numbat.utils.metrics import Registry
+from numbat.utils.mime import MimeType
+from numbat.utils.read import ReadableIterator
+
+CONTENT_TYPES = [
+    "audio/ogg",
+    "audio/ogg; codecs=opus",
+    "audio/mpeg",
+    "application/octet-stream",
+    'text/plain; charset="utf-8"',
+]
+
+
+def make_keys(count: int) -> Sequence[tuple[UUID, datetime]]:
+    """Make events and start datetimes of prerecordings spread over ten events."""
+    events = [uuid5(UUID(int=0), str(index)) for index in range(10)]
+    start = datetime(2024, 1, 1, 12, 0, 0)
+
+    return [
+        (events[index % len(events)], start + timedelta(minutes=15 * index))
+        for index in range(count)
+    ]
+
+
+class KeysEncodeBenchmark(Benchmark):
+    """Encoding object keys of prerecordings."""
+
+    name = "keys.encode"
+    group = BenchmarkGroup.MICRO
+
+    def __init__(self, count: int) -> None:
+        self._codec = KeyCodec()
+        self._items = make_keys(count)
+
+    @override
+    async def run(self) -> Sample:
+        return measure(lambda item: self._codec.encode(*item), self._items)
+
+
+class KeysDecodeBenchmark(Benchmark):
+    """Decoding object keys of prerecordings."""
+
+    name = "keys.decode"
+    group = BenchmarkGroup.MICRO
+
+    def __init__(self, count: int) -> None:
+        self._codec = KeyCodec()
+        self._keys = [self._codec.encode(*item) for item in make_keys(count)]
+
+    @override
+    async def run(self) -> Sample:
+        return measure(self._codec.decode, self._keys)
+
+
+class KeysEncodeLegacyBenchmark(Benchmark):
+    """Encoding object keys of prerecordings like before the key codec."""
+
+    name = "keys.encode.legacy"
+    group = BenchmarkGroup.MICRO
+
+    def __init__(self, count: int) -> None:
+        self._items = make_keys(count)
+
+    @override
+    async def run(self) -> Sample:
+        return measure(lambda item: legacy.encode_key(*item), self._items)
+
+
+class KeysDecodeLegacyBenchmark(Benchmark):
+    """Decoding object keys of prerecordings like before the key codec."""
+
+    name = "keys.decode.legacy"
+    group = BenchmarkGroup.MICRO
+
+    def __init__(self, count: int) -> None:
+        self._keys = [legacy.encode_key(*item) for item in make_keys(count)]
+
+    @override
+    async def run(self) -> Sample:
+        return measure(legacy.decode_key, self._keys)
+
+
+def make_content_types(count: int) -> Sequence[str]:
+    """Make content types of uploads repeating a few common ones."""
+    return [CONTENT_TYPES[index % len(CONTENT_TYPES)] for index in range(count)]
+
+
+class MimeParseBenchmark(Benchmark):
+    """Parsing content types."""
+
+    name = "mime.parse"
+    group = BenchmarkGroup.MICRO
+
+    def __init__(self, count: int) -> None:
+        self._values = make_content_types(count)
+
+    @override
+    async def run(self) -> Sample:
+        return measure(MimeType.parse, self._values)
+
+
+class MimeParseLegacyBenchmark(Benchmark):
+    """Parsing content types without caching."""
+
+    name = "mime.parse.legacy"
+    group = BenchmarkGroup.MICRO
+
+    def __init__(self, count: int) -> None:
+        self._values = make_content_types(count)
+
+    @override
+    async def run(self) -> Sample:
+        return measure(legacy.parse_content_type, self._values)
+
+
+class MimeCheckBenchmark(Benchmark):
+    """Checking whether content types of uploads are supported."""
+
+    name = "mime.check"
+    group = BenchmarkGroup.MICRO
+
+    def __init__(self, count: int) -> None:
+        self._checker = ContentTypeChecker()
+        self._values = make_content_types(count)
+
+    @override
+    async def run(self) -> Sample:
+        return measure(self._checker.parse, self._values)
+
+
+class MimeCheckLegacyBenchmark(Benchmark):
+    """Checking whether content types of uploads are supported without caching."""
+
+    name = "mime.check.legacy"
+    group = BenchmarkGroup.MICRO
+
+    def __init__(self, count: int) -> None:
+        self._values = make_content_types(count)
+
+    @override
+    async def run(self) -> Sample:
+        return measure(legacy.check_content_type, self._values)
+
+
+def make_responses(count: int) -> Sequence[rm.HeadDownloadResponse]:
+    """Make responses to `HEAD` requests for prerecordings of different sizes."""
+    types = [MimeType.parse(value) for value in CONTENT_TYPES[:2]]
+    modified = datetime(2024, 1, 1, 12, 0, 0, tzinfo=UTC)
+
+    return [
+        rm.HeadDownloadResponse(
+            type=types[index % len(types)],
+            size=index,
+            tag=f'"{index:032x}"',
+            modified=modified + timedelta(seconds=index),
+        )
+        for index in range(count)
+    ]
+
+
+class HeadersEncodeBenchmark(Benchmark):
+    """Encoding headers of download responses."""
+
+    name = "headers.encode"
+    group = BenchmarkGroup.MICRO
+
+    def __init__(self, count: int) -> None:
+        self._encoder = DownloadHeadersEncoder(head=True)
+        self._responses = make_responses(count)
+
+    @override
+    async def run(self) -> Sample:
+        return measure(self._encoder.encode, self._responses)
+
+
+class HeadersEncodeLegacyBenchmark(Benchmark):
+    """Encoding headers of download responses with models built for each response."""
+
+    name = "headers.encode.legacy"
+    group = BenchmarkGroup.MICRO
+
+    def __init__(self, count: int) -> None:
+        self._responses = make_responses(count)
+
+    @override
+    async def run(self) -> Sample:
+        return measure(legacy.encode_download_headers, self._responses)
+
+
+def make_latencies(count: int) -> Sequence[float]:
+    """Make latencies in seconds spread over the default histogram buckets."""
+    return [(index % 100) / 10 for index in range(count)]
+
+
+class MetricsObserveBenchmark(Benchmark):
+    """Observing latencies with a histogram."""
+
+    name = "metrics.observe"
+    group = BenchmarkGroup.MICRO
+
+    def __init__(self, count: int) -> None:
+        self._histogram = Registry().histogram("latency", "Latency.").labels()
+        self._values = make_latencies(count)
+
+    @override
+    async def run(self) -> Sample:
+        return measure(self._histogram.observe, self._values)
+
+
+class MetricsObserveLegacyBenchmark(Benchmark):
+    """Observing latencies with a histogram that takes a lock for each observation."""
+
+    name = "metrics.observe.legacy"
+    group = BenchmarkGroup.MICRO
+
+    def __init__(self, count: int) -> None:
+        self._histogram = legacy.LockedHistogram()
+        self._values = make_latencies(count)
+
+    @override
+    async def run(self) -> Sample:
+        return measure(self._histogram.observe, self._values)
+
+
+class ReadBenchmark(Benchmark):
+    """Reading parts of uploads from chunks of the request body."""
+
+    name = "read.iterator"
+    group = BenchmarkGroup.MICRO
+
+    CHUNK = 64 * 1024
+    """Size of chunks of the request body."""
+
+    PART = 5 * 1024**2
+    """Size of parts read by the client of the amber database."""
+
+    def __init__(self, size: int) -> None:
+        self._chunks = [bytes(self.CHUNK)] * (size // self.CHUNK)
+
+    @override
+    async def run(self) -> Sample:
+        reader = ReadableIterator(iter(self._chunks), retained=4)
+        operations = 0
+        size = 0
+
+        start = time.perf_counter()
+
+        while part := reader.read(self.PART):
+            operations += 1
+            size += len(part)
+
+        reader.close()
+
+        return Sample(
+            operations=operations, seconds=time.perf_counter() - start, bytes=size
+        )
+
+
+class AsyncifyBenchmark(Benchmark):
+    """Iterating a synchronous generator from the event loop."""
+
+    name = "asyncify.generator"
+    group = BenchmarkGroup.MICRO
+
+    def __init__(self, count: int) -> None:
+        self._count = count
+
+    def _generate(self) -> Generator[int]:
+        yield from range(self._count)
+
+    @override
+    async def run(self) -> Sample:
+        start = time.perf_counter()
+
+        async for _ in asyncify.Generator(self._generate()):
+            pass
+
+        return Sample(operations=self._count, seconds=time.perf_counter() - start)
+
+
+class SyncifyBenchmark(Benchmark):
+    """Iterating an async generator from a thread."""
+
+    name = "syncify.iterator"
+    group = BenchmarkGroup.MICRO
+
+    def __init__(self, count: int) -> None:
+        self._count = count
+
+    async def _generate(self) -> AsyncGenerator[int]:
+        for item in range(self._count):
+            yield item
+
+    @override
+    async def run(self) -> Sample:
+        iterator = syncify.Iterator(self._generate())
+
+        start = time.perf_counter()
+        await asyncio.to_thread(lambda: sum(1 for _ in iterator))
+
+        return Sample(operations=self._count, seconds=time.perf_counter() - start)
@@ -0,0 +1,128 @@
+import statistics
+from collections.abc import Sequence
+from enum import StrEnum
+
+from numbat.benchmarks.base import BenchmarkGroup
+from numbat.models.base import SerializableModel
+from numbat.utils.time import AwareDatetime
+
+
+class Round(SerializableModel):
+    """Measurement of a single round of a benchmark."""
+
+    operations: int
+    """Number of operations done in the round."""
+
+    seconds: float
+    """Number of seconds the round took."""
+
+    bytes: int
+    """Number of bytes transferred in the round."""
+
+
+class Result(SerializableModel):
+    """Result of a benchmark."""
+
+    name: str
+    """Name of the benchmark."""
+
+    group: BenchmarkGroup
+    """Group of the benchmark."""
+
+    rounds: Sequence[Round]
+    """Measurements of the rounds."""
+
+    @property
+    def time(self) -> float:
+        """Median number of seconds per operation."""
+        return statistics.median(
+            measured.seconds / measured.operations for measured in self.rounds
+        )
+
+    @property
+    def throughput(self) -> float | None:
+        """Median number of bytes per second, if bytes were transferred."""
+        if not any(measured.bytes for measured in self.rounds):
+            return None
+
+        return statistics.median(
+            measured.bytes / measured.seconds for measured in self.rounds
+        )
+
+
+class Report(SerializableModel):
+    """Results of a run of the benchmark suite."""
+
+    created: AwareDatetime
+    """Datetime the suite was run at."""
+
+    python: str
+    """Version of Python the suite was run with."""
+
+    platform: str
+    """Platform the suite was run on."""
+
+    results: Sequence[Result]
+    """Results of the benchmarks."""
+
+
+class ChangeStatus(StrEnum):
+    """Statuses of benchmarks compared with a baseline."""
+
+    REGRESSION = "regression"
+    """Slower than the baseline by more than the tolerance."""
+
+    IMPROVEMENT = "improvement"
+    """Faster than the baseline by more than the tolerance."""
+
+    UNCHANGED = "unchanged"
+    """Within the tolerance of the baseline."""
+
+    NEW = "new"
+    """Not in the baseline."""
+
+    MISSING = "missing"
+    """Only in the baseline."""
+
+
+class Change(SerializableModel):
+    """Change of a benchmark compared with a baseline."""
+
+    name: str
+    """Name of the benchmark."""
+
+    baseline: float | None
+    """Seconds per operation in the baseline."""
+
+    current: float | None
+    """Seconds per operation in the current run."""
+
+    status: ChangeStatus
+    """Status of the benchmark."""
+
+    @property
+    def ratio(self) -> float | None:
+        """Current time relative to the baseline, if there are both."""
+        if self.baseline is None or self.current is None:
+            return None
+
+        return self.current / self.baseline
+
+
+class Comparison(SerializableModel):
+    """Comparison of a run of the benchmark suite with a baseline."""
+
+    tolerance: float
+    """Relative change of time that is not flagged."""
+
+    changes: Sequence[Change]
+    """Changes of the benchmarks."""
+
+    @property
+    def regressions(self) -> Sequence[Change]:
+        """Changes flagged as regressions."""
+        return [
+            change
+            for change in self.changes
+            if change.status == ChangeStatus.REGRESSION
+        ]
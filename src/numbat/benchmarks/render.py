@@ -0,0 +1,131 @@
+from rich.table import Table
+
+from numbat.benchmarks import models as m
+from numbat.benchmarks.load import LoadOperationStats, LoadReport
+
+
+def format_seconds(seconds: float | None) -> str:
+    """Format a number of seconds with a unit that fits it."""
+    if seconds is None:
+        return "-"
+
+    for unit, scale in (("s", 1), ("ms", 1e-3), ("µs", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.2f} {unit}"
+
+    return f"{seconds / 1e-9:.2f} ns"
+
+
+def format_bytes(rate: float | None) -> str:
+    """Format a number of bytes per second."""
+    if rate is None:
+        return "-"
+
+    return f"{rate / 1024**2:.1f} MiB/s"
+
+
+class ReportTableBuilder:
+    """Builds a table of the results of the benchmark suite.
+
+    Args:
+        report: Results of the benchmark suite.
+        comparison: Comparison of the results with a baseline, if there is one.
+
+    """
+
+    def __init__(self, report: m.Report, comparison: m.Comparison | None) -> None:
+        self._report = report
+        self._comparison = comparison
+
+    def _change(self, change: m.Change) -> str:
+        ratio = change.ratio
+
+        if ratio is None:
+            return change.status
+
+        return f"{ratio - 1:+.1%} {change.status}"
+
+    def build(self) -> Table:
+        """Build the table."""
+        table = Table(title="Benchmarks")
+        table.add_column("Benchmark", no_wrap=True)
+        table.add_column("Group")
+        table.add_column("Time per operation", justify="right")
+        table.add_column("Operations per second", justify="right")
+        table.add_column("Throughput", justify="right")
+
+        changes = {}
+
+        if self._comparison is not None:
+            table.add_column("Baseline", justify="right")
+            table.add_column("Change", justify="right")
+            changes = {change.name: change for change in self._comparison.changes}
+
+        for result in self._report.results:
+            row = [
+                result.name,
+                result.group,
+                format_seconds(result.time),
+                f"{1 / result.time:,.0f}",
+                format_bytes(result.throughput),
+            ]
+
+            if (change := changes.get(result.name)) is not None:
+                style = "red" if change.status == m.ChangeStatus.REGRESSION else None
+                row.extend([format_seconds(change.baseline), self._change(change)])
+                table.add_row(*row, style=style)
+            else:
+                table.add_row(*row)
+
+        return table
+
+
+class LoadReportTableBuilder:
+    """Builds a table of the results of a load test.
+
+    Args:
+        report: Results of the load test.
+
+    """
+
+    def __init__(self, report: LoadReport) -> None:
+        self._report = report
+
+    def _row(self, stats: LoadOperationStats) -> list[str]:
+        duration = self._report.duration
+
+        return [
+            stats.operation or "total",
+            f"{stats.requests:,}",
+            f"{stats.errors:,}",
+            format_seconds(stats.p50),
+            format_seconds(stats.p95),
+            format_seconds(stats.p99),
+            f"{stats.requests / duration:,.1f}",
+            format_bytes(stats.bytes / duration if stats.bytes else None),
+        ]
+
+    def build(self) -> Table:
+        """Build the table."""
+        table = Table(
+            title=(
+                f"Load test: {self._report.duration:.1f} s "
+                f"at concurrency {self._report.concurrency}"
+            )
+        )
+        table.add_column("Operation")
+        table.add_column("Requests", justify="right")
+        table.add_column("Errors", justify="right")
+        table.add_column("p50", justify="right")
+        table.add_column("p95", justify="right")
+        table.add_column("p99", justify="right")
+        table.add_column("Requests per second", justify="right")
+        table.add_column("Throughput", justify="right")
+
+        for stats in self._report.operations:
+            table.add_row(*self._row(stats))
+
+        table.add_section()
+        table.add_row(*self._row(self._report.total), style="bold")
+
+        return table
@@ -0,0 +1,183 @@
+import fnmatch
+import platform
+from collections.abc import Sequence
+from pathlib import Path
+
+from numbat.benchmarks import macro, micro
+from numbat.benchmarks import models as m
+from numbat.benchmarks.base import Benchmark
+from numbat.utils.time import awareutcnow
+
+
+class BenchmarkSuite:
+    """Benchmarks of the hot paths of the service.
+
+    Args:
+        quick: Whether to use smaller inputs and skip the slowest benchmarks.
+
+    """
+
+    def __init__(self, *, quick: bool = False) -> None:
+        self._quick = quick
+
+    def _micro(self) -> Sequence[Benchmark]:
+        count = 10_000 if self._quick else 100_000
+        bridged = 1_000 if self._quick else 10_000
+        size = 16 * 1024**2 if self._quick else 64 * 1024**2
+
+        return [
+            micro.KeysEncodeBenchmark(count),
+            micro.KeysDecodeBenchmark(count),
+            micro.KeysEncodeLegacyBenchmark(count),
+            micro.KeysDecodeLegacyBenchmark(count),
+            micro.MimeParseBenchmark(count),
+            micro.MimeParseLegacyBenchmark(count),
+            micro.MimeCheckBenchmark(count),
+            micro.MimeCheckLegacyBenchmark(count),
+            micro.HeadersEncodeBenchmark(count // 10),
+            micro.HeadersEncodeLegacyBenchmark(count // 10),
+            micro.MetricsObserveBenchmark(count),
+            micro.MetricsObserveLegacyBenchmark(count),
+            micro.ReadBenchmark(size),
+            micro.AsyncifyBenchmark(bridged),
+            micro.SyncifyBenchmark(bridged),
+        ]
+
+    def _macro(self) -> Sequence[Benchmark]:
+        counts = [1_000] if self._quick else [1_000, 10_000, 100_000]
+        subscribers = 100 if self._quick else 1_000
+        size = 4 * 1024**2 if self._quick else 64 * 1024**2
+
+        return [
+            *(macro.ListBenchmark(count) for count in counts),
+            macro.FanoutBenchmark(subscribers),
+            macro.DownloadBenchmark(size),
+            macro.UploadBenchmark(size),
+        ]
+
+    def build(self, patterns: Sequence[str] | None = None) -> Sequence[Benchmark]:
+        """Build the benchmarks of the suite with names matching any of the patterns.
+
+        Patterns are shell-style wildcards, like `list.*`.
+        All benchmarks are built if no patterns are given.
+        """
+        return [
+            benchmark
+            for benchmark in [*self._micro(), *self._macro()]
+            if not patterns
+            or any(fnmatch.fnmatchcase(benchmark.name, pattern) for pattern in patterns)
+        ]
+
+
+class BenchmarkRunner:
+    """Runs benchmarks and collects their results.
+
+    Each benchmark runs for a number of warmup rounds that are not measured
+    and then for the given number of rounds,
+    unless it allows fewer rounds because it is slow.
+
+    Args:
+        rounds: Number of measured rounds of each benchmark.
+        warmup: Number of warmup rounds of each benchmark.
+
+    """
+
+    def __init__(self, rounds: int = 5, warmup: int = 1) -> None:
+        self._rounds = rounds
+        self._warmup = warmup
+
+    async def _run(self, benchmark: Benchmark) -> m.Result:
+        rounds = min(self._rounds, benchmark.rounds or self._rounds)
+        measured = []
+
+        await benchmark.setup()
+
+        try:
+            for _ in range(self._warmup):
+                await benchmark.run()
+
+            for _ in range(rounds):
+                sample = await benchmark.run()
+                measured.append(
+                    m.Round(
+                        operations=sample.operations,
+                        seconds=sample.seconds,
+                        bytes=sample.bytes,
+                    )
+                )
+        finally:
+            await benchmark.teardown()
+
+        return m.Result(name=benchmark.name, group=benchmark.group, rounds=measured)
+
+    async def run(self, benchmarks: Sequence[Benchmark]) -> m.Report:
+        """Run the benchmarks one after another."""
+        return m.Report(
+            created=awareutcnow(),
+            python=platform.python_version(),
+            platform=platform.platform(),
+            results=[await self._run(benchmark) for benchmark in benchmarks],
+        )
+
+
+class BaselineStore:
+    """Stores reports of the benchmark suite as JSON files to compare with later."""
+
+    def save(self, path: Path, report: m.Report) -> None:
+        """Save a report as a baseline."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(report.model_dump_json(indent=2))
+
+    def load(self, path: Path) -> m.Report:
+        """Load a baseline."""
+        return m.Report.model_validate_json(path.read_text())
+
+
+class BaselineComparator:
+    """Compares reports of the benchmark suite with a baseline.
+
+    Benchmarks are compared by the median time per operation.
+
+    Args:
+        tolerance: Relative change of time that is not flagged.
+
+    """
+
+    def __init__(self, tolerance: float = 0.2) -> None:
+        self._tolerance = tolerance
+
+    def _status(self, baseline: float, current: float) -> m.ChangeStatus:
+        if current > baseline * (1 + self._tolerance):
+            return m.ChangeStatus.REGRESSION
+
+        if current < baseline * (1 - self._tolerance):
+            return m.ChangeStatus.IMPROVEMENT
+
+        return m.ChangeStatus.UNCHANGED
+
+    def compare(self, baseline: m.Report, current: m.Report) -> m.Comparison:
+        """Compare a report with a baseline."""
+        previous = {result.name: result.time for result in baseline.results}
+        changes = []
+
+        for result in current.results:
+            time = previous.pop(result.name, None)
+            changes.append(
+                m.Change(
+                    name=result.name,
+                    baseline=time,
+                    current=result.time,
+                    status=self._status(time, result.time)
+                    if time is not None
+                    else m.ChangeStatus.NEW,
+                )
+            )
+
+        changes.extend(
+            m.Change(
+                name=name, baseline=time, current=None, status=m.ChangeStatus.MISSING
+            )
+            for name, time in previous.items()
+        )
+
+        return m.Comparison(tolerance=self._tolerance, changes=changes)
@@ -1,10 +1,125 @@
-from collections.abc import Sequence
+import tempfile
+from collections.abc import Mapping, Sequence
+from enum import StrEnum
+from pathlib import Path
+from typing import Self
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
 
 from numbat.config.base import BaseConfig
 
 
+class ProfilerConfig(BaseModel):
+    """Configuration for the sampling profiler."""
+
+    interval: float = Field(default=0.01, ge=0.001)
+    """Number of seconds between samples."""
+
+    limit: float = Field(default=60, gt=0)
+    """Maximum number of seconds to profile for."""
+
+
+class AdminConfig(BaseModel):
+    """Configuration for admin endpoints."""
+
+    enabled: bool = False
+    """Whether admin endpoints are available."""
+
+    profiler: ProfilerConfig = ProfilerConfig()
+    """Configuration for the sampling profiler."""
+
+    token: str | None = None
+    """Token that clients must send as a bearer token."""
+
+    @model_validator(mode="after")
+    def _require_token(self) -> Self:
+        if self.enabled and not self.token:
+            msg = "A token is required when admin endpoints are enabled."
+            raise ValueError(msg)
+
+        return self
+
+
+class LatencyDistribution(StrEnum):
+    """Distributions of latency added by injected faults."""
+
+    CONSTANT = "constant"
+    """Always add the mean latency."""
+
+    UNIFORM = "uniform"
+    """Add latency spread evenly around the mean."""
+
+    EXPONENTIAL = "exponential"
+    """Add mostly short latency with occasional long delays."""
+
+    LOGNORMAL = "lognormal"
+    """Add latency with a long tail, like most real services."""
+
+
+class FaultConfig(BaseModel):
+    """Configuration for faults injected into a single operation."""
+
+    bandwidth: float | None = Field(default=None, gt=0)
+    """Maximum number of bytes per second of transferred content, unlimited if not set."""
+
+    deviation: float = Field(default=0, ge=0)
+    """Standard deviation of added latency in seconds, for uniform and lognormal."""
+
+    distribution: LatencyDistribution = LatencyDistribution.CONSTANT
+    """Distribution of added latency."""
+
+    errors: float = Field(default=0, ge=0, le=1)
+    """Probability of failing with a server error."""
+
+    first_byte: float = Field(default=0, ge=0)
+    """Number of seconds before the first byte of content arrives."""
+
+    latency: float = Field(default=0, ge=0)
+    """Mean number of seconds added before the operation starts."""
+
+    timeout: float = Field(default=0, ge=0)
+    """Number of seconds the operation hangs before it times out."""
+
+    timeouts: float = Field(default=0, ge=0, le=1)
+    """Probability of timing out."""
+
+
+class FaultsConfig(BaseModel):
+    """Configuration for injecting faults into operations with a dependency."""
+
+    default: FaultConfig = FaultConfig()
+    """Faults injected into operations without their own configuration."""
+
+    enabled: bool = False
+    """Whether to inject faults."""
+
+    operations: Mapping[str, FaultConfig] = {}
+    """Faults injected into specific operations by name."""
+
+    seed: int | None = None
+    """Seed of the random faults, to reproduce them across runs."""
+
+
+class AmberBackendType(StrEnum):
+    """Backends for storing media of the amber database."""
+
+    S3 = "s3"
+    """Store media in the amber database through its S3 API."""
+
+    MEMORY = "memory"
+    """Store media in memory of the process, for benchmarks and offline runs."""
+
+
+class AmberMemoryConfig(BaseModel):
+    """Configuration for the in-memory stand-in for the amber database."""
+
+    bandwidth: float | None = Field(default=None, gt=0)
+    """Maximum number of bytes per second for each transfer, unlimited if not set."""
+
+    latency: float = Field(default=0, ge=0)
+    """Number of seconds each operation takes before it starts."""
+
+
 class AmberS3Config(BaseModel):
     """Configuration for the S3 API of the amber database."""
 
@@ -40,9 +155,66 @@ class AmberS3Config(BaseModel):
 class AmberConfig(BaseModel):
     """Configuration for the amber database."""
 
+    backend: AmberBackendType = AmberBackendType.S3
+    """Backend for storing media."""
+
+    faults: FaultsConfig = FaultsConfig()
+    """Configuration for injecting faults."""
+
+    memory: AmberMemoryConfig = AmberMemoryConfig()
+    """Configuration for the in-memory backend."""
+
     s3: AmberS3Config = AmberS3Config()
     """Configuration for the S3 API of the amber database."""
 
+    workers: int = Field(default=16, ge=1)
+    """Number of threads and connections for blocking work with the amber database."""
+
+
+class BandwidthConfig(BaseModel):
+    """Configuration for limiting the bandwidth of prerecording transfers."""
+
+    client: float | None = Field(default=None, gt=0)
+    """Maximum number of bytes per second for a single client."""
+
+    clients: Mapping[str, float] = {}
+    """Maximum numbers of bytes per second for specific clients."""
+
+    identity: str | None = None
+    """Header identifying clients, if not given clients are identified by address."""
+
+    total: float | None = Field(default=None, gt=0)
+    """Maximum number of bytes per second for all clients together."""
+
+
+class BeaverBackendType(StrEnum):
+    """Backends for reaching the beaver service."""
+
+    HTTP = "http"
+    """Send requests to the beaver service over HTTP."""
+
+    FAKE = "fake"
+    """Answer requests in the process from a generated schedule."""
+
+
+class BeaverFakeConfig(BaseModel):
+    """Configuration for the in-process stand-in for the beaver service."""
+
+    duration: float = Field(default=3600, gt=0)
+    """Number of seconds each instance lasts."""
+
+    events: int = Field(default=10, ge=0)
+    """Number of recurring events in the schedule."""
+
+    latency: float = Field(default=0, ge=0)
+    """Number of seconds each request takes."""
+
+    period: float = Field(default=86400, gt=0)
+    """Number of seconds between instances of the same event."""
+
+    timezone: str = "UTC"
+    """Timezone of the events."""
+
 
 class BeaverHTTPConfig(BaseModel):
     """Configuration for the HTTP API of the beaver service."""
@@ -75,34 +247,217 @@ class BeaverHTTPConfig(BaseModel):
 class BeaverConfig(BaseModel):
     """Configuration for the beaver service."""
 
+    backend: BeaverBackendType = BeaverBackendType.HTTP
+    """Backend for reaching the beaver service."""
+
+    concurrency: int = Field(default=32, ge=1)
+    """Maximum number of concurrent requests to the beaver service."""
+
+    fake: BeaverFakeConfig = BeaverFakeConfig()
+    """Configuration for the fake backend."""
+
+    faults: FaultsConfig = FaultsConfig()
+    """Configuration for injecting faults."""
+
     http: BeaverHTTPConfig = BeaverHTTPConfig()
     """Configuration for the HTTP API of the beaver service."""
 
 
+class ChannelsBackendType(StrEnum):
+    """Backends for passing events between subscribers and publishers."""
+
+    MEMORY = "memory"
+    """Pass events within a single process."""
+
+    SOCKET = "socket"
+    """Pass events between processes through a broker on a Unix domain socket."""
+
+
+class ChannelsConfig(BaseModel):
+    """Configuration for channels that events are passed through."""
+
+    backend: ChannelsBackendType = ChannelsBackendType.MEMORY
+    """Backend for passing events."""
+
+    socket: Path = Path(tempfile.gettempdir()) / "numbat-channels.sock"
+    """Path of the socket of the broker for the socket backend."""
+
+
+class SlowSubscriberPolicy(StrEnum):
+    """What to do with subscribers that fall behind."""
+
+    DROP = "drop"
+    """Drop the oldest events queued for the subscriber."""
+
+    DISCONNECT = "disconnect"
+    """Disconnect the subscriber and tell it to resync."""
+
+
+class EventsConfig(BaseModel):
+    """Configuration for app events."""
+
+    channels: ChannelsConfig = ChannelsConfig()
+    """Configuration for channels that events are passed through."""
+
+    heartbeat: float = Field(default=15, gt=0)
+    """Interval in seconds between heartbeats sent to idle subscribers."""
+
+    history: int = Field(default=1000, ge=0)
+    """Number of recent events to keep for replaying to reconnecting clients."""
+
+    policy: SlowSubscriberPolicy = SlowSubscriberPolicy.DISCONNECT
+    """What to do with subscribers whose queue is full."""
+
+    queue: int = Field(default=100, ge=1)
+    """Maximum number of events queued for a single subscriber."""
+
+
+class MonitorConfig(BaseModel):
+    """Configuration for monitoring the event loop and thread pools."""
+
+    enabled: bool = True
+    """Whether to monitor the event loop and thread pools."""
+
+    interval: float = Field(default=1, gt=0)
+    """Number of seconds between samples."""
+
+    threshold: float = Field(default=0.25, gt=0)
+    """Number of seconds of event loop lag above which the loop stack is logged."""
+
+
+class PriorityConfig(BaseModel):
+    """Configuration for prioritizing work for content that is about to air."""
+
+    lead: float = Field(default=3600, ge=0)
+    """Seconds before the start of an instance when its work becomes urgent."""
+
+    reserved: float = Field(default=0.25, ge=0, lt=1)
+    """Share of the capacity and bandwidth that bulk work can't use."""
+
+
+class ScheduleConfig(BaseModel):
+    """Configuration for the local schedule mirror."""
+
+    enabled: bool = True
+    """Whether to mirror the schedule locally."""
+
+    interval: float = Field(default=60, gt=0)
+    """Interval in seconds between refreshes of the mirror."""
+
+    window: int = Field(default=7, ge=1)
+    """Number of days ahead to mirror."""
+
+    snapshot: Path = Path(tempfile.gettempdir()) / "numbat-schedule.json"
+    """Path of the snapshot of the mirror shared between worker processes."""
+
+
+class ServerLoop(StrEnum):
+    """Event loop implementations for the server."""
+
+    AUTO = "auto"
+    ASYNCIO = "asyncio"
+    UVLOOP = "uvloop"
+
+
+class ServerHTTP(StrEnum):
+    """HTTP protocol implementations for the server."""
+
+    AUTO = "auto"
+    H11 = "h11"
+    HTTPTOOLS = "httptools"
+
+
 class ServerConfig(BaseModel):
     """Configuration for the server."""
 
+    backlog: int = Field(default=2048, ge=1)
+    """Maximum number of connections waiting to be accepted."""
+
+    concurrency: int | None = Field(default=None, ge=1)
+    """Maximum number of concurrent connections before rejecting new requests."""
+
     host: str = "0.0.0.0"
     """Host to run the server on."""
 
+    http: ServerHTTP = ServerHTTP.AUTO
+    """HTTP protocol implementation."""
+
+    keepalive: int = Field(default=5, ge=1)
+    """Seconds to keep idle connections open."""
+
+    loop: ServerLoop = ServerLoop.AUTO
+    """Event loop implementation."""
+
     port: int = Field(default=10600, ge=0, le=65535)
     """Port to run the server on."""
 
     trusted: str | Sequence[str] | None = "*"
     """Trusted IP addresses."""
 
+    workers: int = Field(default=1, ge=1)
+    """Number of worker processes."""
+
+
+class TimingConfig(BaseModel):
+    """Configuration for timing the handling of requests."""
+
+    enabled: bool = False
+    """Whether to add the `Server-Timing` header to prerecordings responses."""
+
+
+class TracingExporterType(StrEnum):
+    """Types of exporters for tracing spans."""
+
+    NONE = "none"
+    MEMORY = "memory"
+    FILE = "file"
+
+
+class TracingConfig(BaseModel):
+    """Configuration for tracing."""
+
+    exporter: TracingExporterType = TracingExporterType.NONE
+    """Exporter for tracing spans, tracing is disabled without one."""
+
+    file: Path = Path(tempfile.gettempdir()) / "numbat-traces.jsonl"
+    """Path of the file to export tracing spans to with the file exporter."""
+
 
 class Config(BaseConfig):
     """Configuration for the service."""
 
+    admin: AdminConfig = AdminConfig()
+    """Configuration for admin endpoints."""
+
     amber: AmberConfig = AmberConfig()
     """Configuration for the amber database."""
 
+    bandwidth: BandwidthConfig = BandwidthConfig()
+    """Configuration for limiting bandwidth."""
+
     beaver: BeaverConfig = BeaverConfig()
     """Configuration for the beaver service."""
 
     debug: bool = True
     """Enable debug mode."""
 
+    events: EventsConfig = EventsConfig()
+    """Configuration for app events."""
+
+    monitor: MonitorConfig = MonitorConfig()
+    """Configuration for monitoring the event loop and thread pools."""
+
+    priority: PriorityConfig = PriorityConfig()
+    """Configuration for prioritizing work."""
+
+    schedule: ScheduleConfig = ScheduleConfig()
+    """Configuration for the local schedule mirror."""
+
     server: ServerConfig = ServerConfig()
     """Configuration for the server."""
+
+    timing: TimingConfig = TimingConfig()
+    """Configuration for timing requests."""
+
+    tracing: TracingConfig = TracingConfig()
+    """Configuration for tracing."""
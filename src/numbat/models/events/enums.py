@@ -4,4 +4,6 @@ from enum import StrEnum
 class EventType(StrEnum):
     """Event types."""
 
+    PRERECORDING_DELETED = "prerecording.deleted"
+    PRERECORDING_UPLOADED = "prerecording.uploaded"
     TEST = "test"
@@ -0,0 +1,61 @@
+from typing import Literal
+from uuid import UUID
+
+from pydantic import Field
+
+from numbat.models.base import SerializableModel
+from numbat.models.events.enums import EventType
+from numbat.models.events.fields import CreatedAtField, DataField, TypeField
+from numbat.utils.time import NaiveDatetime, awareutcnow
+
+
+class PrerecordingUploadedEventData(SerializableModel):
+    """Data of a prerecording uploaded event."""
+
+    event: UUID
+    """Identifier of the event."""
+
+    start: NaiveDatetime
+    """Start datetime of the event instance in event timezone."""
+
+    size: int
+    """Size of the prerecording in bytes."""
+
+    tag: str
+    """ETag of the prerecording."""
+
+
+class PrerecordingUploadedEvent(SerializableModel):
+    """Event that is emitted when a prerecording is uploaded."""
+
+    type: TypeField[Literal[EventType.PRERECORDING_UPLOADED]] = (
+        EventType.PRERECORDING_UPLOADED
+    )
+    created_at: CreatedAtField = Field(default_factory=awareutcnow)
+    data: DataField[PrerecordingUploadedEventData]
+
+
+class PrerecordingDeletedEventData(SerializableModel):
+    """Data of a prerecording deleted event."""
+
+    event: UUID
+    """Identifier of the event."""
+
+    start: NaiveDatetime
+    """Start datetime of the event instance in event timezone."""
+
+    size: int
+    """Size of the deleted prerecording in bytes."""
+
+    tag: str
+    """ETag of the deleted prerecording."""
+
+
+class PrerecordingDeletedEvent(SerializableModel):
+    """Event that is emitted when a prerecording is deleted."""
+
+    type: TypeField[Literal[EventType.PRERECORDING_DELETED]] = (
+        EventType.PRERECORDING_DELETED
+    )
+    created_at: CreatedAtField = Field(default_factory=awareutcnow)
+    data: DataField[PrerecordingDeletedEventData]
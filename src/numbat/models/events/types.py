@@ -2,9 +2,11 @@ from typing import Annotated
 
 from pydantic import Field
 
-from numbat.models.events import test
+from numbat.models.events import prerecordings, test
 
 type Event = Annotated[
-    test.TestEvent,
+    prerecordings.PrerecordingDeletedEvent
+    | prerecordings.PrerecordingUploadedEvent
+    | test.TestEvent,
     Field(discriminator="type"),
 ]
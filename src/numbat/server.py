@@ -9,22 +9,41 @@ from numbat.config.models import ServerConfig
 class Server:
     """Server for the application.
 
+    With more than one worker, each worker process builds its own app
+    with the factory instead of using the given app.
+
     Args:
         app: The application.
         config: The configuration for the server.
+        factory: Import string of the factory that builds the application.
 
     """
 
-    def __init__(self, app: Litestar, config: ServerConfig) -> None:
+    def __init__(
+        self,
+        app: Litestar,
+        config: ServerConfig,
+        factory: str = "numbat.api.app:build",
+    ) -> None:
         self._app = app
         self._config = config
+        self._factory = factory
 
     def run(self) -> None:
         """Run the server."""
+        workers = self._config.workers
+
         uvicorn.run(
-            self._app,
+            self._app if workers == 1 else self._factory,
+            factory=workers > 1,
             host=self._config.host,
             port=self._config.port,
+            workers=workers,
+            loop=self._config.loop,
+            http=self._config.http,
+            backlog=self._config.backlog,
+            limit_concurrency=self._config.concurrency,
+            timeout_keep_alive=self._config.keepalive,
             forwarded_allow_ips=list(self._config.trusted)
             if isinstance(self._config.trusted, Sequence)
             else self._config.trusted,
@@ -0,0 +1,203 @@
+import asyncio
+import re
+from collections.abc import Iterator, Sequence
+from datetime import datetime, timedelta
+from http import HTTPStatus
+from typing import override
+from uuid import NAMESPACE_URL, UUID, uuid5
+from zoneinfo import ZoneInfo
+
+from httpx import AsyncBaseTransport, Request, Response
+from pydantic import TypeAdapter
+
+from numbat.config.models import BeaverFakeConfig
+from numbat.services.apis.beaver import models as m
+from numbat.utils.time import isoparse
+
+
+class FakeSchedule:
+    """Generator of a schedule of recurring prerecorded events.
+
+    Events have deterministic identifiers and their instances
+    are spread evenly over each period, starting from a fixed anchor,
+    so the same configuration always gives the same schedule.
+
+    Args:
+        config: Configuration for the fake schedule.
+
+    """
+
+    ANCHOR = datetime(2024, 1, 1)
+    """Start of the first instance of the first event, in event timezone."""
+
+    def __init__(self, config: BeaverFakeConfig) -> None:
+        self._period = timedelta(seconds=config.period)
+        self._duration = timedelta(seconds=config.duration)
+        self._events = {
+            event.id: (index, event)
+            for index, event in enumerate(
+                m.Event(
+                    id=uuid5(NAMESPACE_URL, f"numbat:fake:event:{index}"),
+                    type=m.EventType.prerecorded,
+                    timezone=ZoneInfo(config.timezone),
+                )
+                for index in range(config.events)
+            )
+        }
+
+    @property
+    def events(self) -> Sequence[m.Event]:
+        """Events in the schedule."""
+        return [event for _, event in self._events.values()]
+
+    def event(self, event: UUID) -> m.Event | None:
+        """Get an event by its identifier."""
+        found = self._events.get(event)
+        return found[1] if found is not None else None
+
+    def _offset(self, event: UUID) -> timedelta:
+        index, _ = self._events[event]
+        return self._period * index / len(self._events)
+
+    def instance(self, event: UUID, start: datetime) -> m.Instance | None:
+        """Get an instance by its event and start datetime in event timezone."""
+        if event not in self._events or start.tzinfo is not None:
+            return None
+
+        if (start - self.ANCHOR - self._offset(event)) % self._period:
+            return None
+
+        return m.Instance(
+            start=start, duration=self._duration, event=self._events[event][1]
+        )
+
+    def instances(
+        self, event: UUID, start: datetime, end: datetime
+    ) -> Iterator[m.Instance]:
+        """Generate instances of an event that overlap with the UTC range."""
+        found = self.event(event)
+        if found is None:
+            return
+
+        after = start.astimezone(found.timezone).replace(tzinfo=None)
+        before = end.astimezone(found.timezone).replace(tzinfo=None)
+
+        first = self.ANCHOR + self._offset(event)
+        current = first + self._period * (
+            (after - self._duration - first) // self._period
+        )
+
+        while current < before:
+            if current + self._duration > after:
+                yield m.Instance(start=current, duration=self._duration, event=found)
+
+            current += self._period
+
+
+class FakeBeaverTransport(AsyncBaseTransport):
+    """Transport that answers requests to the beaver API from a fake schedule.
+
+    Only the endpoints used by the beaver service are supported.
+    Each request takes the configured latency,
+    so it behaves like a remote service without needing one.
+
+    Args:
+        config: Configuration for the fake beaver service.
+
+    """
+
+    EVENT = re.compile(r".*/events/(?P<id>[^/]+)")
+    INSTANCES = re.compile(r".*/instances")
+    INSTANCE = re.compile(r".*/instances/(?P<event>[^/]+)/(?P<start>[^/]+)")
+
+    DATETIME = TypeAdapter(datetime)
+    WHERE = TypeAdapter(m.InstanceWhereInput)
+    INCLUDE = TypeAdapter(m.InstanceInclude)
+
+    def __init__(self, config: BeaverFakeConfig) -> None:
+        self._config = config
+        self._schedule = FakeSchedule(config)
+
+    @property
+    def schedule(self) -> FakeSchedule:
+        """Schedule that requests are answered from."""
+        return self._schedule
+
+    def _include(self, instance: m.Instance, include: m.InstanceInclude) -> m.Instance:
+        if include.get("event", False):
+            return instance
+
+        return instance.model_copy(update={"event": None})
+
+    def _matches(self, event: UUID, where: m.InstanceWhereInput) -> bool:
+        relation = where.get("event", {})
+
+        if "is" in relation and relation["is"].get("id", event) != event:
+            return False
+
+        return "is_not" not in relation or relation["is_not"].get("id") != event
+
+    def _get_event(self, event: str) -> Response:
+        found = self._schedule.event(UUID(event))
+
+        if found is None:
+            return Response(HTTPStatus.NOT_FOUND)
+
+        return Response(HTTPStatus.OK, content=found.model_dump_json())
+
+    def _list_instances(self, request: Request) -> Response:
+        params = request.url.params
+        start = self.DATETIME.validate_json(params["start"])
+        end = self.DATETIME.validate_json(params["end"])
+        where = self.WHERE.validate_json(params.get("where", "{}"))
+        include = self.INCLUDE.validate_json(params.get("include", "{}"))
+
+        instances = sorted(
+            (
+                self._include(instance, include)
+                for event in self._schedule.events
+                if self._matches(event.id, where)
+                for instance in self._schedule.instances(event.id, start, end)
+            ),
+            key=lambda instance: instance.start,
+        )
+
+        results = m.InstanceList(instances=instances)
+        return Response(HTTPStatus.OK, content=results.model_dump_json())
+
+    def _get_instance(self, request: Request, event: str, start: str) -> Response:
+        include = self.INCLUDE.validate_json(request.url.params.get("include", "{}"))
+        found = self._schedule.instance(UUID(event), isoparse(start))
+
+        if found is None:
+            return Response(HTTPStatus.NOT_FOUND)
+
+        instance = self._include(found, include)
+        return Response(HTTPStatus.OK, content=instance.model_dump_json())
+
+    def _route(self, request: Request) -> Response:
+        path = request.url.path
+
+        if request.method != "GET":
+            return Response(HTTPStatus.METHOD_NOT_ALLOWED)
+
+        if match := self.EVENT.fullmatch(path):
+            return self._get_event(match["id"])
+
+        if match := self.INSTANCE.fullmatch(path):
+            return self._get_instance(request, match["event"], match["start"])
+
+        if self.INSTANCES.fullmatch(path):
+            return self._list_instances(request)
+
+        return Response(HTTPStatus.NOT_FOUND)
+
+    @override
+    async def handle_async_request(self, request: Request) -> Response:
+        if self._config.latency > 0:
+            await asyncio.sleep(self._config.latency)
+
+        try:
+            return self._route(request)
+        except (KeyError, ValueError):
+            return Response(HTTPStatus.BAD_REQUEST)
@@ -0,0 +1,103 @@
+import asyncio
+import re
+from collections.abc import AsyncIterator
+from http import HTTPStatus
+from typing import cast, override
+
+from httpx import AsyncBaseTransport, AsyncByteStream, ReadTimeout, Request, Response
+
+from numbat.utils.faults import Fault, FaultInjector, FaultOutcome
+
+
+class FaultyStream(AsyncByteStream):
+    """Response content that arrives with a slow first byte and limited bandwidth.
+
+    Args:
+        stream: Content to pass through.
+        fault: Faults to inject into the content.
+
+    """
+
+    def __init__(self, stream: AsyncByteStream, fault: Fault) -> None:
+        self._stream = stream
+        self._fault = fault
+
+    @override
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        await asyncio.sleep(self._fault.first_byte)
+
+        async for chunk in self._stream:
+            await asyncio.sleep(self._fault.transfer(len(chunk)))
+            yield chunk
+
+    @override
+    async def aclose(self) -> None:
+        await self._stream.aclose()
+
+
+class FaultyBeaverTransport(AsyncBaseTransport):
+    """Transport that injects faults into requests to the beaver API.
+
+    Each request first waits for the drawn latency.
+    Then it either gets a server error response,
+    hangs and times out,
+    or is passed to the other transport.
+    Content of responses arrives with the configured delay
+    of the first byte and no faster than the configured bandwidth.
+
+    Operations are named `event`, `instance` and `instances`,
+    after the endpoints used by the beaver service.
+    Requests to other endpoints are named by their path.
+
+    Args:
+        transport: Transport to pass requests to.
+        injector: Injector to draw faults from.
+
+    """
+
+    OPERATIONS = (
+        ("event", re.compile(r".*/events/[^/]+")),
+        ("instance", re.compile(r".*/instances/[^/]+/[^/]+")),
+        ("instances", re.compile(r".*/instances")),
+    )
+
+    def __init__(self, transport: AsyncBaseTransport, injector: FaultInjector) -> None:
+        self._transport = transport
+        self._injector = injector
+
+    def _operation(self, request: Request) -> str:
+        path = request.url.path
+
+        for operation, pattern in self.OPERATIONS:
+            if pattern.fullmatch(path):
+                return operation
+
+        return path
+
+    @override
+    async def handle_async_request(self, request: Request) -> Response:
+        fault = self._injector.draw(self._operation(request))
+        await asyncio.sleep(fault.latency)
+
+        match fault.outcome:
+            case FaultOutcome.ERROR:
+                return Response(HTTPStatus.SERVICE_UNAVAILABLE, request=request)
+            case FaultOutcome.TIMEOUT:
+                await asyncio.sleep(fault.timeout)
+                msg = "Injected timeout."
+                raise ReadTimeout(msg, request=request)
+            case FaultOutcome.SUCCESS:
+                pass
+
+        response = await self._transport.handle_async_request(request)
+
+        return Response(
+            response.status_code,
+            headers=response.headers,
+            stream=FaultyStream(cast("AsyncByteStream", response.stream), fault),
+            extensions=response.extensions,
+        )
+
+    @override
+    async def aclose(self) -> None:
+        await self._transport.aclose()
@@ -1,42 +1,110 @@
-from collections.abc import Mapping
+from collections.abc import Callable, Mapping
 from http import HTTPMethod, HTTPStatus
 from typing import Any
 
-from httpx import AsyncClient, HTTPError, HTTPStatusError, Response
-
-from numbat.config.models import BeaverConfig, BeaverHTTPConfig
+from httpx import (
+    AsyncBaseTransport,
+    AsyncClient,
+    AsyncHTTPTransport,
+    HTTPError,
+    HTTPStatusError,
+    Response,
+)
+
+from numbat.config.models import (
+    BeaverBackendType,
+    BeaverConfig,
+    BeaverHTTPConfig,
+    PriorityConfig,
+)
 from numbat.models.base import Jsonable, Serializable
 from numbat.services.apis.beaver import errors as e
 from numbat.services.apis.beaver import models as m
+from numbat.services.apis.beaver.fake import FakeBeaverTransport
+from numbat.services.apis.beaver.faults import FaultyBeaverTransport
+from numbat.utils.faults import FaultInjector
+from numbat.utils.metrics import Histogram, Registry
+from numbat.utils.priority import PriorityLimiter
+from numbat.utils.timing import timed
+from numbat.utils.tracing import SpanKind, Tracer
 
 
 class BeaverClient:
-    """Client for beaver API."""
+    """Client for beaver API.
+
+    Args:
+        config: Configuration for the HTTP API of the beaver service.
+        limiter: Limiter of concurrent requests.
+        durations: Histogram to observe the durations of requests with.
+        tracer: Tracer to record spans with.
+        transports: Factory of transports that each client sends requests with,
+            over the network if not given.
+
+    """
 
-    def __init__(self, config: BeaverHTTPConfig) -> None:
+    def __init__(
+        self,
+        config: BeaverHTTPConfig,
+        limiter: PriorityLimiter,
+        durations: Histogram,
+        tracer: Tracer,
+        transports: Callable[[], AsyncBaseTransport] | None = None,
+    ) -> None:
         self.config = config
+        self.limiter = limiter
+        self.durations = durations
+        self.tracer = tracer
+        self.transports = transports
 
-    async def request(
+    async def request(  # noqa: PLR0913
         self,
         method: HTTPMethod,
         path: str,
         *,
+        route: str | None = None,
         data: Any | None = None,
         params: Mapping[str, str] | None = None,
         headers: Mapping[str, str] | None = None,
     ) -> Response:
-        """Make a request and return the response."""
-        try:
-            async with AsyncClient(base_url=self.config.url) as client:
-                return await client.request(
-                    method,
-                    path,
-                    json=data,
-                    params=params,
-                    headers=headers,
-                )
-        except HTTPError as ex:
-            raise e.ServiceError from ex
+        """Make a request and return the response.
+
+        Durations of requests are observed by the route, which defaults to the path.
+        The trace is propagated to beaver in the `traceparent` header.
+        """
+        route = route or path
+        durations = self.durations.labels(method=method, route=route)
+
+        with self.tracer.span(
+            f"beaver {method} {route}",
+            kind=SpanKind.CLIENT,
+            attributes={"http.request.method": method, "http.route": route},
+        ) as span:
+            if span is not None:
+                headers = {**(headers or {}), "traceparent": span.context.traceparent}
+
+            try:
+                async with (
+                    self.limiter.slot(),
+                    AsyncClient(
+                        base_url=self.config.url,
+                        transport=self.transports() if self.transports else None,
+                    ) as client,
+                ):
+                    with durations.time(), timed("beaver"):
+                        response = await client.request(
+                            method,
+                            path,
+                            json=data,
+                            params=params,
+                            headers=headers,
+                        )
+            except HTTPError as ex:
+                raise e.ServiceError from ex
+
+            if span is not None:
+                span.set("http.response.status_code", response.status_code)
+
+            return response
 
 
 class BeaverEventsService:
@@ -54,7 +122,9 @@ class BeaverEventsService:
     async def get(self, request: m.EventsGetRequest) -> m.EventsGetResponse:
         """Get event."""
         event_id = self._dump(Serializable[m.EventsGetRequestId](request.id))
-        response = await self.client.request(HTTPMethod.GET, f"/events/{event_id}")
+        response = await self.client.request(
+            HTTPMethod.GET, f"/events/{event_id}", route="/events/{id}"
+        )
 
         try:
             response.raise_for_status()
@@ -124,7 +194,10 @@ class BeaverInstancesService:
             params["include"] = include
 
         response = await self.client.request(
-            HTTPMethod.GET, f"/instances/{event_id}/{start}", params=params
+            HTTPMethod.GET,
+            f"/instances/{event_id}/{start}",
+            route="/instances/{event}/{start}",
+            params=params,
         )
 
         try:
@@ -139,10 +212,77 @@ class BeaverInstancesService:
 
 
 class BeaverService:
-    """Service for beaver API."""
+    """Service for beaver API.
+
+    Requests wait for their turn in the order of their priority.
+    They can also be answered in the process from a fake schedule,
+    to run without the beaver service.
+    Faults can be injected into requests, to reproduce a slow or failing service.
+
+    Args:
+        config: Configuration for the beaver service.
+        priority: Configuration for prioritizing work.
+        metrics: Registry of metrics.
+        tracer: Tracer to record spans with.
+
+    """
+
+    def __init__(
+        self,
+        config: BeaverConfig,
+        priority: PriorityConfig,
+        metrics: Registry,
+        tracer: Tracer,
+    ) -> None:
+        limiter = PriorityLimiter(
+            capacity=config.concurrency,
+            reserved=priority.reserved,
+            wait=metrics.histogram(
+                "numbat_beaver_scheduler_wait_seconds",
+                "Time requests to beaver waited for their turn.",
+                ["priority"],
+            ),
+        )
+
+        metrics.gauge(
+            "numbat_beaver_scheduler_waiting",
+            "Number of requests to beaver waiting for their turn.",
+        ).set_function(lambda: limiter.waiting)
+
+        durations = metrics.histogram(
+            "numbat_beaver_request_duration_seconds",
+            "Duration of requests to beaver.",
+            ["method", "route"],
+        )
+
+        self.client = BeaverClient(
+            config.http, limiter, durations, tracer, self._build_transports(config)
+        )
 
-    def __init__(self, config: BeaverConfig) -> None:
-        self.client = BeaverClient(config.http)
+    def _build_transports(
+        self, config: BeaverConfig
+    ) -> Callable[[], AsyncBaseTransport] | None:
+        transports = self._build_backend(config)
+
+        if config.faults.enabled:
+            injector = FaultInjector(config.faults)
+            inner = transports or AsyncHTTPTransport
+
+            # Faults are drawn from one injector, so that seeded runs are reproducible
+            return lambda: FaultyBeaverTransport(inner(), injector)
+
+        return transports
+
+    def _build_backend(
+        self, config: BeaverConfig
+    ) -> Callable[[], AsyncBaseTransport] | None:
+        match config.backend:
+            case BeaverBackendType.HTTP:
+                return None
+            case BeaverBackendType.FAKE:
+                # The fake schedule is shared, closing the transport does nothing
+                transport = FakeBeaverTransport(config.fake)
+                return lambda: transport
 
     @property
     def events(self) -> BeaverEventsService:
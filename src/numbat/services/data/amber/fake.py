@@ -0,0 +1,257 @@
+import hashlib
+import io
+import threading
+import time
+from collections.abc import Iterator
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, BinaryIO, override
+
+from minio import Minio
+from minio.commonconfig import CopySource
+from minio.datatypes import Object
+from minio.error import S3Error
+from minio.helpers import ObjectWriteResult
+from urllib3 import BaseHTTPResponse, HTTPHeaderDict, HTTPResponse
+
+from numbat.config.models import AmberMemoryConfig
+from numbat.utils.time import awareutcnow, httpstringify
+
+
+@dataclass(frozen=True)
+class StoredObject:
+    """Object kept in memory."""
+
+    data: bytes
+    """Content of the object."""
+
+    type: str
+    """Content type of the object."""
+
+    tag: str
+    """ETag of the object."""
+
+    modified: datetime
+    """Last modification datetime of the object."""
+
+
+class ThrottledBytesIO(io.BytesIO):
+    """In-memory stream that is read no faster than the given bandwidth.
+
+    Args:
+        data: Content of the stream.
+        bandwidth: Maximum number of bytes per second, unlimited if not given.
+
+    """
+
+    def __init__(self, data: bytes, bandwidth: float | None) -> None:
+        super().__init__(data)
+        self._bandwidth = bandwidth
+
+    @override
+    def read(self, size: int | None = -1, /) -> bytes:
+        data = super().read(size)
+
+        if self._bandwidth is not None:
+            time.sleep(len(data) / self._bandwidth)
+
+        return data
+
+
+class MemoryMinio(Minio):
+    """Stand-in for the MinIO client that keeps objects in memory.
+
+    Only the operations used by the amber service are supported.
+    Each operation blocks for the configured latency
+    and transfers are limited to the configured bandwidth,
+    so it behaves like a remote store without needing one.
+
+    Args:
+        config: Configuration for the in-memory store.
+
+    """
+
+    def __init__(self, config: AmberMemoryConfig) -> None:
+        super().__init__(endpoint="localhost")
+        self._config = config
+        self._lock = threading.Lock()
+        self._buckets: dict[str, dict[str, StoredObject]] = {}
+
+    def _wait(self) -> None:
+        if self._config.latency > 0:
+            time.sleep(self._config.latency)
+
+    def _transfer(self, size: int) -> None:
+        if self._config.bandwidth is not None:
+            time.sleep(size / self._config.bandwidth)
+
+    def _bucket(self, bucket_name: str) -> dict[str, StoredObject]:
+        return self._buckets.setdefault(bucket_name, {})
+
+    def _find(self, bucket_name: str, object_name: str) -> StoredObject:
+        with self._lock:
+            obj = self._bucket(bucket_name).get(object_name)
+
+        if obj is None:
+            raise S3Error(
+                response=HTTPResponse(status=404),
+                code="NoSuchKey",
+                message="The specified key does not exist.",
+                resource=f"/{bucket_name}/{object_name}",
+                request_id=None,
+                host_id=None,
+                bucket_name=bucket_name,
+                object_name=object_name,
+            )
+
+        return obj
+
+    def _store(self, bucket_name: str, object_name: str, obj: StoredObject) -> None:
+        with self._lock:
+            self._bucket(bucket_name)[object_name] = obj
+
+    def _result(
+        self, bucket_name: str, object_name: str, obj: StoredObject
+    ) -> ObjectWriteResult:
+        return ObjectWriteResult(
+            bucket_name=bucket_name,
+            object_name=object_name,
+            version_id=None,
+            etag=obj.tag,
+            http_headers=HTTPHeaderDict(),
+            last_modified=obj.modified,
+        )
+
+    @override
+    def list_objects(
+        self,
+        bucket_name: str,
+        prefix: str | None = None,
+        recursive: bool = False,
+        *args: Any,
+        **kwargs: Any,
+    ) -> Iterator[Object]:
+        prefix = prefix or ""
+
+        self._wait()
+
+        with self._lock:
+            names = sorted(
+                name for name in self._bucket(bucket_name) if name.startswith(prefix)
+            )
+
+        seen = set()
+
+        for name in names:
+            listed = name
+
+            if not recursive and "/" in name[len(prefix) :]:
+                listed = name[: name.index("/", len(prefix)) + 1]
+
+                if listed in seen:
+                    continue
+
+                seen.add(listed)
+
+            yield Object(bucket_name=bucket_name, object_name=listed)
+
+    @override
+    def stat_object(
+        self, bucket_name: str, object_name: str, *args: Any, **kwargs: Any
+    ) -> Object:
+        self._wait()
+        obj = self._find(bucket_name, object_name)
+
+        return Object(
+            bucket_name=bucket_name,
+            object_name=object_name,
+            last_modified=obj.modified,
+            etag=obj.tag,
+            size=len(obj.data),
+            content_type=obj.type,
+        )
+
+    @override
+    def get_object(
+        self, bucket_name: str, object_name: str, *args: Any, **kwargs: Any
+    ) -> BaseHTTPResponse:
+        self._wait()
+        obj = self._find(bucket_name, object_name)
+
+        return HTTPResponse(
+            body=ThrottledBytesIO(obj.data, self._config.bandwidth),
+            headers={
+                "Content-Type": obj.type,
+                "Content-Length": str(len(obj.data)),
+                "ETag": obj.tag,
+                "Last-Modified": httpstringify(obj.modified),
+            },
+            status=200,
+            preload_content=False,
+        )
+
+    @override
+    def put_object(
+        self,
+        bucket_name: str,
+        object_name: str,
+        data: BinaryIO,
+        length: int,
+        content_type: str = "application/octet-stream",
+        *args: Any,
+        part_size: int = 0,
+        **kwargs: Any,
+    ) -> ObjectWriteResult:
+        self._wait()
+
+        size = part_size or 5 * 1024 * 1024
+        parts = []
+
+        while part := data.read(size if length < 0 else length):
+            self._transfer(len(part))
+            parts.append(part)
+
+            if length >= 0:
+                break
+
+        content = b"".join(parts)
+        obj = StoredObject(
+            data=content,
+            type=content_type,
+            tag=hashlib.md5(content, usedforsecurity=False).hexdigest(),
+            modified=awareutcnow(),
+        )
+
+        self._store(bucket_name, object_name, obj)
+        return self._result(bucket_name, object_name, obj)
+
+    @override
+    def copy_object(
+        self,
+        bucket_name: str,
+        object_name: str,
+        source: CopySource,
+        *args: Any,
+        **kwargs: Any,
+    ) -> ObjectWriteResult:
+        self._wait()
+        original = self._find(source.bucket_name, source.object_name)
+        obj = StoredObject(
+            data=original.data,
+            type=original.type,
+            tag=original.tag,
+            modified=awareutcnow(),
+        )
+
+        self._store(bucket_name, object_name, obj)
+        return self._result(bucket_name, object_name, obj)
+
+    @override
+    def remove_object(
+        self, bucket_name: str, object_name: str, *args: Any, **kwargs: Any
+    ) -> None:
+        self._wait()
+
+        # Like in S3, removing a missing object is not an error
+        with self._lock:
+            self._bucket(bucket_name).pop(object_name, None)
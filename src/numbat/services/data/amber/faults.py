@@ -0,0 +1,190 @@
+import io
+import time
+from collections.abc import Callable, Iterator
+from typing import Any, BinaryIO, cast, override
+
+from minio import Minio
+from minio.commonconfig import CopySource
+from minio.datatypes import Object
+from minio.error import S3Error
+from minio.helpers import ObjectWriteResult
+from urllib3 import BaseHTTPResponse, HTTPResponse
+from urllib3.exceptions import TimeoutError as UrllibTimeoutError
+
+from numbat.config.models import FaultsConfig
+from numbat.utils.faults import Fault, FaultInjector, FaultOutcome
+
+
+class FaultyReader(io.RawIOBase):
+    """Stream that reads from another one with a slow first byte and bandwidth.
+
+    Args:
+        stream: Stream to read from.
+        fault: Faults to inject into reading.
+        close: Function to call when the stream is closed.
+
+    """
+
+    def __init__(
+        self,
+        stream: BinaryIO | BaseHTTPResponse,
+        fault: Fault,
+        close: Callable[[], None] | None = None,
+    ) -> None:
+        super().__init__()
+        self._stream = stream
+        self._fault = fault
+        self._close = close
+        self._started = False
+
+    @override
+    def readable(self) -> bool:
+        return True
+
+    @override
+    def read(self, size: int | None = -1, /) -> bytes:
+        if not self._started:
+            self._started = True
+            time.sleep(self._fault.first_byte)
+
+        data = self._stream.read(-1 if size is None else size)
+        time.sleep(self._fault.transfer(len(data)))
+        return data
+
+    @override
+    def close(self) -> None:
+        if not self.closed and self._close is not None:
+            self._close()
+
+        super().close()
+
+
+class FaultyMinio(Minio):
+    """MinIO client that injects faults into operations of another client.
+
+    Each operation first waits for the drawn latency.
+    Then it either fails with a server error,
+    hangs and times out like the underlying connection would,
+    or is passed to the other client.
+    Content of uploads and downloads arrives with the configured delay
+    of the first byte and no faster than the configured bandwidth.
+
+    Operations are named `copy`, `delete`, `get`, `list`, `put` and `stat`.
+
+    Args:
+        client: Client to pass operations to.
+        config: Configuration for injecting faults.
+
+    """
+
+    def __init__(self, client: Minio, config: FaultsConfig) -> None:
+        super().__init__(endpoint="localhost")
+        self._client = client
+        self._injector = FaultInjector(config)
+
+    def _inject(self, operation: str, bucket_name: str, object_name: str) -> Fault:
+        fault = self._injector.draw(operation)
+        time.sleep(fault.latency)
+
+        match fault.outcome:
+            case FaultOutcome.ERROR:
+                raise S3Error(
+                    response=HTTPResponse(status=503),
+                    code="ServiceUnavailable",
+                    message="Injected fault.",
+                    resource=f"/{bucket_name}/{object_name}",
+                    request_id=None,
+                    host_id=None,
+                    bucket_name=bucket_name,
+                    object_name=object_name,
+                )
+            case FaultOutcome.TIMEOUT:
+                time.sleep(fault.timeout)
+                msg = f"Injected timeout of /{bucket_name}/{object_name}."
+                raise UrllibTimeoutError(msg)
+            case FaultOutcome.SUCCESS:
+                return fault
+
+    def _delay(self, objects: Iterator[Object], fault: Fault) -> Iterator[Object]:
+        time.sleep(fault.first_byte)
+        yield from objects
+
+    @override
+    def list_objects(
+        self,
+        bucket_name: str,
+        prefix: str | None = None,
+        recursive: bool = False,
+        *args: Any,
+        **kwargs: Any,
+    ) -> Iterator[Object]:
+        fault = self._inject("list", bucket_name, prefix or "")
+        objects = self._client.list_objects(
+            bucket_name, prefix, recursive, *args, **kwargs
+        )
+        return self._delay(objects, fault)
+
+    @override
+    def stat_object(
+        self, bucket_name: str, object_name: str, *args: Any, **kwargs: Any
+    ) -> Object:
+        self._inject("stat", bucket_name, object_name)
+        return self._client.stat_object(bucket_name, object_name, *args, **kwargs)
+
+    @override
+    def get_object(
+        self, bucket_name: str, object_name: str, *args: Any, **kwargs: Any
+    ) -> BaseHTTPResponse:
+        fault = self._inject("get", bucket_name, object_name)
+        response = self._client.get_object(bucket_name, object_name, *args, **kwargs)
+
+        def release() -> None:
+            response.close()
+            response.release_conn()
+
+        return HTTPResponse(
+            body=FaultyReader(response, fault, release),
+            headers=response.headers,
+            status=response.status,
+            preload_content=False,
+            # Content is already decoded by the original response
+            decode_content=False,
+        )
+
+    @override
+    def put_object(
+        self,
+        bucket_name: str,
+        object_name: str,
+        data: BinaryIO,
+        length: int,
+        *args: Any,
+        **kwargs: Any,
+    ) -> ObjectWriteResult:
+        fault = self._inject("put", bucket_name, object_name)
+        reader = cast("BinaryIO", FaultyReader(data, fault))
+
+        return self._client.put_object(
+            bucket_name, object_name, reader, length, *args, **kwargs
+        )
+
+    @override
+    def copy_object(
+        self,
+        bucket_name: str,
+        object_name: str,
+        source: CopySource,
+        *args: Any,
+        **kwargs: Any,
+    ) -> ObjectWriteResult:
+        self._inject("copy", bucket_name, object_name)
+        return self._client.copy_object(
+            bucket_name, object_name, source, *args, **kwargs
+        )
+
+    @override
+    def remove_object(
+        self, bucket_name: str, object_name: str, *args: Any, **kwargs: Any
+    ) -> None:
+        self._inject("delete", bucket_name, object_name)
+        self._client.remove_object(bucket_name, object_name, *args, **kwargs)
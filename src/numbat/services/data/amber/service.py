@@ -1,7 +1,9 @@
 import asyncio
+import functools
+import time
 from collections.abc import Callable, Generator, Iterator
 from contextlib import AbstractContextManager, contextmanager
-from datetime import datetime
+from datetime import datetime, timedelta
 from enum import StrEnum
 from typing import Any, BinaryIO, Never, cast, override
 
@@ -9,14 +11,23 @@ from minio import Minio
 from minio.commonconfig import CopySource
 from minio.datatypes import Object
 from minio.error import MinioException, S3Error
-from urllib3 import BaseHTTPResponse
+from urllib3 import BaseHTTPResponse, PoolManager, Retry, Timeout
+from urllib3.exceptions import HTTPError as UrllibHTTPError
 
-from numbat.config.models import AmberConfig
+from numbat.config.models import AmberBackendType, AmberConfig, PriorityConfig
 from numbat.services.data.amber import errors as e
 from numbat.services.data.amber import models as m
+from numbat.services.data.amber.fake import MemoryMinio
+from numbat.services.data.amber.faults import FaultyMinio
 from numbat.utils import asyncify, syncify
+from numbat.utils.executor import InstrumentedThreadPoolExecutor
+from numbat.utils.memory import Subsystem, memory_gauge
+from numbat.utils.metrics import GaugeChild, Registry
+from numbat.utils.priority import PriorityLimiter
 from numbat.utils.read import ReadableIterator
 from numbat.utils.time import httpparse
+from numbat.utils.timing import timed
+from numbat.utils.tracing import Tracer
 
 
 class ErrorCodes(StrEnum):
@@ -25,24 +36,163 @@ class ErrorCodes(StrEnum):
     NOT_FOUND = "NoSuchKey"
 
 
+class Operation(StrEnum):
+    """Blocking operations with the amber database."""
+
+    COPY = "copy"
+    DELETE = "delete"
+    GET = "get"
+    LIST = "list"
+    PUT = "put"
+    READ = "read"
+    STAT = "stat"
+
+
 class AmberService:
-    """Service for amber database."""
-
-    def __init__(self, config: AmberConfig) -> None:
-        self._client = Minio(
-            endpoint=config.s3.endpoint,
-            access_key=config.s3.user,
-            secret_key=config.s3.password,
-            secure=config.s3.secure,
-            cert_check=False,
-        )
+    """Service for amber database.
+
+    All blocking work runs in a dedicated thread pool,
+    with as many threads as there are connections in the pool of the client.
+    Work waits for a free thread in the order of its priority.
+    Memory held by uploads and downloads is accounted in gauges.
+    Media can also be kept in memory instead, to run without the database.
+    Faults can be injected into operations, to reproduce a slow or failing database.
+
+    Args:
+        config: Configuration for the amber database.
+        priority: Configuration for prioritizing work.
+        metrics: Registry of metrics.
+        tracer: Tracer to record spans with.
+
+    """
+
+    PARALLEL_UPLOADS = 3
+    """Number of parts of a single upload sent at once."""
+
+    def __init__(
+        self,
+        config: AmberConfig,
+        priority: PriorityConfig,
+        metrics: Registry,
+        tracer: Tracer,
+    ) -> None:
+        self._client = self._build_client(config)
         self._bucket = config.s3.bucket
+        self._uploads = memory_gauge(metrics, Subsystem.UPLOAD)
+        self._downloads = memory_gauge(metrics, Subsystem.DOWNLOAD)
+        self._tracer = tracer
+        self._executor = InstrumentedThreadPoolExecutor(
+            workers=config.workers,
+            name="amber",
+            wait=metrics.histogram(
+                "numbat_amber_executor_wait_seconds",
+                "Time blocking amber operations waited for a free thread.",
+            ).labels(),
+        )
+
+        self._limiter = PriorityLimiter(
+            capacity=config.workers,
+            reserved=priority.reserved,
+            wait=metrics.histogram(
+                "numbat_amber_scheduler_wait_seconds",
+                "Time blocking amber operations waited for their turn.",
+                ["priority"],
+            ),
+        )
+
+        durations = metrics.histogram(
+            "numbat_amber_operation_duration_seconds",
+            "Duration of blocking amber operations.",
+            ["operation"],
+        )
+        self._durations = {
+            operation: durations.labels(operation=operation) for operation in Operation
+        }
+
+        metrics.gauge(
+            "numbat_amber_scheduler_waiting",
+            "Number of blocking amber operations waiting for their turn.",
+        ).set_function(lambda: self._limiter.waiting)
+        metrics.gauge(
+            "numbat_amber_executor_pending",
+            "Number of blocking amber operations waiting for a free thread.",
+        ).set_function(lambda: self._executor.pending)
+
+    def _build_client(self, config: AmberConfig) -> Minio:
+        client = self._build_backend(config)
+
+        if config.faults.enabled:
+            return FaultyMinio(client, config.faults)
+
+        return client
+
+    def _build_backend(self, config: AmberConfig) -> Minio:
+        match config.backend:
+            case AmberBackendType.S3:
+                timeout = timedelta(minutes=5).total_seconds()
+
+                return Minio(
+                    endpoint=config.s3.endpoint,
+                    access_key=config.s3.user,
+                    secret_key=config.s3.password,
+                    secure=config.s3.secure,
+                    cert_check=False,
+                    http_client=PoolManager(
+                        timeout=Timeout(connect=timeout, read=timeout),
+                        maxsize=config.workers,
+                        cert_reqs="CERT_NONE",
+                        retries=Retry(
+                            total=5,
+                            backoff_factor=0.2,
+                            status_forcelist=[500, 502, 503, 504],
+                        ),
+                    ),
+                )
+            case AmberBackendType.MEMORY:
+                return MemoryMinio(config.memory)
+
+    async def _run[T](
+        self, operation: Operation | None, function: Callable[..., T], /, **kwargs: Any
+    ) -> T:
+        if operation is None:
+            async with self._limiter.slot():
+                return await asyncio.get_running_loop().run_in_executor(
+                    self._executor, functools.partial(function, **kwargs)
+                )
+
+        durations = self._durations[operation]
+
+        with timed(f"amber.{operation}"), self._tracer.span(f"amber.{operation}"):
+            queue = self._tracer.start("amber.queue")
+
+            def run() -> T:
+                if queue is not None:
+                    queue.finish()
+
+                with durations.time():
+                    return function(**kwargs)
+
+            async with self._limiter.slot():
+                return await asyncio.get_running_loop().run_in_executor(
+                    self._executor, run
+                )
+
+    @property
+    def executor(self) -> InstrumentedThreadPoolExecutor:
+        """Thread pool for blocking work with the amber database."""
+        return self._executor
+
+    def _runner(self, operation: Operation | None) -> asyncify.Runner:
+        async def run[T](function: Callable[[], T], /) -> T:
+            return await self._run(operation, function)
+
+        return run
 
     @contextmanager
     def _handle_errors(self) -> Generator[None]:
         try:
             yield
-        except MinioException as ex:
+        except (MinioException, UrllibHTTPError) as ex:
             raise e.ServiceError from ex
 
     @contextmanager
@@ -53,28 +203,47 @@ class AmberService:
             if ex.code == ErrorCodes.NOT_FOUND:
                 raise e.NotFoundError(name) from ex
 
+            raise
+
     async def list(self, request: m.ListRequest) -> m.ListResponse:
         """List objects."""
+        durations = self._durations[Operation.LIST]
 
         def iterate(objects: Iterator[Object]) -> Generator[m.ObjectListing]:
-            with self._handle_errors():
-                for obj in objects:
-                    yield m.ObjectListing(name=str(obj.object_name))
+            elapsed = 0.0
+
+            try:
+                with self._handle_errors():
+                    while True:
+                        start = time.perf_counter()
+                        obj = next(objects, None)
+                        elapsed += time.perf_counter() - start
+
+                        if obj is None:
+                            return
+
+                        yield m.ObjectListing(name=str(obj.object_name))
+            finally:
+                durations.observe(elapsed)
 
         with self._handle_errors():
-            objects = await asyncio.to_thread(
+            objects = await self._run(
+                None,
                 self._client.list_objects,
                 bucket_name=self._bucket,
                 prefix=request.prefix,
                 recursive=request.recursive,
             )
 
-        return m.ListResponse(objects=asyncify.Generator(iterate(objects)))
+        return m.ListResponse(
+            objects=asyncify.Generator(iterate(objects), self._runner(None))
+        )
 
     async def get(self, request: m.GetRequest) -> m.GetResponse:
         """Get an object."""
         with self._handle_errors(), self._handle_not_found(request.name):
-            obj = await asyncio.to_thread(
+            obj = await self._run(
+                Operation.STAT,
                 self._client.stat_object,
                 bucket_name=self._bucket,
                 object_name=request.name,
@@ -99,29 +268,43 @@ class AmberService:
                 response: BaseHTTPResponse,
                 chunk: int,
                 context: Callable[[], AbstractContextManager],
+                memory: GaugeChild,
             ) -> None:
                 self.response = response
                 self.iterator = response.stream(chunk)
                 self.context = context
+                self.memory = memory
+                self.held = 0
+
+            def hold(self, size: int) -> None:
+                self.memory.inc(size - self.held)
+                self.held = size
+
+            def release(self) -> None:
+                self.hold(0)
+                self.response.close()
+                self.response.release_conn()
 
             @override
             def send(self, *args: Any, **kwargs: Any) -> bytes:
                 try:
                     with self.context():
-                        return next(self.iterator)
+                        data = next(self.iterator)
                 except:
-                    self.response.close()
-                    self.response.release_conn()
+                    self.release()
                     raise
 
+                self.hold(len(data))
+                return data
+
             @override
             def throw(self, *args: Any, **kwargs: Any) -> Never:
-                self.response.close()
-                self.response.release_conn()
+                self.release()
                 raise StopIteration
 
         with self._handle_errors(), self._handle_not_found(request.name):
-            get_object_response = await asyncio.to_thread(
+            get_object_response = await self._run(
+                Operation.GET,
                 self._client.get_object,
                 bucket_name=self._bucket,
                 object_name=request.name,
@@ -134,32 +317,49 @@ class AmberService:
                 tag=get_object_response.headers["ETag"],
                 modified=httpparse(get_object_response.headers["Last-Modified"]),
                 data=asyncify.Generator(
-                    Stream(get_object_response, request.chunk, self._handle_errors)
+                    Stream(
+                        get_object_response,
+                        request.chunk,
+                        self._handle_errors,
+                        self._downloads,
+                    ),
+                    self._runner(Operation.READ),
                 ),
             )
         )
 
     async def upload(self, request: m.UploadRequest) -> m.UploadResponse:
         """Upload an object."""
-        with self._handle_errors():
-            await asyncio.to_thread(
-                self._client.put_object,
-                bucket_name=self._bucket,
-                object_name=request.name,
-                data=cast(
-                    "BinaryIO", ReadableIterator(syncify.Iterator(request.content.data))
-                ),
-                length=-1,
-                content_type=request.content.type,
-                part_size=request.chunk,
-            )
+        reader = ReadableIterator(
+            syncify.Iterator(request.content.data),
+            memory=self._uploads,
+            # Parts being sent and the one being read
+            retained=self.PARALLEL_UPLOADS + 1,
+        )
+
+        try:
+            with self._handle_errors():
+                await self._run(
+                    Operation.PUT,
+                    self._client.put_object,
+                    bucket_name=self._bucket,
+                    object_name=request.name,
+                    data=cast("BinaryIO", reader),
+                    length=-1,
+                    content_type=request.content.type,
+                    part_size=request.chunk,
+                    num_parallel_uploads=self.PARALLEL_UPLOADS,
+                )
+        finally:
+            reader.close()
 
         return m.UploadResponse()
 
     async def copy(self, request: m.CopyRequest) -> m.CopyResponse:
         """Copy an object."""
         with self._handle_errors(), self._handle_not_found(request.source):
-            await asyncio.to_thread(
+            await self._run(
+                Operation.COPY,
                 self._client.copy_object,
                 bucket_name=self._bucket,
                 object_name=request.destination,
@@ -171,10 +371,15 @@ class AmberService:
     async def delete(self, request: m.DeleteRequest) -> m.DeleteResponse:
         """Delete an object."""
         with self._handle_errors(), self._handle_not_found(request.name):
-            await asyncio.to_thread(
+            await self._run(
+                Operation.DELETE,
                 self._client.remove_object,
                 bucket_name=self._bucket,
                 object_name=request.name,
             )
 
         return m.DeleteResponse()
+
+    def close(self) -> None:
+        """Stop the thread pool once the work submitted so far is done."""
+        self._executor.shutdown(wait=False)
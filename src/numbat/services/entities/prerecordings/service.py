@@ -1,9 +1,14 @@
 import asyncio
-from collections.abc import Generator, Sequence
+import logging
+from collections.abc import Generator, Mapping, Sequence
 from contextlib import contextmanager
 from datetime import UTC, datetime, timedelta
+from enum import StrEnum
 from uuid import UUID
 
+from numbat.config.models import PriorityConfig
+from numbat.models.events import prerecordings as ev
+from numbat.models.events.types import Event
 from numbat.services.apis.beaver import errors as be
 from numbat.services.apis.beaver import models as bm
 from numbat.services.apis.beaver.service import BeaverService
@@ -12,17 +17,92 @@ from numbat.services.data.amber import models as am
 from numbat.services.data.amber.service import AmberService
 from numbat.services.entities.prerecordings import errors as e
 from numbat.services.entities.prerecordings import models as m
-from numbat.services.entities.prerecordings.utils import ContentTypeChecker
-from numbat.utils.mime import MimeType, MimeTypeValidationError
-from numbat.utils.time import isoparse, isostringify
+from numbat.services.entities.prerecordings.utils import (
+    AirtimePrioritizer,
+    ContentTypeChecker,
+    KeyCodec,
+    WindowPlanner,
+)
+from numbat.services.events import models as em
+from numbat.services.events.service import EventsService
+from numbat.services.schedule import models as sm
+from numbat.services.schedule.service import ScheduleService
+from numbat.utils.metrics import Registry
+from numbat.utils.mime import MimeType
+from numbat.utils.priority import Priority, prioritize
+from numbat.utils.timing import timed
+from numbat.utils.tracing import AttributeValue, Tracer, traced
+
+logger = logging.getLogger(__name__)
+
+
+class ListStage(StrEnum):
+    """Stages of listing prerecordings."""
+
+    GET_OBJECTS = "get_objects"
+    FILTER_BY_TIME = "filter_by_time"
+    FILTER_BY_INSTANCE = "filter_by_instance"
+    FILTER_BY_CONTENT_TYPE = "filter_by_content_type"
+
+
+def _make_event_attributes(request: m.ListRequest) -> Mapping[str, AttributeValue]:
+    return {"numbat.event": str(request.event)}
+
+
+def _make_prerecording_attributes(
+    request: m.DownloadRequest | m.UploadRequest | m.DeleteRequest,
+) -> Mapping[str, AttributeValue]:
+    return {
+        "numbat.event": str(request.event),
+        "numbat.start": request.start.isoformat(),
+    }
 
 
 class PrerecordingsService:
-    """Service to manage prerecordings."""
+    """Service to manage prerecordings.
 
-    def __init__(self, amber: AmberService, beaver: BeaverService) -> None:
+    Work for prerecordings that are about to air goes before other work
+    with the amber database and the beaver service.
+    Events are emitted on a best-effort basis after changes are done,
+    so failing to emit them doesn't fail requests that already succeeded.
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        amber: AmberService,
+        beaver: BeaverService,
+        schedule: ScheduleService,
+        events: EventsService,
+        priority: PriorityConfig,
+        metrics: Registry,
+        tracer: Tracer,
+    ) -> None:
         self._amber = amber
         self._beaver = beaver
+        self._schedule = schedule
+        self._events = events
+        self._codec = KeyCodec()
+        self._checker = ContentTypeChecker()
+        self._prioritizer = AirtimePrioritizer(timedelta(seconds=priority.lead))
+        self._planner = WindowPlanner(gap=timedelta(days=1), span=timedelta(days=31))
+        self._tracer = tracer
+
+        stages = metrics.histogram(
+            "numbat_prerecordings_list_stage_duration_seconds",
+            "Duration of the stages of listing prerecordings.",
+            ["stage"],
+        )
+        self._stages = {stage: stages.labels(stage=stage) for stage in ListStage}
+
+    @property
+    def tracer(self) -> Tracer:
+        """Tracer to record spans with."""
+        return self._tracer
+
+    @contextmanager
+    def _time_stage(self, stage: ListStage) -> Generator[None]:
+        with self._stages[stage].time(), timed(f"list.{stage}"):
+            yield
 
     @contextmanager
     def _handle_errors(self) -> Generator[None]:
@@ -39,6 +119,12 @@ class PrerecordingsService:
             raise e.PrerecordingNotFoundError(event, start) from ex
 
     async def _get_event(self, event: UUID) -> bm.Event | None:
+        get_event_request = sm.GetEventRequest(id=event)
+        get_event_response = await self._schedule.get_event(get_event_request)
+
+        if get_event_response.event is not None:
+            return get_event_response.event
+
         events_get_request = bm.EventsGetRequest(id=event)
 
         with self._handle_errors():
@@ -70,6 +156,12 @@ class PrerecordingsService:
         return instances_list_response.results.instances
 
     async def _get_instance(self, event: UUID, start: datetime) -> bm.Instance | None:
+        get_instance_request = sm.GetInstanceRequest(event=event, start=start)
+        get_instance_response = await self._schedule.get_instance(get_instance_request)
+
+        if get_instance_response.instance is not None:
+            return get_instance_response.instance
+
         instances_get_request = bm.InstancesGetRequest(
             event_id=event, start=start, include={"event": True}
         )
@@ -84,6 +176,11 @@ class PrerecordingsService:
 
         return instances_get_response.instance
 
+    def _prioritize(self, instance: bm.Instance) -> None:
+        priority = self._prioritizer.prioritize(instance)
+        prioritize(priority)
+        self._tracer.annotate("numbat.priority", priority.name.lower())
+
     async def _get_object(self, name: str) -> am.ObjectDetails | None:
         get_request = am.GetRequest(name=name)
 
@@ -95,47 +192,47 @@ class PrerecordingsService:
 
         return get_response.object
 
-    def _make_prefix(self, event: UUID) -> str:
-        return f"{event}/"
+    async def _emit_event(self, event: Event) -> None:
+        publish_request = em.PublishRequest(event=event)
 
-    def _make_name(self, start: datetime) -> str:
-        return isostringify(start)
+        try:
+            await self._events.publish(publish_request)
+        except Exception:
+            logger.exception("Failed to publish %s event.", event.type)
+
+    async def _emit_prerecording_uploaded_event(
+        self, event: UUID, start: datetime, details: am.ObjectDetails
+    ) -> None:
+        await self._emit_event(
+            ev.PrerecordingUploadedEvent(
+                data=ev.PrerecordingUploadedEventData(
+                    event=event, start=start, size=details.size, tag=details.tag
+                )
+            )
+        )
 
-    def _make_key(self, event: UUID, start: datetime) -> str:
-        prefix = self._make_prefix(event)
-        name = self._make_name(start)
-        return f"{prefix}{name}"
+    async def _emit_prerecording_deleted_event(
+        self, event: UUID, start: datetime, details: am.ObjectDetails
+    ) -> None:
+        await self._emit_event(
+            ev.PrerecordingDeletedEvent(
+                data=ev.PrerecordingDeletedEventData(
+                    event=event, start=start, size=details.size, tag=details.tag
+                )
+            )
+        )
 
-    def _parse_prefix(self, prefix: str) -> UUID | None:
-        try:
-            return UUID(prefix[:-1])
-        except ValueError:
-            return None
+    def _make_prefix(self, event: UUID) -> str:
+        return self._codec.encode_prefix(event)
 
-    def _parse_name(self, name: str) -> datetime | None:
-        try:
-            return isoparse(name)
-        except ValueError:
-            return None
+    def _make_key(self, event: UUID, start: datetime) -> str:
+        return self._codec.encode(event, start)
 
     def _parse_key(self, key: str) -> tuple[UUID, datetime] | None:
-        split = key.find("/")
-        prefix, name = key[: split + 1], key[split + 1 :]
-        event = self._parse_prefix(prefix)
-        start = self._parse_name(name)
-
-        return (event, start) if event and start else None
+        return self._codec.decode(key)
 
     def _parse_content_type(self, value: str | None) -> MimeType | None:
-        if value is None:
-            return None
-
-        try:
-            parsed = MimeType.parse(value)
-        except MimeTypeValidationError:
-            return None
-
-        return parsed if ContentTypeChecker().check(parsed) else None
+        return self._checker.parse(value)
 
     async def _list_get_objects(self, prefix: str) -> Sequence[am.ObjectListing]:
         list_request = am.ListRequest(prefix=prefix, recursive=False)
@@ -170,15 +267,21 @@ class PrerecordingsService:
     async def _list_filter_prerecordings_by_instance(
         self, prerecordings: Sequence[m.Prerecording], event: bm.Event
     ) -> Sequence[m.Prerecording]:
-        after = min(prerecording.start for prerecording in prerecordings)
-        after = after.replace(hour=0, minute=0, second=0, microsecond=0)
+        semaphore = asyncio.Semaphore(10)
+
+        async def get(after: datetime, before: datetime) -> Sequence[bm.Instance]:
+            async with semaphore:
+                return await self._get_event_instances(event, after, before)
 
-        before = max(prerecording.start for prerecording in prerecordings)
-        before = before.replace(hour=0, minute=0, second=0, microsecond=0)
-        before = before + timedelta(days=1)
+        windows = self._planner.plan(
+            prerecording.start for prerecording in prerecordings
+        )
+
+        results = await asyncio.gather(
+            *[get(after, before) for after, before in windows]
+        )
 
-        instances = await self._get_event_instances(event, after, before)
-        starts = {instance.start for instance in instances}
+        starts = {instance.start for instances in results for instance in instances}
 
         return [
             prerecording
@@ -214,21 +317,24 @@ class PrerecordingsService:
         after: datetime | None,
         before: datetime | None,
     ) -> Sequence[m.Prerecording]:
-        prerecordings = self._list_filter_prerecordings_by_time(
-            prerecordings, after, before
-        )
+        with self._time_stage(ListStage.FILTER_BY_TIME):
+            prerecordings = self._list_filter_prerecordings_by_time(
+                prerecordings, after, before
+            )
 
         if not prerecordings:
             return []
 
-        prerecordings = await self._list_filter_prerecordings_by_instance(
-            prerecordings, event
-        )
+        with self._time_stage(ListStage.FILTER_BY_INSTANCE):
+            prerecordings = await self._list_filter_prerecordings_by_instance(
+                prerecordings, event
+            )
 
         if not prerecordings:
             return []
 
-        return await self._list_filter_prerecordings_by_content_type(prerecordings)
+        with self._time_stage(ListStage.FILTER_BY_CONTENT_TYPE):
+            return await self._list_filter_prerecordings_by_content_type(prerecordings)
 
     def _list_sort_prerecordings(
         self, prerecordings: Sequence[m.Prerecording], order: m.ListOrder | None
@@ -256,8 +362,11 @@ class PrerecordingsService:
 
         return prerecordings
 
+    @traced("prerecordings.list", _make_event_attributes)
     async def list(self, request: m.ListRequest) -> m.ListResponse:
         """List prerecordings."""
+        prioritize(Priority.BULK)
+
         event = await self._get_event(request.event)
 
         if not event:
@@ -268,7 +377,9 @@ class PrerecordingsService:
 
         prefix = self._make_prefix(event.id)
 
-        objects = await self._list_get_objects(prefix)
+        with self._time_stage(ListStage.GET_OBJECTS):
+            objects = await self._list_get_objects(prefix)
+
         prerecordings = self._list_map_objects(objects)
         prerecordings = await self._list_filter_prerecordings(
             prerecordings, event, request.after, request.before
@@ -288,6 +399,7 @@ class PrerecordingsService:
             prerecordings=prerecordings,
         )
 
+    @traced("prerecordings.download", _make_prerecording_attributes)
     async def download(self, request: m.DownloadRequest) -> m.DownloadResponse:
         """Download a prerecording."""
         instance = await self._get_instance(request.event, request.start)
@@ -301,6 +413,8 @@ class PrerecordingsService:
         if instance.event.type != bm.EventType.prerecorded:
             raise e.BadEventTypeError(instance.event.type)
 
+        self._prioritize(instance)
+
         key = self._make_key(instance.event.id, instance.start)
 
         download_request = am.DownloadRequest(name=key)
@@ -330,6 +444,7 @@ class PrerecordingsService:
             await download_response.content.data.aclose()
             raise
 
+    @traced("prerecordings.upload", _make_prerecording_attributes)
     async def upload(self, request: m.UploadRequest) -> m.UploadResponse:
         """Upload a prerecording."""
         instance = await self._get_instance(request.event, request.start)
@@ -343,7 +458,9 @@ class PrerecordingsService:
         if instance.event.type != bm.EventType.prerecorded:
             raise e.BadEventTypeError(instance.event.type)
 
-        if not ContentTypeChecker().check(request.content.type):
+        self._prioritize(instance)
+
+        if not self._checker.check(request.content.type):
             raise e.UnsupportedContentTypeError(request.content.type)
 
         key = self._make_key(instance.event.id, instance.start)
@@ -358,8 +475,20 @@ class PrerecordingsService:
         with self._handle_errors():
             await self._amber.upload(upload_request)
 
+        try:
+            details = await self._get_object(key)
+        except e.ServiceError:
+            logger.exception("Failed to get details of uploaded prerecording.")
+            details = None
+
+        if details is not None:
+            await self._emit_prerecording_uploaded_event(
+                instance.event.id, instance.start, details
+            )
+
         return m.UploadResponse()
 
+    @traced("prerecordings.delete", _make_prerecording_attributes)
     async def delete(self, request: m.DeleteRequest) -> m.DeleteResponse:
         """Delete a prerecording."""
         instance = await self._get_instance(request.event, request.start)
@@ -373,6 +502,8 @@ class PrerecordingsService:
         if instance.event.type != bm.EventType.prerecorded:
             raise e.BadEventTypeError(instance.event.type)
 
+        self._prioritize(instance)
+
         key = self._make_key(instance.event.id, instance.start)
 
         get_request = am.GetRequest(name=key)
@@ -394,4 +525,9 @@ class PrerecordingsService:
         ):
             await self._amber.delete(delete_request)
 
+        # Only reached when the amber database confirmed the delete
+        await self._emit_prerecording_deleted_event(
+            instance.event.id, instance.start, get_response.object
+        )
+
         return m.DeleteResponse()
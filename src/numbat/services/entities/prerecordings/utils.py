@@ -1,4 +1,12 @@
-from numbat.utils.mime import MimeType
+from collections.abc import Iterable, Sequence
+from datetime import datetime, timedelta
+from functools import lru_cache
+from uuid import UUID
+
+from numbat.services.apis.beaver import models as bm
+from numbat.utils.mime import MimeType, MimeTypeValidationError
+from numbat.utils.priority import Priority
+from numbat.utils.time import awareutcnow, isoparse, isostringify
 
 
 class ContentTypeChecker:
@@ -9,3 +17,147 @@ class ContentTypeChecker:
     def check(self, content_type: MimeType) -> bool:
         """Check if the given content type is supported."""
         return content_type.fulltype in self.SUPPORTED
+
+    def parse(self, value: str | None) -> MimeType | None:
+        """Parse a content type and return it only if it is supported."""
+        if value is None:
+            return None
+
+        return self._parse(value)
+
+    @staticmethod
+    @lru_cache(maxsize=256)
+    def _parse(value: str) -> MimeType | None:
+        try:
+            parsed = MimeType.parse(value)
+        except MimeTypeValidationError:
+            return None
+
+        return parsed if parsed.fulltype in ContentTypeChecker.SUPPORTED else None
+
+
+class KeyCodec:
+    """Codec for object keys of prerecordings in the `{event}/{start}` format."""
+
+    SEPARATOR = "/"
+
+    def encode_prefix(self, event: UUID) -> str:
+        """Encode the key prefix shared by all prerecordings of an event."""
+        return f"{event}{self.SEPARATOR}"
+
+    def encode_name(self, start: datetime) -> str:
+        """Encode the part of the key identifying the instance."""
+        if start.tzinfo is None:
+            return start.isoformat()
+
+        return isostringify(start)
+
+    def encode(self, event: UUID, start: datetime) -> str:
+        """Encode a key."""
+        return f"{self.encode_prefix(event)}{self.encode_name(start)}"
+
+    @staticmethod
+    @lru_cache(maxsize=1024)
+    def decode_prefix(prefix: str) -> UUID | None:
+        """Decode the key prefix shared by all prerecordings of an event."""
+        try:
+            return UUID(prefix[:-1])
+        except ValueError:
+            return None
+
+    def decode_name(self, name: str) -> datetime | None:
+        """Decode the part of the key identifying the instance."""
+        try:
+            start = datetime.fromisoformat(name)
+        except ValueError:
+            pass
+        else:
+            if start.tzinfo is None and start.isoformat() == name:
+                return start
+
+        try:
+            return isoparse(name)
+        except ValueError:
+            return None
+
+    def decode(self, key: str) -> tuple[UUID, datetime] | None:
+        """Decode a key."""
+        split = key.find(self.SEPARATOR)
+        prefix, name = key[: split + 1], key[split + 1 :]
+        event = self.decode_prefix(prefix)
+        start = self.decode_name(name)
+
+        return (event, start) if event and start else None
+
+
+class AirtimePrioritizer:
+    """Utility class for prioritizing work for instances by how soon they air.
+
+    Work for instances that are on air or about to air is urgent,
+    work for all other instances is bulk work.
+
+    Args:
+        lead: How long before the start of an instance its work becomes urgent.
+
+    """
+
+    def __init__(self, lead: timedelta) -> None:
+        self._lead = lead
+
+    def prioritize(
+        self, instance: bm.Instance, now: datetime | None = None
+    ) -> Priority:
+        """Get the priority of work for an instance."""
+        if instance.event is None:
+            return Priority.NORMAL
+
+        now = now if now is not None else awareutcnow()
+        start = instance.start.replace(tzinfo=instance.event.timezone)
+        end = start + instance.duration
+
+        if start - self._lead <= now < end:
+            return Priority.URGENT
+
+        return Priority.BULK
+
+
+class WindowPlanner:
+    """Utility class for planning time windows that cover given days.
+
+    Days are merged into the same window if there is at most a given gap between them
+    and the window doesn't span more than a given length.
+
+    Args:
+        gap: Maximum gap between days in the same window.
+        span: Maximum length of a window.
+
+    """
+
+    DAY = timedelta(days=1)
+
+    def __init__(self, gap: timedelta, span: timedelta) -> None:
+        self._gap = gap
+        self._span = span
+
+    def plan(self, times: Iterable[datetime]) -> Sequence[tuple[datetime, datetime]]:
+        """Plan windows covering the days of the given times."""
+        days = sorted(
+            {time.replace(hour=0, minute=0, second=0, microsecond=0) for time in times}
+        )
+
+        windows: list[tuple[datetime, datetime]] = []
+
+        for start in days:
+            if windows:
+                after, before = windows[-1]
+
+                if (
+                    start - before <= self._gap
+                    and start + self.DAY - after <= self._span
+                ):
+                    windows[-1] = (after, start + self.DAY)
+                    continue
+
+            windows.append((start, start + self.DAY))
+
+        return windows
@@ -0,0 +1,12 @@
+from collections.abc import Sequence
+
+
+class EventsChannels:
+    """Names of the channels that events are routed through."""
+
+    ALL = "events"
+
+    @classmethod
+    def names(cls) -> Sequence[str]:
+        """Get the names of all channels."""
+        return [cls.ALL]
@@ -0,0 +1,414 @@
+import asyncio
+import time
+from collections import deque
+from collections.abc import AsyncGenerator, Iterable, Sequence
+from collections.abc import Set as AbstractSet
+from contextlib import asynccontextmanager
+from uuid import UUID
+
+from litestar.channels import ChannelsPlugin, Subscriber
+from litestar.response import ServerSentEventMessage
+from pydantic import TypeAdapter, ValidationError
+
+from numbat.config.models import EventsConfig, SlowSubscriberPolicy
+from numbat.models.events import prerecordings as ev
+from numbat.models.events.enums import EventType
+from numbat.models.events.types import Event
+from numbat.services.events import models as m
+from numbat.services.events.channels import EventsChannels
+from numbat.utils.memory import Subsystem, memory_gauge
+from numbat.utils.metrics import Counter, Registry
+from numbat.utils.stamps import Stamper
+
+EVENT_ADAPTER: TypeAdapter[Event] = TypeAdapter(Event)
+
+RESYNC_FRAME = ServerSentEventMessage(data="{}", event="resync").encode()
+
+HEARTBEAT_FRAME = ServerSentEventMessage(data=None, comment="heartbeat").encode()
+
+
+class History:
+    """Bounded buffer of recent messages.
+
+    Args:
+        size: Maximum number of messages to keep.
+
+    """
+
+    def __init__(self, size: int) -> None:
+        self._messages: deque[m.Message] = deque(maxlen=size)
+        self._horizon = time.time_ns()
+        self._size = 0
+
+    @property
+    def size(self) -> int:
+        """Number of bytes of the frames of recorded messages."""
+        return self._size
+
+    def open(self) -> None:
+        """Start recording, forgetting everything recorded before."""
+        self._messages.clear()
+        self._horizon = time.time_ns()
+        self._size = 0
+
+    def append(self, message: m.Message) -> None:
+        """Record a message, evicting the oldest one if needed."""
+        if len(self._messages) == self._messages.maxlen:
+            evicted = self._messages[0] if self._messages else message
+            self._horizon = max(self._horizon, evicted.id)
+            self._size -= len(evicted.frame)
+
+        self._messages.append(message)
+        self._size += len(message.frame)
+
+    def replay(self, after: str) -> Sequence[m.Message] | None:
+        """Get messages after the given identifier or None if they are not known."""
+        try:
+            last = int(after)
+        except ValueError:
+            return None
+
+        if last < self._horizon:
+            return None
+
+        return [message for message in self._messages if message.id > last]
+
+
+class Subscription:
+    """Subscription of a single consumer to the dispatcher.
+
+    Args:
+        types: Types of events to receive.
+        event: Identifier of the event to receive prerecording events about.
+        config: Configuration for events.
+        evictions: Counter of queue overflows.
+
+    """
+
+    def __init__(
+        self,
+        types: AbstractSet[EventType] | None,
+        event: UUID | None,
+        config: EventsConfig,
+        evictions: Counter,
+    ) -> None:
+        self.types = types
+        self.event = event
+        self.replay: Sequence[m.Message | m.Resync] = []
+        self._config = config
+        self._evictions = evictions
+        self._queue: asyncio.Queue[m.Message | m.Resync] = asyncio.Queue(
+            maxsize=config.queue
+        )
+        self._evicted = False
+        self._size = 0
+
+    @property
+    def depth(self) -> int:
+        """Number of queued messages."""
+        return self._queue.qsize()
+
+    @property
+    def size(self) -> int:
+        """Number of bytes of the frames of queued messages."""
+        return self._size
+
+    def wants(self, event: Event) -> bool:
+        """Check if the subscription receives an event."""
+        if self.types is not None and event.type not in self.types:
+            return False
+
+        if self.event is None:
+            return True
+
+        match event:
+            case ev.PrerecordingUploadedEvent() | ev.PrerecordingDeletedEvent():
+                return event.data.event == self.event
+            case _:
+                return False
+
+    def _put(self, message: m.Message | m.Resync) -> None:
+        self._queue.put_nowait(message)
+        self._size += len(message.frame)
+
+    def _take(self) -> None:
+        self._size -= len(self._queue.get_nowait().frame)
+
+    def offer(self, message: m.Message) -> None:
+        """Queue a wanted message, applying the policy if the queue is full."""
+        if self._evicted or not self.wants(message.event):
+            return
+
+        if not self._queue.full():
+            self._put(message)
+            return
+
+        self._evictions.labels(policy=self._config.policy).inc()
+
+        match self._config.policy:
+            case SlowSubscriberPolicy.DROP:
+                self._take()
+                self._put(message)
+            case SlowSubscriberPolicy.DISCONNECT:
+                self.resync()
+
+    def resync(self) -> None:
+        """Drop queued messages and tell the consumer to resync."""
+        if self._evicted:
+            return
+
+        self._evicted = True
+
+        while not self._queue.empty():
+            self._take()
+
+        self._put(m.Resync(frame=RESYNC_FRAME))
+
+    async def get(self) -> m.Message | m.Resync | m.Heartbeat:
+        """Wait for the next message or get a heartbeat if idle for too long."""
+        try:
+            message = await asyncio.wait_for(self._queue.get(), self._config.heartbeat)
+        except TimeoutError:
+            return m.Heartbeat(frame=HEARTBEAT_FRAME)
+
+        self._size -= len(message.frame)
+        return message
+
+
+class Feed:
+    """Feed of events from a single channel to its subscriptions.
+
+    Subscriptions are indexed by the types of events they want,
+    so each event is only offered to the subscriptions that want its type.
+    If the channel tells that events might have been lost,
+    the history is forgotten and all subscriptions are told to resync.
+
+    Args:
+        channels: Channels plugin to receive events from.
+        channel: Name of the channel.
+        history: History to record all events in.
+
+    """
+
+    def __init__(
+        self, channels: ChannelsPlugin, channel: str, history: History | None = None
+    ) -> None:
+        self._channels = channels
+        self._channel = channel
+        self._history = history
+        self._subscriptions: set[Subscription] = set()
+        self._routes: dict[EventType | None, set[Subscription]] = {}
+        self._lock = asyncio.Lock()
+        self._task: asyncio.Task | None = None
+
+    def _decode(self, data: bytes) -> m.Envelope | None:
+        stamped = Stamper.unstamp(data)
+
+        if stamped is None:
+            return None
+
+        identifier, payload = stamped
+
+        try:
+            event = EVENT_ADAPTER.validate_json(payload)
+        except ValidationError:
+            return None
+
+        return m.Envelope(id=identifier, event=event)
+
+    def _encode(self, envelope: m.Envelope) -> bytes:
+        data = envelope.event.model_dump_json(round_trip=True)
+        return ServerSentEventMessage(data=data, id=envelope.id).encode()
+
+    def _resync(self) -> None:
+        if self._history is not None:
+            self._history.open()
+
+        for subscription in self._subscriptions:
+            subscription.resync()
+
+    def _dispatch(self, data: bytes) -> None:
+        if data == Stamper.GAP:
+            self._resync()
+            return
+
+        if not self._subscriptions and self._history is None:
+            return
+
+        envelope = self._decode(data)
+
+        if envelope is None:
+            return
+
+        message = m.Message(
+            id=envelope.id, event=envelope.event, frame=self._encode(envelope)
+        )
+
+        if self._history is not None:
+            self._history.append(message)
+
+        for key in (None, message.event.type):
+            for subscription in self._routes.get(key, ()):
+                subscription.offer(message)
+
+    async def _run(self, subscriber: Subscriber) -> None:
+        try:
+            async for data in subscriber.iter_events():
+                self._dispatch(data)
+        finally:
+            await self._channels.unsubscribe(subscriber, self._channel)
+
+    @property
+    def pinned(self) -> bool:
+        """Whether the feed keeps running without subscriptions."""
+        return self._history is not None
+
+    @property
+    def subscriptions(self) -> AbstractSet[Subscription]:
+        """Subscriptions of the feed."""
+        return self._subscriptions
+
+    async def start(self) -> None:
+        """Start receiving events from the channel if not started yet."""
+        async with self._lock:
+            if self._task is not None and not self._task.done():
+                return
+
+            subscriber = await self._channels.subscribe(self._channel)
+
+            if self._history is not None:
+                self._history.open()
+
+            self._task = asyncio.create_task(self._run(subscriber))
+
+    def stop(self) -> None:
+        """Stop receiving events from the channel."""
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    def _keys(self, subscription: Subscription) -> Iterable[EventType | None]:
+        return subscription.types if subscription.types is not None else [None]
+
+    def add(self, subscription: Subscription) -> None:
+        """Add a subscription."""
+        self._subscriptions.add(subscription)
+
+        for key in self._keys(subscription):
+            self._routes.setdefault(key, set()).add(subscription)
+
+    def remove(self, subscription: Subscription) -> None:
+        """Remove a subscription and stop the feed if it is no longer needed."""
+        self._subscriptions.discard(subscription)
+
+        for key in self._keys(subscription):
+            routes = self._routes.get(key)
+
+            if routes is not None:
+                routes.discard(subscription)
+
+                if not routes:
+                    del self._routes[key]
+
+        if not self._subscriptions and not self.pinned:
+            self.stop()
+
+
+class EventsDispatcher:
+    """Dispatcher that decodes each event once and fans it out to subscriptions.
+
+    Args:
+        channels: Channels plugin to publish and receive events with.
+        config: Configuration for events.
+        metrics: Registry of metrics.
+
+    """
+
+    def __init__(
+        self, channels: ChannelsPlugin, config: EventsConfig, metrics: Registry
+    ) -> None:
+        self._channels = channels
+        self._config = config
+        self._stamper = Stamper()
+        self._history = History(config.history)
+        self._feed = Feed(channels, EventsChannels.ALL, self._history)
+
+        self._evictions = metrics.counter(
+            "numbat_events_evictions",
+            "Number of times the queue of a slow subscriber overflowed.",
+            ["policy"],
+        )
+        metrics.gauge(
+            "numbat_events_subscriptions",
+            "Number of active event subscriptions.",
+        ).set_function(lambda: len(self._subscriptions()))
+        metrics.gauge(
+            "numbat_events_queued",
+            "Number of events queued for all subscriptions.",
+        ).set_function(
+            lambda: sum(subscription.depth for subscription in self._subscriptions())
+        )
+        memory_gauge(metrics, Subsystem.SSE).set_function(
+            lambda: sum(subscription.size for subscription in self._subscriptions())
+        )
+        memory_gauge(metrics, Subsystem.CACHE).set_function(lambda: self._history.size)
+        metrics.gauge(
+            "numbat_events_queue_depth_max",
+            "Number of events queued for the most lagging subscription.",
+        ).set_function(
+            lambda: max(
+                (subscription.depth for subscription in self._subscriptions()),
+                default=0,
+            )
+        )
+
+    def _subscriptions(self) -> AbstractSet[Subscription]:
+        return self._feed.subscriptions
+
+    async def publish(self, event: Event) -> None:
+        """Publish an event to the events channel."""
+        await self._feed.start()
+
+        data = self._stamper.stamp(EVENT_ADAPTER.dump_json(event, round_trip=True))
+
+        self._channels.publish(data, EventsChannels.ALL)
+
+    @asynccontextmanager
+    async def subscribe(
+        self,
+        types: AbstractSet[EventType] | None,
+        after: str | None = None,
+        event: UUID | None = None,
+    ) -> AsyncGenerator[Subscription]:
+        """Subscribe to events for the duration of the context.
+
+        If the identifier of the last received event is given,
+        the subscription will contain the missed events to replay first
+        or a resync marker if they can't be replayed.
+
+        Subscriptions are fed from the same feed that records the history,
+        so every event is either in the replay or queued afterwards.
+        """
+        subscription = Subscription(types, event, self._config, self._evictions)
+
+        await self._feed.start()
+
+        # No awaiting between these, so no event can slip between replay and queue
+        self._feed.add(subscription)
+
+        try:
+            if after is not None:
+                replay = self._history.replay(after)
+                subscription.replay = (
+                    [message for message in replay if subscription.wants(message.event)]
+                    if replay is not None
+                    else [m.Resync(frame=RESYNC_FRAME)]
+                )
+
+            yield subscription
+        finally:
+            self._feed.remove(subscription)
+
+    def close(self) -> None:
+        """Stop the feed."""
+        self._feed.stop()
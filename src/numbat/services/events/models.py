@@ -1,11 +1,66 @@
 from collections.abc import AsyncIterator
 from collections.abc import Set as AbstractSet
+from uuid import UUID
 
 from numbat.models.base import datamodel
 from numbat.models.events.enums import EventType
 from numbat.models.events.types import Event
 
 
+@datamodel
+class Envelope:
+    """Event together with the identifier it was stamped with in channels."""
+
+    id: int
+    """Identifier of the event."""
+
+    event: Event
+    """Event that occurred."""
+
+
+@datamodel
+class Message:
+    """Event decoded from a channel together with its encoded form."""
+
+    id: int
+    """Identifier of the event."""
+
+    event: Event
+    """Event that occurred."""
+
+    frame: bytes
+    """Server-Sent Event frame with the event."""
+
+
+@datamodel
+class Resync:
+    """Marker that missed events can't be replayed."""
+
+    frame: bytes
+    """Server-Sent Event frame telling the client to fetch the state again."""
+
+
+@datamodel
+class Heartbeat:
+    """Marker that the subscriber is idle."""
+
+    frame: bytes
+    """Server-Sent Event frame with a comment to keep the connection alive."""
+
+
+@datamodel
+class PublishRequest:
+    """Request to publish."""
+
+    event: Event
+    """Event to publish."""
+
+
+@datamodel
+class PublishResponse:
+    """Response for publish."""
+
+
 @datamodel
 class SubscribeRequest:
     """Request to subscribe."""
@@ -13,10 +68,16 @@ class SubscribeRequest:
     types: AbstractSet[EventType] | None = None
     """Types of events to subscribe to."""
 
+    event: UUID | None = None
+    """Identifier of the event to subscribe to events about."""
+
+    last: str | None = None
+    """Identifier of the last event received before."""
+
 
 @datamodel
 class SubscribeResponse:
     """Response for subscribe."""
 
-    events: AsyncIterator[Event]
-    """Stream of events."""
+    messages: AsyncIterator[Message | Resync | Heartbeat]
+    """Stream of event messages."""
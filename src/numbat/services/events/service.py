@@ -1,32 +1,54 @@
 from collections.abc import AsyncGenerator
 from collections.abc import Set as AbstractSet
+from uuid import UUID
 
-from litestar.channels import ChannelsPlugin
-
-from numbat.models.base import Serializable
 from numbat.models.events.enums import EventType
-from numbat.models.events.types import Event
 from numbat.services.events import models as m
+from numbat.services.events.dispatcher import EventsDispatcher
 
 
 class EventsService:
     """Service for events."""
 
-    def __init__(self, channels: ChannelsPlugin) -> None:
-        self._channels = channels
+    def __init__(self, dispatcher: EventsDispatcher) -> None:
+        self._dispatcher = dispatcher
 
     async def _subscribe(
-        self, types: AbstractSet[EventType] | None
-    ) -> AsyncGenerator[Event]:
-        subscription = self._channels.start_subscription("events")
+        self,
+        types: AbstractSet[EventType] | None,
+        event: UUID | None,
+        last: str | None,
+    ) -> AsyncGenerator[m.Message | m.Resync | m.Heartbeat]:
+        async with self._dispatcher.subscribe(types, last, event) as subscription:
+            replayed = set()
+
+            for message in subscription.replay:
+                if isinstance(message, m.Message):
+                    replayed.add(message.id)
+
+                yield message
+
+                if isinstance(message, m.Resync):
+                    return
+
+            while True:
+                message = await subscription.get()
+
+                if isinstance(message, m.Message) and message.id in replayed:
+                    continue
+
+                yield message
 
-        async with subscription as subscriber:
-            async for data in subscriber.iter_events():
-                event = Serializable[Event].model_validate_json(data).root
+                if isinstance(message, m.Resync):
+                    return
 
-                if types is None or event.type in types:
-                    yield event
+    async def publish(self, request: m.PublishRequest) -> m.PublishResponse:
+        """Publish an app event."""
+        await self._dispatcher.publish(request.event)
+        return m.PublishResponse()
 
     async def subscribe(self, request: m.SubscribeRequest) -> m.SubscribeResponse:
         """Subscribe to app events."""
-        return m.SubscribeResponse(events=self._subscribe(request.types))
+        return m.SubscribeResponse(
+            messages=self._subscribe(request.types, request.event, request.last)
+        )
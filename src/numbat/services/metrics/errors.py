@@ -0,0 +1,2 @@
+class ServiceError(Exception):
+    """Base class for service errors."""
@@ -0,0 +1,14 @@
+from numbat.models.base import datamodel
+
+
+@datamodel
+class RenderRequest:
+    """Request to render metrics."""
+
+
+@datamodel
+class RenderResponse:
+    """Response for rendering metrics."""
+
+    content: str
+    """Metrics in the Prometheus text exposition format."""
@@ -0,0 +1,13 @@
+from numbat.services.metrics import models as m
+from numbat.utils.metrics import Registry
+
+
+class MetricsService:
+    """Service for metrics."""
+
+    def __init__(self, registry: Registry) -> None:
+        self._registry = registry
+
+    async def render(self, request: m.RenderRequest) -> m.RenderResponse:
+        """Render metrics."""
+        return m.RenderResponse(content=self._registry.render())
@@ -0,0 +1,41 @@
+class ServiceError(Exception):
+    """Base class for service errors."""
+
+
+class ValidationError(ServiceError):
+    """Raised when a validation error occurs."""
+
+
+class DurationTooLongError(ValidationError):
+    """Raised when the profiling duration is too long."""
+
+    def __init__(self, duration: float, limit: float) -> None:
+        super().__init__(
+            f"Duration of {duration} seconds exceeds the limit of {limit} seconds."
+        )
+
+
+class FramesOutOfRangeError(ValidationError):
+    """Raised when the number of frames to keep is out of range."""
+
+    def __init__(self, frames: int, limit: int) -> None:
+        super().__init__(
+            f"Number of frames is {frames}, but must be between 1 and {limit}."
+        )
+
+
+class SitesOutOfRangeError(ValidationError):
+    """Raised when the number of allocation sites to return is out of range."""
+
+    def __init__(self, sites: int, limit: int) -> None:
+        super().__init__(
+            f"Number of allocation sites is {sites}, but must be between 1 and {limit}."
+        )
+
+
+class BusyError(ServiceError):
+    """Raised when a profile is already being recorded."""
+
+
+class NotRunningError(ServiceError):
+    """Raised when allocations are not being traced."""
@@ -0,0 +1,83 @@
+from enum import StrEnum
+
+from numbat.models.base import datamodel
+from numbat.utils.memory import AllocationSnapshot
+
+
+class ProfileFormat(StrEnum):
+    """Format of recorded profiles."""
+
+    COLLAPSED = "collapsed"
+    """Collapsed stacks, one per line, as used by flame graph tools."""
+
+    SPEEDSCOPE = "speedscope"
+    """JSON file format of the speedscope profile viewer."""
+
+
+@datamodel
+class Profile:
+    """Rendered profile."""
+
+    type: str
+    """Media type of the content."""
+
+    content: str
+    """Content of the profile."""
+
+
+@datamodel
+class ProfileRequest:
+    """Request to record a profile."""
+
+    duration: float
+    """Number of seconds to profile for."""
+
+    format: ProfileFormat
+    """Format of the profile."""
+
+
+@datamodel
+class ProfileResponse:
+    """Response for recording a profile."""
+
+    profile: Profile
+    """Recorded profile."""
+
+
+@datamodel
+class StartAllocationsRequest:
+    """Request to start tracing allocations."""
+
+    frames: int
+    """Number of frames to keep for each allocation."""
+
+
+@datamodel
+class StartAllocationsResponse:
+    """Response for starting to trace allocations."""
+
+
+@datamodel
+class StopAllocationsRequest:
+    """Request to stop tracing allocations."""
+
+
+@datamodel
+class StopAllocationsResponse:
+    """Response for stopping to trace allocations."""
+
+
+@datamodel
+class SnapshotAllocationsRequest:
+    """Request to take a snapshot of traced allocations."""
+
+    limit: int
+    """Maximum number of allocation sites to return."""
+
+
+@datamodel
+class SnapshotAllocationsResponse:
+    """Response for taking a snapshot of traced allocations."""
+
+    snapshot: AllocationSnapshot
+    """Snapshot compared with the previous one."""
@@ -0,0 +1,91 @@
+import asyncio
+import json
+
+from numbat.config.models import ProfilerConfig
+from numbat.services.profiling import errors as e
+from numbat.services.profiling import models as m
+from numbat.utils.memory import AllocationProfiler, AllocationProfilerNotRunningError
+from numbat.utils.profiler import Profile, ProfilerBusyError, SamplingProfiler
+
+
+class ProfilingService:
+    """Service for profiling the app."""
+
+    def __init__(
+        self,
+        profiler: SamplingProfiler,
+        allocations: AllocationProfiler,
+        config: ProfilerConfig,
+    ) -> None:
+        self._profiler = profiler
+        self._allocations = allocations
+        self._config = config
+
+    @property
+    def frames(self) -> int:
+        """Maximum number of frames to keep for each allocation."""
+        return 64
+
+    @property
+    def sites(self) -> int:
+        """Maximum number of allocation sites to return."""
+        return 1000
+
+    def _render(self, profile: Profile, fmt: m.ProfileFormat) -> m.Profile:
+        match fmt:
+            case m.ProfileFormat.COLLAPSED:
+                return m.Profile(
+                    type="text/plain; charset=utf-8", content=profile.collapsed()
+                )
+            case m.ProfileFormat.SPEEDSCOPE:
+                return m.Profile(
+                    type="application/json",
+                    content=json.dumps(profile.speedscope(), separators=(",", ":")),
+                )
+
+    async def profile(self, request: m.ProfileRequest) -> m.ProfileResponse:
+        """Record a profile of all threads."""
+        if request.duration > self._config.limit:
+            raise e.DurationTooLongError(request.duration, self._config.limit)
+
+        try:
+            profile = await asyncio.to_thread(self._profiler.profile, request.duration)
+        except ProfilerBusyError as ex:
+            raise e.BusyError from ex
+
+        return m.ProfileResponse(profile=self._render(profile, request.format))
+
+    async def start_allocations(
+        self, request: m.StartAllocationsRequest
+    ) -> m.StartAllocationsResponse:
+        """Start tracing allocations, forgetting previous snapshots."""
+        if not 1 <= request.frames <= self.frames:
+            raise e.FramesOutOfRangeError(request.frames, self.frames)
+
+        self._allocations.start(request.frames)
+
+        return m.StartAllocationsResponse()
+
+    async def stop_allocations(
+        self, request: m.StopAllocationsRequest
+    ) -> m.StopAllocationsResponse:
+        """Stop tracing allocations."""
+        self._allocations.stop()
+
+        return m.StopAllocationsResponse()
+
+    async def snapshot_allocations(
+        self, request: m.SnapshotAllocationsRequest
+    ) -> m.SnapshotAllocationsResponse:
+        """Take a snapshot of traced allocations and compare it with the previous one."""
+        if not 1 <= request.limit <= self.sites:
+            raise e.SitesOutOfRangeError(request.limit, self.sites)
+
+        try:
+            snapshot = await asyncio.to_thread(
+                self._allocations.snapshot, request.limit
+            )
+        except AllocationProfilerNotRunningError as ex:
+            raise e.NotRunningError from ex
+
+        return m.SnapshotAllocationsResponse(snapshot=snapshot)
@@ -0,0 +1,82 @@
+from collections.abc import Mapping, Sequence
+from datetime import datetime
+from uuid import UUID
+
+from numbat.models.base import datamodel
+from numbat.services.apis.beaver import models as bm
+
+
+@datamodel
+class Mirror:
+    """Snapshot of the mirrored schedule."""
+
+    instances: Mapping[tuple[UUID, datetime], bm.Instance]
+    """Instances indexed by event identifier and start datetime in event timezone."""
+
+    events: Mapping[UUID, bm.Event]
+    """Events indexed by identifier."""
+
+    refreshed: float
+    """Monotonic time of the refresh."""
+
+
+@datamodel
+class Snapshot:
+    """Snapshot of the mirrored schedule shared between processes."""
+
+    instances: Sequence[bm.Instance]
+    """Mirrored instances with their events."""
+
+    refreshed: float
+    """Wall clock time of the refresh."""
+
+
+@datamodel
+class RefreshRequest:
+    """Request to refresh the mirror."""
+
+
+@datamodel
+class RefreshResponse:
+    """Response for refreshing the mirror."""
+
+    instances: int
+    """Number of mirrored instances."""
+
+    events: int
+    """Number of mirrored events."""
+
+
+@datamodel
+class GetInstanceRequest:
+    """Request to get an instance from the mirror."""
+
+    event: UUID
+    """Identifier of the event the instance belongs to."""
+
+    start: datetime
+    """Start datetime of the instance in event timezone."""
+
+
+@datamodel
+class GetInstanceResponse:
+    """Response for getting an instance from the mirror."""
+
+    instance: bm.Instance | None
+    """Mirrored instance, if known."""
+
+
+@datamodel
+class GetEventRequest:
+    """Request to get an event from the mirror."""
+
+    id: UUID
+    """Identifier of the event."""
+
+
+@datamodel
+class GetEventResponse:
+    """Response for getting an event from the mirror."""
+
+    event: bm.Event | None
+    """Mirrored event, if known."""
@@ -0,0 +1,229 @@
+import asyncio
+import fcntl
+import os
+import time
+from collections.abc import Generator, Sequence
+from contextlib import contextmanager, suppress
+from datetime import timedelta
+from typing import TextIO
+
+from pydantic import TypeAdapter, ValidationError
+
+from numbat.config.models import ScheduleConfig
+from numbat.services.apis.beaver import errors as be
+from numbat.services.apis.beaver import models as bm
+from numbat.services.apis.beaver.service import BeaverService
+from numbat.services.schedule import errors as e
+from numbat.services.schedule import models as m
+from numbat.utils.metrics import Registry
+from numbat.utils.time import awareutcnow
+
+SNAPSHOT_ADAPTER = TypeAdapter(m.Snapshot)
+
+
+class ScheduleService:
+    """Service for the local mirror of the schedule.
+
+    When shared, only one process at a time refreshes the mirror from beaver
+    and stores its snapshot, while other processes load the snapshot instead.
+
+    Args:
+        beaver: Service for beaver API.
+        config: Configuration for the mirror.
+        metrics: Registry of metrics.
+        shared: Whether the mirror is shared between worker processes.
+
+    """
+
+    def __init__(
+        self,
+        beaver: BeaverService,
+        config: ScheduleConfig,
+        metrics: Registry,
+        *,
+        shared: bool = False,
+    ) -> None:
+        self._beaver = beaver
+        self._config = config
+        self._shared = shared
+        self._mirror: m.Mirror | None = None
+        self._lock: TextIO | None = None
+        self._loaded: float | None = None
+
+        self._refreshes = metrics.counter(
+            "numbat_schedule_mirror_refreshes",
+            "Number of refreshes of the schedule mirror.",
+            ["result"],
+        )
+        metrics.gauge(
+            "numbat_schedule_mirror_instances",
+            "Number of instances in the schedule mirror.",
+        ).set_function(lambda: len(self._mirror.instances) if self._mirror else 0)
+        metrics.gauge(
+            "numbat_schedule_mirror_events",
+            "Number of events in the schedule mirror.",
+        ).set_function(lambda: len(self._mirror.events) if self._mirror else 0)
+        metrics.gauge(
+            "numbat_schedule_mirror_age_seconds",
+            "Seconds since the last successful refresh of the schedule mirror.",
+        ).set_function(lambda: self.age if self.age is not None else float("nan"))
+
+    @contextmanager
+    def _handle_errors(self) -> Generator[None]:
+        try:
+            yield
+        except be.ServiceError as ex:
+            raise e.ServiceError from ex
+
+    @property
+    def age(self) -> float | None:
+        """Seconds since the last successful refresh."""
+        if self._mirror is None:
+            return None
+
+        return time.monotonic() - self._mirror.refreshed
+
+    @property
+    def fresh(self) -> bool:
+        """Whether the mirror can be used to answer lookups."""
+        age = self.age
+        return age is not None and age <= 2 * self._config.interval
+
+    async def _list_instances(self) -> list[bm.Instance]:
+        now = awareutcnow()
+
+        instances_list_request = bm.InstancesListRequest(
+            start=now - timedelta(days=1),
+            end=now + timedelta(days=self._config.window),
+            where=None,
+            include={"event": True},
+        )
+
+        with self._handle_errors():
+            instances_list_response = await self._beaver.instances.list(
+                instances_list_request
+            )
+
+        return list(instances_list_response.results.instances)
+
+    def _mirror_instances(
+        self, listed: Sequence[bm.Instance], refreshed: float
+    ) -> m.RefreshResponse:
+        instances = {
+            (instance.event.id, instance.start): instance
+            for instance in listed
+            if instance.event is not None
+        }
+        events = {
+            instance.event.id: instance.event
+            for instance in instances.values()
+            if instance.event is not None
+        }
+
+        self._mirror = m.Mirror(
+            instances=instances,
+            events=events,
+            refreshed=time.monotonic() - max(time.time() - refreshed, 0),
+        )
+
+        return m.RefreshResponse(instances=len(instances), events=len(events))
+
+    def _lead(self) -> bool:
+        if self._lock is not None:
+            return True
+
+        lock = self._config.snapshot.with_suffix(".lock").open("a")
+
+        try:
+            fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            lock.close()
+            return False
+
+        self._lock = lock
+        return True
+
+    def _store(self, snapshot: m.Snapshot) -> None:
+        path = self._config.snapshot
+        temporary = path.with_suffix(f".{os.getpid()}.tmp")
+
+        temporary.write_bytes(SNAPSHOT_ADAPTER.dump_json(snapshot))
+        temporary.replace(path)
+
+    def _load(self) -> m.Snapshot | None:
+        path = self._config.snapshot
+
+        try:
+            modified = path.stat().st_mtime
+
+            if modified == self._loaded:
+                return None
+
+            snapshot = SNAPSHOT_ADAPTER.validate_json(path.read_bytes())
+        except (OSError, ValidationError):
+            return None
+
+        self._loaded = modified
+        return snapshot
+
+    async def _sync(self) -> None:
+        if not self._shared or await asyncio.to_thread(self._lead):
+            await self.refresh(m.RefreshRequest())
+            return
+
+        snapshot = await asyncio.to_thread(self._load)
+
+        if snapshot is not None:
+            self._mirror_instances(snapshot.instances, snapshot.refreshed)
+            self._refreshes.labels(result="shared").inc()
+
+    async def refresh(self, request: m.RefreshRequest) -> m.RefreshResponse:
+        """Refresh the mirror."""
+        try:
+            listed = await self._list_instances()
+        except e.ServiceError:
+            self._refreshes.labels(result="failure").inc()
+            raise
+
+        refreshed = time.time()
+        response = self._mirror_instances(listed, refreshed)
+        self._refreshes.labels(result="success").inc()
+
+        if self._shared:
+            snapshot = m.Snapshot(instances=listed, refreshed=refreshed)
+
+            with suppress(OSError):
+                await asyncio.to_thread(self._store, snapshot)
+
+        return response
+
+    async def run(self) -> None:
+        """Keep the mirror refreshed until cancelled."""
+        while True:
+            with suppress(e.ServiceError):
+                await self._sync()
+
+            interval = self._config.interval
+
+            if self._shared and self._lock is None:
+                interval = min(interval, 1)
+
+            await asyncio.sleep(interval)
+
+    async def get_instance(
+        self, request: m.GetInstanceRequest
+    ) -> m.GetInstanceResponse:
+        """Get an instance from the mirror."""
+        if self._mirror is None or not self.fresh:
+            return m.GetInstanceResponse(instance=None)
+
+        instance = self._mirror.instances.get((request.event, request.start))
+        return m.GetInstanceResponse(instance=instance)
+
+    async def get_event(self, request: m.GetEventRequest) -> m.GetEventResponse:
+        """Get an event from the mirror."""
+        if self._mirror is None or not self.fresh:
+            return m.GetEventResponse(event=None)
+
+        event = self._mirror.events.get(request.id)
+        return m.GetEventResponse(event=event)
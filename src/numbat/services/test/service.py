@@ -1,7 +1,7 @@
-from litestar.channels import ChannelsPlugin
-
 from numbat.models.events import test as ev
 from numbat.models.events.types import Event
+from numbat.services.events import models as em
+from numbat.services.events.service import EventsService
 from numbat.services.test import errors as e
 from numbat.services.test import models as m
 
@@ -9,26 +9,26 @@ from numbat.services.test import models as m
 class TestService:
     """Service for tests."""
 
-    def __init__(self, channels: ChannelsPlugin) -> None:
-        self._channels = channels
+    def __init__(self, events: EventsService) -> None:
+        self._events = events
 
     @property
     def limit(self) -> int:
         """Maximum length for the message."""
         return 10
 
-    def _emit_event(self, event: Event) -> None:
-        data = event.model_dump_json(round_trip=True)
-        self._channels.publish(data, "events")
+    async def _emit_event(self, event: Event) -> None:
+        publish_request = em.PublishRequest(event=event)
+        await self._events.publish(publish_request)
 
-    def _emit_test_event(self, message: str) -> None:
-        self._emit_event(ev.TestEvent(data=ev.TestEventData(message=message)))
+    async def _emit_test_event(self, message: str) -> None:
+        await self._emit_event(ev.TestEvent(data=ev.TestEventData(message=message)))
 
     async def test(self, request: m.TestRequest) -> m.TestResponse:
         """Test."""
         if len(request.message) > self.limit:
             raise e.MessageTooLongError(request.message, self.limit)
 
-        self._emit_test_event(request.message)
+        await self._emit_test_event(request.message)
 
         return m.TestResponse(message=request.message)
@@ -1,18 +1,58 @@
 from litestar.datastructures import State as LitestarState
 
+from numbat.api.bandwidth import BandwidthLimiter
+from numbat.api.streams import StreamMeter
 from numbat.config.models import Config
 from numbat.services.apis.beaver.service import BeaverService
 from numbat.services.data.amber.service import AmberService
+from numbat.services.entities.prerecordings.service import PrerecordingsService
+from numbat.services.events.dispatcher import EventsDispatcher
+from numbat.services.schedule.service import ScheduleService
+from numbat.utils.memory import AllocationProfiler
+from numbat.utils.metrics import Registry
+from numbat.utils.monitor import LoopMonitor
+from numbat.utils.profiler import SamplingProfiler
+from numbat.utils.tracing import Tracer
 
 
 class State(LitestarState):
     """Use this class as a type hint for the state of the service."""
 
+    allocations: AllocationProfiler
+    """Profiler of memory allocations for admin endpoints."""
+
     amber: AmberService
     """Service for amber database."""
 
+    bandwidth: BandwidthLimiter
+    """Limiter of the bandwidth of transfers."""
+
     beaver: BeaverService
     """Service for beaver API."""
 
     config: Config
     """Configuration for the service."""
+
+    dispatcher: EventsDispatcher
+    """Dispatcher of app events."""
+
+    metrics: Registry
+    """Registry of metrics."""
+
+    monitor: LoopMonitor
+    """Monitor of the event loop and thread pools."""
+
+    prerecordings: PrerecordingsService
+    """Service to manage prerecordings, shared by all requests."""
+
+    profiler: SamplingProfiler
+    """Sampling profiler for admin endpoints."""
+
+    schedule: ScheduleService
+    """Service for the local schedule mirror."""
+
+    streams: StreamMeter
+    """Meter of streamed transfers."""
+
+    tracer: Tracer
+    """Tracer for recording spans."""
@@ -1,15 +1,42 @@
 import asyncio
 from collections.abc import AsyncGenerator as BaseAsyncGenerator
+from collections.abc import Callable
 from collections.abc import Generator as BaseGenerator
 from types import TracebackType
-from typing import Any, overload, override
+from typing import Any, Protocol, overload, override
+
+
+class Runner(Protocol):
+    """Runs blocking functions without blocking the event loop."""
+
+    async def __call__[T](self, function: Callable[[], T], /) -> T:
+        """Run a function and return its result."""
+        ...
 
 
 class Generator[YieldType, SendType](BaseAsyncGenerator[YieldType, SendType]):
-    """Async generator that wraps a synchronous generator."""
+    """Async generator that wraps a synchronous generator.
+
+    Args:
+        generator: Synchronous generator to wrap.
+        run: Runner to advance the generator with.
+            If not given, the default executor of the event loop is used.
 
-    def __init__(self, generator: BaseGenerator[YieldType, SendType]) -> None:
+    """
+
+    def __init__(
+        self,
+        generator: BaseGenerator[YieldType, SendType],
+        run: Runner | None = None,
+    ) -> None:
         self.generator = generator
+        self.run = run
+
+    async def _run[T](self, function: Callable[[], T]) -> T:
+        if self.run is None:
+            return await asyncio.to_thread(function)
+
+        return await self.run(function)
 
     @override
     async def asend(self, value: SendType, /) -> YieldType:
@@ -22,7 +49,7 @@ class Generator[YieldType, SendType](BaseAsyncGenerator[YieldType, SendType]):
             except StopIteration:
                 return Sentinel()
 
-        item = await asyncio.to_thread(wrap)
+        item = await self._run(wrap)
 
         if isinstance(item, Sentinel):
             raise StopAsyncIteration from None
@@ -52,7 +79,7 @@ class Generator[YieldType, SendType](BaseAsyncGenerator[YieldType, SendType]):
             except (GeneratorExit, StopIteration):
                 return Sentinel()
 
-        item = await asyncio.to_thread(wrap)
+        item = await self._run(wrap)
 
         if isinstance(item, Sentinel):
             raise StopAsyncIteration from None
@@ -0,0 +1,77 @@
+import contextvars
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import override
+
+from numbat.utils.metrics import HistogramChild
+
+
+class InstrumentedThreadPoolExecutor(ThreadPoolExecutor):
+    """Thread pool that measures how long work waits for a free thread.
+
+    It also keeps count of work waiting for a thread and work in progress.
+
+    Work runs in a copy of the context it was submitted from,
+    so context variables are visible to it like with `asyncio.to_thread`.
+
+    Args:
+        workers: Number of threads in the pool.
+        name: Prefix for the names of the threads.
+        wait: Histogram to observe the waiting times in seconds with.
+
+    """
+
+    def __init__(self, workers: int, name: str, wait: HistogramChild) -> None:
+        super().__init__(max_workers=workers, thread_name_prefix=name)
+        self._wait = wait
+        self._workers = workers
+        self._pending = 0
+        self._active = 0
+        self._lock = threading.Lock()
+
+    @property
+    def workers(self) -> int:
+        """Maximum number of threads in the pool."""
+        return self._workers
+
+    @property
+    def pending(self) -> int:
+        """Number of submitted work items that did not start yet."""
+        return self._pending
+
+    @property
+    def active(self) -> int:
+        """Number of work items in progress."""
+        return self._active
+
+    @override
+    def submit[**P, T](
+        self, fn: Callable[P, T], /, *args: P.args, **kwargs: P.kwargs
+    ) -> Future[T]:
+        context = contextvars.copy_context()
+        submitted = time.perf_counter()
+
+        def run() -> T:
+            self._wait.observe(time.perf_counter() - submitted)
+
+            with self._lock:
+                self._pending -= 1
+                self._active += 1
+
+            try:
+                return context.run(fn, *args, **kwargs)
+            finally:
+                with self._lock:
+                    self._active -= 1
+
+        with self._lock:
+            self._pending += 1
+
+        try:
+            return super().submit(run)
+        except:
+            with self._lock:
+                self._pending -= 1
+            raise
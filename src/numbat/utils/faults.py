@@ -0,0 +1,123 @@
+import math
+import random
+import threading
+from dataclasses import dataclass
+from enum import StrEnum
+
+from numbat.config.models import FaultConfig, FaultsConfig, LatencyDistribution
+
+
+class FaultOutcome(StrEnum):
+    """Outcomes of operations with injected faults."""
+
+    SUCCESS = "success"
+    """Operation goes through."""
+
+    ERROR = "error"
+    """Operation fails with a server error."""
+
+    TIMEOUT = "timeout"
+    """Operation hangs and then times out."""
+
+
+@dataclass(frozen=True)
+class Fault:
+    """Faults drawn for a single run of an operation."""
+
+    outcome: FaultOutcome
+    """Outcome of the operation."""
+
+    latency: float
+    """Number of seconds to wait before the operation starts."""
+
+    timeout: float
+    """Number of seconds to hang before timing out."""
+
+    first_byte: float
+    """Number of seconds before the first byte of content arrives."""
+
+    bandwidth: float | None
+    """Maximum number of bytes per second of transferred content."""
+
+    def transfer(self, size: int) -> float:
+        """Compute the number of seconds that transferring the given bytes takes."""
+        if self.bandwidth is None:
+            return 0
+
+        return size / self.bandwidth
+
+
+class FaultInjector:
+    """Draws faults to inject into operations with a dependency.
+
+    Each operation draws from its own random generator,
+    seeded from the configured seed and the name of the operation,
+    so with a seed the faults of each operation are the same across runs,
+    no matter how operations interleave.
+    It is safe to draw faults from multiple threads.
+
+    Args:
+        config: Configuration for injecting faults.
+
+    """
+
+    def __init__(self, config: FaultsConfig) -> None:
+        self._config = config
+        self._lock = threading.Lock()
+        self._generators: dict[str, random.Random] = {}
+
+    def _generator(self, operation: str) -> random.Random:
+        generator = self._generators.get(operation)
+
+        if generator is None:
+            seed = self._config.seed
+            generator = random.Random(  # noqa: S311
+                None if seed is None else f"{seed}:{operation}"
+            )
+            self._generators[operation] = generator
+
+        return generator
+
+    def _latency(self, config: FaultConfig, generator: random.Random) -> float:
+        mean = config.latency
+        deviation = config.deviation
+
+        if mean == 0:
+            return 0
+
+        match config.distribution:
+            case LatencyDistribution.CONSTANT:
+                return mean
+            case LatencyDistribution.UNIFORM:
+                # Uniform distribution with this half-width has the given deviation
+                spread = deviation * math.sqrt(3)
+                return max(0, generator.uniform(mean - spread, mean + spread))
+            case LatencyDistribution.EXPONENTIAL:
+                return generator.expovariate(1 / mean)
+            case LatencyDistribution.LOGNORMAL:
+                sigma = math.sqrt(math.log1p((deviation / mean) ** 2))
+                return generator.lognormvariate(math.log(mean) - sigma**2 / 2, sigma)
+
+    def draw(self, operation: str) -> Fault:
+        """Draw faults for a single run of an operation."""
+        config = self._config.operations.get(operation, self._config.default)
+
+        with self._lock:
+            generator = self._generator(operation)
+            chance = generator.random()
+            latency = self._latency(config, generator)
+
+        if chance < config.errors:
+            outcome = FaultOutcome.ERROR
+        elif chance < config.errors + config.timeouts:
+            outcome = FaultOutcome.TIMEOUT
+        else:
+            outcome = FaultOutcome.SUCCESS
+
+        return Fault(
+            outcome=outcome,
+            latency=latency,
+            timeout=config.timeout,
+            first_byte=config.first_byte,
+            bandwidth=config.bandwidth,
+        )
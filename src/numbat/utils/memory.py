@@ -0,0 +1,164 @@
+import threading
+import tracemalloc
+from collections.abc import Sequence
+from dataclasses import dataclass
+from enum import StrEnum
+
+from numbat.utils.metrics import GaugeChild, Registry
+
+
+class Subsystem(StrEnum):
+    """Subsystems that hold memory on behalf of clients."""
+
+    UPLOAD = "upload"
+    """Buffers of uploads and parts waiting to be sent to the amber database."""
+
+    DOWNLOAD = "download"
+    """Chunks read from the amber database that were not passed on yet."""
+
+    CACHE = "cache"
+    """History of recent events kept to replay them."""
+
+    SSE = "sse"
+    """Events queued for subscribers."""
+
+
+def memory_gauge(metrics: Registry, subsystem: Subsystem) -> GaugeChild:
+    """Get the gauge of the memory held by a subsystem."""
+    return metrics.gauge(
+        "numbat_memory_bytes",
+        "Number of bytes held by each subsystem, as accounted by the service.",
+        ["subsystem"],
+    ).labels(subsystem=subsystem)
+
+
+class AllocationProfilerError(Exception):
+    """Base class for allocation profiler errors."""
+
+
+class AllocationProfilerNotRunningError(AllocationProfilerError):
+    """Raised when allocations are not being traced."""
+
+    def __init__(self) -> None:
+        super().__init__("Allocations are not being traced.")
+
+
+@dataclass(frozen=True)
+class AllocationSite:
+    """Place in code where memory was allocated."""
+
+    file: str
+    """Path of the file."""
+
+    line: int
+    """Line in the file."""
+
+    size: int
+    """Number of bytes allocated and not freed yet."""
+
+    count: int
+    """Number of blocks allocated and not freed yet."""
+
+    size_diff: int | None = None
+    """Change of the size since the previous snapshot."""
+
+    count_diff: int | None = None
+    """Change of the count since the previous snapshot."""
+
+
+@dataclass(frozen=True)
+class AllocationSnapshot:
+    """Snapshot of traced allocations."""
+
+    current: int
+    """Number of bytes allocated and not freed yet."""
+
+    peak: int
+    """Maximum number of bytes allocated at once since tracing started."""
+
+    top: Sequence[AllocationSite]
+    """Sites with most memory allocated."""
+
+    diff: Sequence[AllocationSite] | None
+    """Sites with the largest changes since the previous snapshot, if there was one."""
+
+
+class AllocationProfiler:
+    """Profiler of memory allocations based on `tracemalloc`.
+
+    It keeps the last snapshot to compare the next one with.
+    Tracing allocations slows down the whole process, so it is only done on demand.
+    """
+
+    FILTERS = (
+        tracemalloc.Filter(inclusive=False, filename_pattern=tracemalloc.__file__),
+        tracemalloc.Filter(inclusive=False, filename_pattern="<frozen importlib.*>"),
+        tracemalloc.Filter(inclusive=False, filename_pattern="<unknown>"),
+    )
+    """Filters of allocations made by the machinery itself."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._previous: tracemalloc.Snapshot | None = None
+
+    @property
+    def running(self) -> bool:
+        """Whether allocations are being traced."""
+        return tracemalloc.is_tracing()
+
+    def start(self, frames: int = 1) -> None:
+        """Start tracing allocations, keeping the given number of frames."""
+        with self._lock:
+            if tracemalloc.is_tracing():
+                tracemalloc.stop()
+
+            self._previous = None
+            tracemalloc.start(frames)
+
+    def stop(self) -> None:
+        """Stop tracing allocations and forget the previous snapshot."""
+        with self._lock:
+            tracemalloc.stop()
+            self._previous = None
+
+    def _map(
+        self, stat: tracemalloc.Statistic | tracemalloc.StatisticDiff
+    ) -> AllocationSite:
+        frame = stat.traceback[0]
+        diff = stat if isinstance(stat, tracemalloc.StatisticDiff) else None
+
+        return AllocationSite(
+            file=frame.filename,
+            line=frame.lineno,
+            size=stat.size,
+            count=stat.count,
+            size_diff=diff.size_diff if diff is not None else None,
+            count_diff=diff.count_diff if diff is not None else None,
+        )
+
+    def snapshot(self, limit: int) -> AllocationSnapshot:
+        """Take a snapshot and compare it with the previous one.
+
+        Taking a snapshot is slow, so it should be done outside the event loop.
+        """
+        with self._lock:
+            if not tracemalloc.is_tracing():
+                raise AllocationProfilerNotRunningError
+
+            current, peak = tracemalloc.get_traced_memory()
+            snapshot = tracemalloc.take_snapshot().filter_traces(self.FILTERS)
+            previous, self._previous = self._previous, snapshot
+
+        top = snapshot.statistics("lineno")[:limit]
+        diff = (
+            snapshot.compare_to(previous, "lineno")[:limit]
+            if previous is not None
+            else None
+        )
+
+        return AllocationSnapshot(
+            current=current,
+            peak=peak,
+            top=[self._map(stat) for stat in top],
+            diff=[self._map(stat) for stat in diff] if diff is not None else None,
+        )
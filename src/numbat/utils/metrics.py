@@ -0,0 +1,416 @@
+import bisect
+import math
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections.abc import Callable, Generator, Iterator, Mapping, Sequence
+from contextlib import AbstractContextManager, contextmanager
+from typing import override
+
+type Sample = tuple[str, Mapping[str, str], float]
+
+
+class MetricsError(Exception):
+    """Base class for metrics errors."""
+
+
+class MetricConflictError(MetricsError):
+    """Raised when a metric is registered again with a different definition."""
+
+    def __init__(self, name: str) -> None:
+        super().__init__(f"Metric {name} is already registered differently.")
+
+
+class Shards[T]:
+    """Values kept separately for each thread.
+
+    Each thread updates only its own shard, so updates need no locking
+    and cost as little as a plain increment. Readers combine all shards.
+
+    Args:
+        factory: Function to create the shard of a new thread.
+
+    """
+
+    def __init__(self, factory: Callable[[], T]) -> None:
+        self._factory = factory
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._shards: list[T] = []
+
+    def get(self) -> T:
+        """Get the shard of the current thread."""
+        try:
+            return self._local.shard
+        except AttributeError:
+            shard = self._local.shard = self._factory()
+
+            with self._lock:
+                self._shards.append(shard)
+
+            return shard
+
+    def __iter__(self) -> Iterator[T]:
+        with self._lock:
+            return iter(list(self._shards))
+
+
+class CounterChild:
+    """Single time series of a counter."""
+
+    def __init__(self) -> None:
+        self._shards = Shards(lambda: [0.0])
+
+    def inc(self, amount: float = 1) -> None:
+        """Increase the counter."""
+        self._shards.get()[0] += amount
+
+    @property
+    def value(self) -> float:
+        """Current value of the counter."""
+        return sum(shard[0] for shard in self._shards)
+
+    def samples(self) -> Iterator[Sample]:
+        """Yield samples of the time series."""
+        yield "_total", {}, self.value
+
+
+class GaugeChild:
+    """Single time series of a gauge."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._value = 0.0
+        self._function: Callable[[], float] | None = None
+
+    def inc(self, amount: float = 1) -> None:
+        """Increase the gauge."""
+        with self._lock:
+            self._value += amount
+
+    def dec(self, amount: float = 1) -> None:
+        """Decrease the gauge."""
+        with self._lock:
+            self._value -= amount
+
+    def set(self, value: float) -> None:
+        """Set the gauge to a value."""
+        self._value = value
+
+    def set_function(self, function: Callable[[], float]) -> None:
+        """Compute the gauge with a function whenever it is collected."""
+        self._function = function
+
+    @property
+    def value(self) -> float:
+        """Current value of the gauge."""
+        if self._function is not None:
+            return self._function()
+
+        return self._value
+
+    def samples(self) -> Iterator[Sample]:
+        """Yield samples of the time series."""
+        yield "", {}, self.value
+
+
+class HistogramChild:
+    """Single time series of a histogram.
+
+    Args:
+        buckets: Upper bounds of the buckets in increasing order.
+
+    """
+
+    def __init__(self, buckets: Sequence[float]) -> None:
+        self._buckets = tuple(buckets)
+        # Counts for each bucket and above all buckets, followed by the sum
+        self._shards = Shards(lambda: [0.0] * (len(self._buckets) + 2))
+
+    def observe(self, value: float) -> None:
+        """Observe a value."""
+        shard = self._shards.get()
+        shard[bisect.bisect_left(self._buckets, value)] += 1
+        shard[-1] += value
+
+    @contextmanager
+    def time(self) -> Generator[None]:
+        """Observe the duration of the context in seconds."""
+        start = time.perf_counter()
+
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start)
+
+    def samples(self) -> Iterator[Sample]:
+        """Yield samples of the time series."""
+        totals = [sum(values) for values in zip(*self._shards, strict=True)]
+
+        if not totals:
+            totals = [0.0] * (len(self._buckets) + 2)
+
+        cumulative = 0.0
+
+        for bound, amount in zip(self._buckets, totals, strict=False):
+            cumulative += amount
+            yield "_bucket", {"le": PrometheusFormatter.format_value(bound)}, cumulative
+
+        count = cumulative + totals[-2]
+
+        yield "_bucket", {"le": "+Inf"}, count
+        yield "_sum", {}, totals[-1]
+        yield "_count", {}, count
+
+
+class Metric[C: CounterChild | GaugeChild | HistogramChild](ABC):
+    """Base class for metrics.
+
+    Args:
+        name: Name of the metric.
+        description: Description of the metric.
+        labels: Names of the labels of the metric.
+
+    """
+
+    kind: str
+
+    def __init__(self, name: str, description: str, labels: Sequence[str] = ()) -> None:
+        self.name = name
+        self.description = description
+        self.labelnames = tuple(labels)
+        self._lock = threading.Lock()
+        self._children: dict[tuple[str, ...], C] = {}
+
+    @abstractmethod
+    def _make_child(self) -> C: ...
+
+    def labels(self, **values: str) -> C:
+        """Get the time series for the given label values."""
+        key = tuple(str(values[label]) for label in self.labelnames)
+
+        if (child := self._children.get(key)) is not None:
+            return child
+
+        with self._lock:
+            return self._children.setdefault(key, self._make_child())
+
+    def samples(self) -> Iterator[Sample]:
+        """Yield samples of all time series."""
+        for key, child in list(self._children.items()):
+            labels = dict(zip(self.labelnames, key, strict=True))
+
+            for suffix, extra, value in child.samples():
+                yield f"{self.name}{suffix}", labels | dict(extra), value
+
+
+class Counter(Metric[CounterChild]):
+    """Monotonically increasing metric."""
+
+    kind = "counter"
+
+    @override
+    def _make_child(self) -> CounterChild:
+        return CounterChild()
+
+    def inc(self, amount: float = 1) -> None:
+        """Increase the counter without labels."""
+        self.labels().inc(amount)
+
+
+class Gauge(Metric[GaugeChild]):
+    """Metric that can go up and down."""
+
+    kind = "gauge"
+
+    @override
+    def _make_child(self) -> GaugeChild:
+        return GaugeChild()
+
+    def inc(self, amount: float = 1) -> None:
+        """Increase the gauge without labels."""
+        self.labels().inc(amount)
+
+    def dec(self, amount: float = 1) -> None:
+        """Decrease the gauge without labels."""
+        self.labels().dec(amount)
+
+    def set(self, value: float) -> None:
+        """Set the gauge without labels."""
+        self.labels().set(value)
+
+    def set_function(self, function: Callable[[], float]) -> None:
+        """Compute the gauge without labels with a function."""
+        self.labels().set_function(function)
+
+
+class Histogram(Metric[HistogramChild]):
+    """Metric that counts observed values in buckets.
+
+    Args:
+        name: Name of the metric.
+        description: Description of the metric.
+        labels: Names of the labels of the metric.
+        buckets: Upper bounds of the buckets.
+
+    """
+
+    kind = "histogram"
+
+    DEFAULT_BUCKETS = (
+        0.005,
+        0.01,
+        0.025,
+        0.05,
+        0.1,
+        0.25,
+        0.5,
+        1,
+        2.5,
+        5,
+        10,
+    )
+
+    def __init__(
+        self,
+        name: str,
+        description: str,
+        labels: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> None:
+        super().__init__(name, description, labels)
+        self.buckets = tuple(sorted(bucket for bucket in buckets if bucket != math.inf))
+
+    @override
+    def _make_child(self) -> HistogramChild:
+        return HistogramChild(self.buckets)
+
+    def observe(self, value: float) -> None:
+        """Observe a value without labels."""
+        self.labels().observe(value)
+
+    def time(self) -> AbstractContextManager[None]:
+        """Observe the duration of the context in seconds without labels."""
+        return self.labels().time()
+
+
+class PrometheusFormatter:
+    """Formatter for the Prometheus text exposition format."""
+
+    @staticmethod
+    def format_value(value: float) -> str:
+        """Format a sample value."""
+        value = float(value)
+
+        if math.isnan(value):
+            return "NaN"
+
+        if math.isinf(value):
+            return "+Inf" if value > 0 else "-Inf"
+
+        if value.is_integer():
+            return str(int(value))
+
+        return repr(value)
+
+    def _format_labels(self, labels: Mapping[str, str]) -> str:
+        if not labels:
+            return ""
+
+        pairs = [
+            '{}="{}"'.format(
+                key,
+                value.replace("\\", r"\\").replace("\n", r"\n").replace('"', r"\""),
+            )
+            for key, value in labels.items()
+        ]
+
+        return "{" + ",".join(pairs) + "}"
+
+    def format(
+        self, metrics: Sequence[Metric], labels: Mapping[str, str] | None = None
+    ) -> str:
+        """Format metrics, adding the given labels to all samples."""
+        constant = dict(labels or {})
+        lines = []
+
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {metric.description}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+
+            lines.extend(
+                f"{name}{self._format_labels({**constant, **extra})} "
+                f"{self.format_value(value)}"
+                for name, extra, value in metric.samples()
+            )
+
+        return "\n".join([*lines, ""])
+
+
+class Registry:
+    """Registry of metrics.
+
+    Metrics are kept in memory of the process,
+    so each process has its own registry.
+
+    Args:
+        labels: Labels added to all samples, like the worker that recorded them.
+
+    """
+
+    def __init__(self, labels: Mapping[str, str] | None = None) -> None:
+        self._lock = threading.Lock()
+        self._labels = dict(labels or {})
+        self._metrics: dict[str, Metric] = {}
+
+    def _register[M: Metric](
+        self, cls: type[M], name: str, labels: Sequence[str], factory: Callable[[], M]
+    ) -> M:
+        with self._lock:
+            metric = self._metrics.get(name)
+
+            if metric is None:
+                metric = self._metrics[name] = factory()
+
+            if not isinstance(metric, cls) or metric.labelnames != tuple(labels):
+                raise MetricConflictError(name)
+
+            return metric
+
+    def counter(
+        self, name: str, description: str, labels: Sequence[str] = ()
+    ) -> Counter:
+        """Get or create a counter."""
+        return self._register(
+            Counter, name, labels, lambda: Counter(name, description, labels)
+        )
+
+    def gauge(self, name: str, description: str, labels: Sequence[str] = ()) -> Gauge:
+        """Get or create a gauge."""
+        return self._register(
+            Gauge, name, labels, lambda: Gauge(name, description, labels)
+        )
+
+    def histogram(
+        self,
+        name: str,
+        description: str,
+        labels: Sequence[str] = (),
+        buckets: Sequence[float] = Histogram.DEFAULT_BUCKETS,
+    ) -> Histogram:
+        """Get or create a histogram."""
+        return self._register(
+            Histogram,
+            name,
+            labels,
+            lambda: Histogram(name, description, labels, buckets),
+        )
+
+    @property
+    def metrics(self) -> Sequence[Metric]:
+        """Registered metrics."""
+        return list(self._metrics.values())
+
+    def render(self) -> str:
+        """Render all metrics in the Prometheus text exposition format."""
+        return PrometheusFormatter().format(self.metrics, self._labels)
@@ -1,5 +1,6 @@
 import re
 from collections.abc import Mapping
+from functools import lru_cache
 from typing import Any
 
 from pydantic import GetCoreSchemaHandler
@@ -57,6 +58,9 @@ class MimeType:
     @staticmethod
     def parse(value: Any) -> "MimeType":
         """Parse a MIME type."""
+        if isinstance(value, str):
+            return _parse_string(value)
+
         parser = MimeTypeParser()
         return parser.parse(value)
 
@@ -126,3 +130,9 @@ class MimeTypeSerializer:
     def __call__(self, value: MimeType) -> str:
         """Serialize a MIME type."""
         return self.serialize(value)
+
+
+@lru_cache(maxsize=256)
+def _parse_string(value: str) -> MimeType:
+    parser = MimeTypeParser()
+    return parser.parse(value)
@@ -0,0 +1,183 @@
+import asyncio
+import logging
+import os
+import sys
+import threading
+import time
+import traceback
+from collections.abc import Mapping
+from concurrent.futures import ThreadPoolExecutor
+
+from numbat.config.models import MonitorConfig
+from numbat.utils.executor import InstrumentedThreadPoolExecutor
+from numbat.utils.metrics import Registry
+
+logger = logging.getLogger(__name__)
+
+
+class LoopMonitor:
+    """Monitor of the event loop and thread pools that runs in its own thread.
+
+    It periodically schedules a callback on the event loop and measures
+    how late it runs. Because the measuring is done outside the loop,
+    a blocked loop is noticed while it is still blocked,
+    and the stack of the loop thread is logged to show what blocks it.
+
+    It also installs an instrumented default executor on the loop,
+    so that work passed to `asyncio.to_thread` is monitored too.
+    The executor it replaces is shut down,
+    and when monitoring stops a plain executor takes its place again.
+
+    Args:
+        config: Configuration for monitoring.
+        executors: Other thread pools to monitor by name.
+        metrics: Registry of metrics.
+
+    """
+
+    def __init__(
+        self,
+        config: MonitorConfig,
+        executors: Mapping[str, InstrumentedThreadPoolExecutor],
+        metrics: Registry,
+    ) -> None:
+        self._config = config
+        self._executors = dict(executors)
+        self._stopped: threading.Event | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+        self._lag = metrics.histogram(
+            "numbat_loop_lag_seconds",
+            "Delay of callbacks scheduled on the event loop.",
+        ).labels()
+        self._stalls = metrics.counter(
+            "numbat_loop_stalls",
+            "Number of times the event loop was blocked for longer than the threshold.",
+        ).labels()
+        self._pending = metrics.gauge(
+            "numbat_executor_pending",
+            "Number of work items waiting for a free thread in a thread pool.",
+            ["executor"],
+        )
+        self._active = metrics.gauge(
+            "numbat_executor_active",
+            "Number of busy threads in a thread pool.",
+            ["executor"],
+        )
+        self._workers = metrics.gauge(
+            "numbat_executor_workers",
+            "Maximum number of threads in a thread pool.",
+            ["executor"],
+        )
+        self._wait = metrics.histogram(
+            "numbat_default_executor_wait_seconds",
+            "Time work passed to threads by asyncio waited for a free thread.",
+        ).labels()
+
+    def _make_default_executor(self) -> InstrumentedThreadPoolExecutor:
+        # Same size as the default executor of asyncio
+        return InstrumentedThreadPoolExecutor(
+            workers=min(32, (os.cpu_count() or 1) + 4),
+            name="asyncio",
+            wait=self._wait,
+        )
+
+    def _replace_default_executor(
+        self, loop: asyncio.AbstractEventLoop, executor: ThreadPoolExecutor
+    ) -> None:
+        # asyncio doesn't expose the default executor,
+        # which it only creates once work is first passed to threads
+        replaced: ThreadPoolExecutor | None = getattr(loop, "_default_executor", None)
+
+        loop.set_default_executor(executor)
+
+        if replaced is not None and replaced is not executor:
+            # Work that was already submitted still runs to completion
+            replaced.shutdown(wait=False)
+
+    def _log_stack(self, ident: int) -> None:
+        frame = sys._current_frames().get(ident)  # noqa: SLF001
+
+        if frame is None:
+            return
+
+        logger.warning(
+            "Event loop blocked for more than %s seconds in:\n%s",
+            self._config.threshold,
+            "".join(traceback.format_stack(frame)).rstrip(),
+        )
+
+    def _sample_lag(
+        self, loop: asyncio.AbstractEventLoop, ident: int, stopped: threading.Event
+    ) -> None:
+        done = threading.Event()
+        scheduled = time.perf_counter()
+
+        loop.call_soon_threadsafe(done.set)
+
+        if not done.wait(self._config.threshold):
+            self._stalls.inc()
+            self._log_stack(ident)
+
+            while not done.wait(self._config.interval):
+                if stopped.is_set():
+                    return
+
+        self._lag.observe(time.perf_counter() - scheduled)
+
+    def _sample_executors(self) -> None:
+        for name, executor in self._executors.items():
+            self._pending.labels(executor=name).set(executor.pending)
+            self._active.labels(executor=name).set(executor.active)
+            self._workers.labels(executor=name).set(executor.workers)
+
+    def _run(
+        self, loop: asyncio.AbstractEventLoop, ident: int, stopped: threading.Event
+    ) -> None:
+        while not stopped.wait(self._config.interval):
+            try:
+                self._sample_lag(loop, ident, stopped)
+            except RuntimeError:
+                # The loop was closed
+                return
+
+            self._sample_executors()
+
+    def start(self) -> None:
+        """Start monitoring the running event loop.
+
+        Must be called from the thread that runs the loop.
+        """
+        loop = asyncio.get_running_loop()
+        executor = self._make_default_executor()
+
+        self._replace_default_executor(loop, executor)
+        self._executors["default"] = executor
+
+        self._loop = loop
+        self._stopped = threading.Event()
+
+        threading.Thread(
+            target=self._run,
+            args=(loop, threading.get_ident(), self._stopped),
+            name="monitor",
+            daemon=True,
+        ).start()
+
+    def stop(self) -> None:
+        """Stop monitoring.
+
+        The monitor thread finishes on its own shortly after,
+        without blocking the event loop.
+        Must be called from the thread that runs the loop.
+        """
+        if self._stopped is not None:
+            self._stopped.set()
+            self._stopped = None
+
+        if self._loop is not None:
+            self._executors.pop("default", None)
+            self._replace_default_executor(
+                self._loop, ThreadPoolExecutor(thread_name_prefix="asyncio")
+            )
+            self._loop = None
@@ -0,0 +1,122 @@
+import asyncio
+import heapq
+import itertools
+import time
+from collections.abc import AsyncGenerator
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from enum import IntEnum
+
+from numbat.utils.metrics import Histogram
+
+
+class Priority(IntEnum):
+    """Priority of work, lower values go first."""
+
+    URGENT = 0
+    """Work that is needed soon, like content that is about to air."""
+
+    NORMAL = 1
+    """Work that is not classified otherwise."""
+
+    BULK = 2
+    """Work that can wait, like listings and transfers of content not airing soon."""
+
+
+CURRENT_PRIORITY: ContextVar[Priority] = ContextVar("priority", default=Priority.NORMAL)
+"""Priority of the work done in the current context."""
+
+
+def prioritize(priority: Priority) -> None:
+    """Set the priority of the work done in the current context from now on.
+
+    Tasks started later from the current context inherit the priority.
+    """
+    CURRENT_PRIORITY.set(priority)
+
+
+class PriorityLimiter:
+    """Limiter of concurrent work that lets more urgent work go first.
+
+    Bulk work is throttled when the limiter is contended,
+    so that a share of the capacity is always left for more urgent work.
+
+    Args:
+        capacity: Maximum number of concurrent work items.
+        reserved: Share of the capacity that bulk work can't use.
+        wait: Histogram to observe the waiting times in seconds with.
+
+    """
+
+    def __init__(self, capacity: int, reserved: float, wait: Histogram) -> None:
+        self._capacity = capacity
+        self._bulk = max(1, capacity - round(capacity * reserved))
+        self._wait = wait
+        self._used = 0
+        self._counter = itertools.count()
+        self._waiters: list[tuple[Priority, int, asyncio.Future[None]]] = []
+
+    def _admits(self, priority: Priority) -> bool:
+        limit = self._bulk if priority >= Priority.BULK else self._capacity
+        return self._used < limit
+
+    def _prune(self) -> None:
+        while self._waiters and self._waiters[0][2].done():
+            heapq.heappop(self._waiters)
+
+    def _wake(self) -> None:
+        self._prune()
+
+        while self._waiters and self._admits(self._waiters[0][0]):
+            _, _, future = heapq.heappop(self._waiters)
+            self._used += 1
+            future.set_result(None)
+            self._prune()
+
+    def _release(self) -> None:
+        self._used -= 1
+        self._wake()
+
+    async def _acquire(self, priority: Priority) -> None:
+        self._prune()
+
+        first = not self._waiters or priority < self._waiters[0][0]
+
+        if first and self._admits(priority):
+            self._used += 1
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._counter), future))
+
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                self._release()
+            raise
+
+    @property
+    def waiting(self) -> int:
+        """Number of work items waiting for their turn."""
+        return sum(1 for _, _, future in self._waiters if not future.done())
+
+    @asynccontextmanager
+    async def slot(self, priority: Priority | None = None) -> AsyncGenerator[None]:
+        """Hold a slot for the duration of the context.
+
+        If the priority is not given, the priority of the current context is used.
+        """
+        priority = priority if priority is not None else CURRENT_PRIORITY.get()
+        start = time.perf_counter()
+
+        await self._acquire(priority)
+
+        self._wait.labels(priority=priority.name.lower()).observe(
+            time.perf_counter() - start
+        )
+
+        try:
+            yield
+        finally:
+            self._release()
@@ -0,0 +1,176 @@
+import sys
+import threading
+import time
+from collections import Counter
+from collections.abc import Mapping
+from dataclasses import dataclass
+from types import FrameType
+from typing import Any
+
+
+class ProfilerError(Exception):
+    """Base class for profiler errors."""
+
+
+class ProfilerBusyError(ProfilerError):
+    """Raised when the profiler is already running."""
+
+    def __init__(self) -> None:
+        super().__init__("Profiler is already running.")
+
+
+@dataclass(frozen=True)
+class Frame:
+    """Function on a sampled stack."""
+
+    name: str
+    """Qualified name of the function."""
+
+    file: str
+    """Path of the file the function is defined in."""
+
+    line: int
+    """Line the function starts at."""
+
+    def __str__(self) -> str:
+        return f"{self.name} ({self.file}:{self.line})"
+
+
+type Stack = tuple[Frame, ...]
+
+
+@dataclass(frozen=True)
+class Profile:
+    """Samples of the stacks of all threads."""
+
+    samples: Mapping[str, Mapping[Stack, int]]
+    """Number of times each stack was sampled, from the outermost frame, by thread."""
+
+    interval: float
+    """Number of seconds between samples."""
+
+    duration: float
+    """Number of seconds the profiler ran for."""
+
+    def collapsed(self) -> str:
+        """Render the profile in the collapsed stack format.
+
+        Each line holds the thread name and frames separated by semicolons,
+        followed by the number of samples, like flame graph tools expect.
+        """
+        return "".join(
+            f"{';'.join([thread, *(str(frame) for frame in stack)])} {count}\n"
+            for thread, stacks in self.samples.items()
+            for stack, count in stacks.items()
+        )
+
+    def speedscope(self) -> Mapping[str, Any]:
+        """Render the profile in the speedscope file format."""
+        frames: dict[Frame, int] = {}
+        profiles = []
+
+        for thread, stacks in self.samples.items():
+            samples = []
+            weights = []
+
+            for stack, count in stacks.items():
+                samples.append(
+                    [frames.setdefault(frame, len(frames)) for frame in stack]
+                )
+                weights.append(count * self.interval)
+
+            profiles.append(
+                {
+                    "type": "sampled",
+                    "name": thread,
+                    "unit": "seconds",
+                    "startValue": 0,
+                    "endValue": sum(weights),
+                    "samples": samples,
+                    "weights": weights,
+                }
+            )
+
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "name": "numbat",
+            "exporter": "numbat",
+            "shared": {
+                "frames": [
+                    {"name": frame.name, "file": frame.file, "line": frame.line}
+                    for frame in frames
+                ]
+            },
+            "profiles": profiles,
+        }
+
+
+class SamplingProfiler:
+    """Statistical profiler that samples the stacks of all threads.
+
+    Sampling is done from the thread that runs the profiler,
+    so profiled threads are not slowed down, apart from contention for the GIL.
+    The overhead is bounded by the interval between samples,
+    the depth of sampled stacks and running a single profile at a time.
+
+    Args:
+        interval: Number of seconds between samples.
+        depth: Maximum number of innermost frames kept from each stack.
+
+    """
+
+    def __init__(self, interval: float, depth: int = 128) -> None:
+        self._interval = interval
+        self._depth = depth
+        self._lock = threading.Lock()
+
+    def _walk(self, frame: FrameType | None) -> Stack:
+        frames = []
+
+        while frame is not None and len(frames) < self._depth:
+            code = frame.f_code
+            frames.append(
+                Frame(
+                    name=code.co_qualname,
+                    file=code.co_filename,
+                    line=code.co_firstlineno,
+                )
+            )
+            frame = frame.f_back
+
+        return tuple(reversed(frames))
+
+    def _sample(self, samples: dict[str, Counter[Stack]]) -> None:
+        ident = threading.get_ident()
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+
+        for thread, frame in sys._current_frames().items():  # noqa: SLF001
+            if thread == ident:
+                continue
+
+            name = names.get(thread, str(thread))
+            samples.setdefault(name, Counter())[self._walk(frame)] += 1
+
+    def profile(self, duration: float) -> Profile:
+        """Sample stacks for the given number of seconds, blocking until done."""
+        if not self._lock.acquire(blocking=False):
+            raise ProfilerBusyError
+
+        try:
+            samples: dict[str, Counter[Stack]] = {}
+            start = time.perf_counter()
+            end = start + duration
+            deadline = start
+
+            while (now := time.perf_counter()) < end:
+                self._sample(samples)
+                deadline = max(deadline + self._interval, now)
+                time.sleep(max(0.0, deadline - time.perf_counter()))
+
+            return Profile(
+                samples=samples,
+                interval=self._interval,
+                duration=time.perf_counter() - start,
+            )
+        finally:
+            self._lock.release()
@@ -1,23 +1,67 @@
+from collections import deque
 from collections.abc import Iterator
 
+from numbat.utils.metrics import GaugeChild
+
 
 class ReadableIterator:
-    """Iterator wrapper providing a read method."""
+    """Iterator wrapper providing a read method.
+
+    Args:
+        iterator: Iterator of bytes to read from.
+        memory: Gauge to account the bytes held in memory with.
+        retained: Number of last read parts that the reader is expected
+            to keep in memory, which are accounted until the reader is closed
+            or reads enough newer parts.
+
+    """
 
-    def __init__(self, iterator: Iterator[bytes]) -> None:
+    def __init__(
+        self,
+        iterator: Iterator[bytes],
+        memory: GaugeChild | None = None,
+        retained: int = 0,
+    ) -> None:
         self._iterator = iterator
         self._buffer = b""
+        self._memory = memory
+        self._retained: deque[int] = deque()
+        self._retain = retained
+
+    def _account(self, amount: int) -> None:
+        if self._memory is not None and amount:
+            self._memory.inc(amount)
+
+    def _hand_out(self, data: bytes) -> bytes:
+        if self._retain > 0:
+            self._retained.append(len(data))
+            self._account(len(data))
+
+            if len(self._retained) > self._retain:
+                self._account(-self._retained.popleft())
+
+        return data
 
     def read(self, size: int | None = -1) -> bytes:
         """Read bytes from the iterator."""
         if size is None or size < 0:
-            return b"".join(self._iterator)
+            return self._hand_out(b"".join(self._iterator))
 
         while len(self._buffer) < size:
             try:
-                self._buffer += next(self._iterator)
+                chunk = next(self._iterator)
             except StopIteration:
                 break
 
+            self._buffer += chunk
+            self._account(len(chunk))
+
         data, self._buffer = self._buffer[:size], self._buffer[size:]
-        return data
+        self._account(-len(data))
+        return self._hand_out(data)
+
+    def close(self) -> None:
+        """Stop accounting the bytes held in memory."""
+        self._account(-len(self._buffer) - sum(self._retained))
+        self._memory = None
+        self._retained.clear()
@@ -0,0 +1,46 @@
+import struct
+import time
+
+
+class Stamper:
+    """Stamper of messages with monotonically increasing identifiers.
+
+    Identifiers are based on the current time in nanoseconds,
+    so they keep increasing across restarts.
+    Each stamped message starts with its identifier,
+    so whoever passes messages on in order can stamp them again,
+    which numbers them in that order.
+    """
+
+    HEADER = struct.Struct("!Q")
+
+    GAP = b""
+    """Message telling receivers that stamped messages might have been lost."""
+
+    def __init__(self) -> None:
+        self._last = 0
+
+    def next(self) -> int:
+        """Get the next identifier."""
+        self._last = max(time.time_ns(), self._last + 1)
+        return self._last
+
+    def stamp(self, payload: bytes) -> bytes:
+        """Stamp a payload with the next identifier."""
+        return self.HEADER.pack(self.next()) + payload
+
+    def restamp(self, message: bytes) -> bytes:
+        """Replace the identifier of a stamped message with the next identifier."""
+        if len(message) < self.HEADER.size:
+            return message
+
+        return self.stamp(message[self.HEADER.size :])
+
+    @classmethod
+    def unstamp(cls, message: bytes) -> tuple[int, bytes] | None:
+        """Split a stamped message into its identifier and payload."""
+        if len(message) < cls.HEADER.size:
+            return None
+
+        (identifier,) = cls.HEADER.unpack_from(message)
+        return identifier, message[cls.HEADER.size :]
@@ -71,6 +71,10 @@ type Timedelta = Annotated[
 ]
 
 
+DATETIME_ADAPTER = TypeAdapter(datetime)
+HTTP_DATETIME_ADAPTER = TypeAdapter(HTTPDatetime)
+
+
 def awareutcnow() -> datetime:
     """Return the current datetime in UTC with timezone information."""
     return datetime.now(UTC)
@@ -83,19 +87,19 @@ def naiveutcnow() -> datetime:
 
 def isostringify(dt: datetime) -> str:
     """Convert a datetime to a string in ISO 8601 format."""
-    return TypeAdapter(datetime).dump_python(dt, mode="json")
+    return DATETIME_ADAPTER.dump_python(dt, mode="json")
 
 
 def isoparse(value: str) -> datetime:
     """Parse a string in ISO 8601 format to a datetime."""
-    return TypeAdapter(datetime).validate_python(value)
+    return DATETIME_ADAPTER.validate_python(value)
 
 
 def httpstringify(dt: datetime) -> str:
     """Convert a datetime to an HTTP date string."""
-    return TypeAdapter(HTTPDatetime).dump_python(dt, mode="json")
+    return HTTP_DATETIME_ADAPTER.dump_python(dt, mode="json")
 
 
 def httpparse(value: str) -> datetime:
     """Parse an HTTP date string to a datetime."""
-    return TypeAdapter(HTTPDatetime).validate_python(value)
+    return HTTP_DATETIME_ADAPTER.validate_python(value)
@@ -0,0 +1,54 @@
+import time
+from collections.abc import Generator
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+
+class TimingCollector:
+    """Collector of the time spent in named stages of handling a request."""
+
+    def __init__(self) -> None:
+        self._durations: dict[str, float] = {}
+        self._counts: dict[str, int] = {}
+
+    def add(self, name: str, seconds: float) -> None:
+        """Add time spent in a stage."""
+        self._durations[name] = self._durations.get(name, 0.0) + seconds
+        self._counts[name] = self._counts.get(name, 0) + 1
+
+    def header(self) -> str:
+        """Format the collected times as a `Server-Timing` header value."""
+        entries = []
+
+        for name, seconds in self._durations.items():
+            entry = f"{name};dur={seconds * 1000:.3f}"
+
+            if (count := self._counts[name]) > 1:
+                entry += f';desc="{count} times"'
+
+            entries.append(entry)
+
+        return ", ".join(entries)
+
+
+CURRENT_TIMINGS: ContextVar[TimingCollector | None] = ContextVar(
+    "timings", default=None
+)
+"""Collector of the timings of the request handled in the current context."""
+
+
+@contextmanager
+def timed(name: str) -> Generator[None]:
+    """Add the time spent in the context to the current collector, if there is one."""
+    collector = CURRENT_TIMINGS.get()
+
+    if collector is None:
+        yield
+        return
+
+    start = time.perf_counter()
+
+    try:
+        yield
+    finally:
+        collector.add(name, time.perf_counter() - start)
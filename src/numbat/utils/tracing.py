@@ -0,0 +1,393 @@
+import functools
+import json
+import os
+import re
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import deque
+from collections.abc import Awaitable, Callable, Generator, Mapping, Sequence
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from enum import IntEnum
+from pathlib import Path
+from typing import Any, Concatenate, Protocol, Self, override
+
+type AttributeValue = str | int | float | bool
+
+
+@dataclass(frozen=True)
+class SpanContext:
+    """Identifiers of a span that are propagated to other spans."""
+
+    trace: str
+    """Identifier of the trace as 32 hexadecimal digits."""
+
+    span: str
+    """Identifier of the span as 16 hexadecimal digits."""
+
+    TRACEPARENT = re.compile(r"^00-([0-9a-f]{32})-([0-9a-f]{16})-[0-9a-f]{2}$")
+
+    @classmethod
+    def parse(cls, traceparent: str | None) -> Self | None:
+        """Parse a context from a W3C `traceparent` header."""
+        if traceparent is None:
+            return None
+
+        match = cls.TRACEPARENT.match(traceparent.strip().lower())
+
+        if match is None:
+            return None
+
+        trace, span = match.groups()
+
+        if trace == "0" * 32 or span == "0" * 16:
+            return None
+
+        return cls(trace=trace, span=span)
+
+    @property
+    def traceparent(self) -> str:
+        """Context as a W3C `traceparent` header."""
+        return f"00-{self.trace}-{self.span}-01"
+
+
+class SpanKind(IntEnum):
+    """Kind of span, numbered like in OTLP."""
+
+    INTERNAL = 1
+    SERVER = 2
+    CLIENT = 3
+
+
+class SpanStatus(IntEnum):
+    """Status of span, numbered like in OTLP."""
+
+    UNSET = 0
+    OK = 1
+    ERROR = 2
+
+
+@dataclass
+class Span:
+    """Timed operation that is part of a trace."""
+
+    name: str
+    """Name of the operation."""
+
+    context: SpanContext
+    """Identifiers of the span."""
+
+    parent: SpanContext | None
+    """Identifiers of the parent span."""
+
+    kind: SpanKind
+    """Kind of the span."""
+
+    exporter: "Exporter" = field(repr=False)
+    """Exporter to export the span with when it ends."""
+
+    attributes: dict[str, AttributeValue] = field(default_factory=dict)
+    """Attributes describing the operation."""
+
+    start: int = field(default_factory=time.time_ns)
+    """Start time in nanoseconds since the epoch."""
+
+    end: int | None = None
+    """End time in nanoseconds since the epoch."""
+
+    status: SpanStatus = SpanStatus.UNSET
+    """Status of the operation."""
+
+    message: str | None = None
+    """Description of the status."""
+
+    def set(self, key: str, value: AttributeValue) -> None:
+        """Set an attribute."""
+        self.attributes[key] = value
+
+    def fail(self, exception: BaseException) -> None:
+        """Mark the operation as failed with an exception."""
+        self.status = SpanStatus.ERROR
+        self.message = f"{type(exception).__name__}: {exception}"
+
+    def finish(self) -> None:
+        """End the span and export it, if not ended yet."""
+        if self.end is not None:
+            return
+
+        self.end = time.time_ns()
+        self.exporter.export(self)
+
+
+CURRENT_SPAN: ContextVar[Span | None] = ContextVar("span", default=None)
+"""Span of the work done in the current context."""
+
+
+class Exporter(ABC):
+    """Base class for span exporters."""
+
+    @abstractmethod
+    def export(self, span: Span) -> None:
+        """Export a finished span."""
+
+    @abstractmethod
+    def close(self) -> None:
+        """Release resources held by the exporter."""
+
+
+class MemoryExporter(Exporter):
+    """Exporter that keeps recent spans in memory.
+
+    Args:
+        size: Maximum number of spans to keep.
+
+    """
+
+    def __init__(self, size: int = 10000) -> None:
+        self._spans: deque[Span] = deque(maxlen=size)
+
+    @property
+    def spans(self) -> Sequence[Span]:
+        """Exported spans, oldest first."""
+        return list(self._spans)
+
+    @override
+    def export(self, span: Span) -> None:
+        self._spans.append(span)
+
+    @override
+    def close(self) -> None:
+        return
+
+    def clear(self) -> None:
+        """Forget all exported spans."""
+        self._spans.clear()
+
+
+class OTLPFileExporter(Exporter):
+    """Exporter that appends spans to a file in the OTLP JSON lines format.
+
+    Each line holds one span and can be read by the OpenTelemetry Collector.
+
+    Args:
+        path: Path of the file.
+        service: Name of the service to describe the spans with.
+
+    """
+
+    def __init__(self, path: Path, service: str = "numbat") -> None:
+        self._path = path
+        self._resource = {
+            "attributes": [
+                self._encode_attribute("service.name", service),
+                self._encode_attribute("process.pid", os.getpid()),
+            ]
+        }
+        self._lock = threading.Lock()
+        self._file = None
+
+    def _encode_value(self, value: AttributeValue) -> Mapping[str, Any]:
+        match value:
+            case bool():
+                return {"boolValue": value}
+            case int():
+                return {"intValue": str(value)}
+            case float():
+                return {"doubleValue": value}
+            case str():
+                return {"stringValue": value}
+
+    def _encode_attribute(self, key: str, value: AttributeValue) -> Mapping[str, Any]:
+        return {"key": key, "value": self._encode_value(value)}
+
+    def _encode_span(self, span: Span) -> Mapping[str, Any]:
+        encoded = {
+            "traceId": span.context.trace,
+            "spanId": span.context.span,
+            "name": span.name,
+            "kind": int(span.kind),
+            "startTimeUnixNano": str(span.start),
+            "endTimeUnixNano": str(span.end),
+            "attributes": [
+                self._encode_attribute(key, value)
+                for key, value in span.attributes.items()
+            ],
+            "status": {"code": int(span.status)}
+            | ({"message": span.message} if span.message else {}),
+        }
+
+        if span.parent is not None:
+            encoded["parentSpanId"] = span.parent.span
+
+        return encoded
+
+    def _encode(self, span: Span) -> str:
+        return json.dumps(
+            {
+                "resourceSpans": [
+                    {
+                        "resource": self._resource,
+                        "scopeSpans": [
+                            {
+                                "scope": {"name": "numbat"},
+                                "spans": [self._encode_span(span)],
+                            }
+                        ],
+                    }
+                ]
+            },
+            separators=(",", ":"),
+        )
+
+    @override
+    def export(self, span: Span) -> None:
+        line = self._encode(span) + "\n"
+
+        with self._lock:
+            if self._file is None:
+                self._path.parent.mkdir(parents=True, exist_ok=True)
+                self._file = self._path.open("a", encoding="utf-8")
+
+            self._file.write(line)
+
+    @override
+    def close(self) -> None:
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+class Tracer:
+    """Tracer that creates spans and keeps track of the current one.
+
+    Without an exporter, tracing is disabled and creating spans costs next to nothing.
+
+    Args:
+        exporter: Exporter for finished spans.
+
+    """
+
+    def __init__(self, exporter: Exporter | None = None) -> None:
+        self._exporter = exporter
+
+    @property
+    def enabled(self) -> bool:
+        """Whether spans are recorded."""
+        return self._exporter is not None
+
+    def start(
+        self,
+        name: str,
+        *,
+        kind: SpanKind = SpanKind.INTERNAL,
+        parent: SpanContext | None = None,
+        attributes: Mapping[str, AttributeValue] | None = None,
+    ) -> Span | None:
+        """Start a span that must be finished explicitly.
+
+        If the parent is not given, the span is a child of the current span.
+        The span does not become the current span.
+        """
+        if self._exporter is None:
+            return None
+
+        if parent is None and (current := CURRENT_SPAN.get()) is not None:
+            parent = current.context
+
+        context = SpanContext(
+            trace=parent.trace if parent is not None else os.urandom(16).hex(),
+            span=os.urandom(8).hex(),
+        )
+
+        return Span(
+            name=name,
+            context=context,
+            parent=parent,
+            kind=kind,
+            exporter=self._exporter,
+            attributes=dict(attributes or {}),
+        )
+
+    @contextmanager
+    def span(
+        self,
+        name: str,
+        *,
+        kind: SpanKind = SpanKind.INTERNAL,
+        parent: SpanContext | None = None,
+        attributes: Mapping[str, AttributeValue] | None = None,
+    ) -> Generator[Span | None]:
+        """Record a span for the duration of the context.
+
+        The span is the current span within the context.
+        """
+        span = self.start(name, kind=kind, parent=parent, attributes=attributes)
+
+        if span is None:
+            yield None
+            return
+
+        token = CURRENT_SPAN.set(span)
+
+        try:
+            yield span
+        except Exception as ex:
+            span.fail(ex)
+            raise
+        finally:
+            CURRENT_SPAN.reset(token)
+            span.finish()
+
+    def annotate(self, key: str, value: AttributeValue) -> None:
+        """Set an attribute of the current span, if there is one."""
+        if (span := CURRENT_SPAN.get()) is not None:
+            span.set(key, value)
+
+    def close(self) -> None:
+        """Close the exporter."""
+        if self._exporter is not None:
+            self._exporter.close()
+
+
+class Traced(Protocol):
+    """Object that records spans with a tracer."""
+
+    @property
+    def tracer(self) -> Tracer:
+        """Tracer to record spans with."""
+        ...
+
+
+def traced[T: Traced, **P, R](
+    name: str, attributes: Callable[..., Mapping[str, AttributeValue]] | None = None
+) -> Callable[
+    [Callable[Concatenate[T, P], Awaitable[R]]],
+    Callable[Concatenate[T, P], Awaitable[R]],
+]:
+    """Record a span for each call of the decorated async method.
+
+    Attributes of the span are computed from the arguments of the call,
+    not including the object itself, and only when tracing is enabled.
+    """
+
+    def decorate(
+        method: Callable[Concatenate[T, P], Awaitable[R]],
+    ) -> Callable[Concatenate[T, P], Awaitable[R]]:
+        @functools.wraps(method)
+        async def wrapper(self: T, *args: P.args, **kwargs: P.kwargs) -> R:
+            tracer = self.tracer
+            computed = (
+                attributes(*args, **kwargs)
+                if attributes is not None and tracer.enabled
+                else None
+            )
+
+            with tracer.span(name, attributes=computed):
+                return await method(self, *args, **kwargs)
+
+        return wrapper
+
+    return decorate
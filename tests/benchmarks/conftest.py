@@ -0,0 +1,32 @@
+from pathlib import Path
+
+import pytest
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    """Add options for the benchmark suite."""
+    group = parser.getgroup("benchmarks")
+    group.addoption(
+        "--benchmark-save",
+        type=Path,
+        default=None,
+        help="Save the results of the benchmark suite as a baseline to this file.",
+    )
+    group.addoption(
+        "--benchmark-compare",
+        type=Path,
+        default=None,
+        help="Compare the results of the benchmark suite with the baseline in this file.",
+    )
+    group.addoption(
+        "--benchmark-tolerance",
+        type=float,
+        default=0.2,
+        help="Relative slowdown from the baseline that is not flagged as a regression.",
+    )
+    group.addoption(
+        "--benchmark-full",
+        action="store_true",
+        default=False,
+        help="Run the full benchmark suite instead of the quick one.",
+    )
@@ -0,0 +1,93 @@
+import asyncio
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+import pytest
+from litestar.channels.backends.base import ChannelsBackend
+from litestar.channels.backends.memory import MemoryChannelsBackend
+
+from numbat.api.channels import SocketChannelsBackend, SocketChannelsBroker
+
+COUNT = 10_000
+
+CHANNEL = "events"
+
+PAYLOAD = b'{"id":1704067200000000000,"event":{"type":"test","data":{}}}'
+
+
+async def _measure(publisher: ChannelsBackend, subscriber: ChannelsBackend) -> float:
+    await subscriber.subscribe([CHANNEL])
+    await publisher.subscribe([CHANNEL])
+
+    async def receive() -> int:
+        received = 0
+
+        async for channel, data in subscriber.stream_events():
+            assert channel == CHANNEL
+            assert data == PAYLOAD
+
+            received += 1
+
+            if received == COUNT:
+                break
+
+        return received
+
+    start = time.perf_counter()
+
+    task = asyncio.create_task(receive())
+
+    for _ in range(COUNT):
+        await publisher.publish(PAYLOAD, [CHANNEL])
+
+    received = await asyncio.wait_for(task, timeout=60)
+
+    elapsed = time.perf_counter() - start
+
+    assert received == COUNT
+
+    return elapsed
+
+
+@pytest.mark.asyncio
+async def test_socket_throughput(
+    tmp_path: Path, record_property: Callable[[str, object], None]
+) -> None:
+    """Benchmark passing 10k events between two processes' backends via the broker."""
+    broker = SocketChannelsBroker(tmp_path / "channels.sock")
+    await broker.start()
+
+    publisher = SocketChannelsBackend(tmp_path / "channels.sock")
+    subscriber = SocketChannelsBackend(tmp_path / "channels.sock")
+
+    await publisher.on_startup()
+    await subscriber.on_startup()
+
+    try:
+        elapsed = await _measure(publisher, subscriber)
+    finally:
+        await publisher.on_shutdown()
+        await subscriber.on_shutdown()
+        await broker.stop()
+
+    record_property("elapsed", elapsed)
+    record_property("throughput", COUNT / elapsed)
+
+
+@pytest.mark.asyncio
+async def test_memory_throughput(
+    record_property: Callable[[str, object], None],
+) -> None:
+    """Benchmark passing 10k events within a single process for comparison."""
+    backend = MemoryChannelsBackend()
+
+    await backend.on_startup()
+
+    try:
+        elapsed = await _measure(backend, backend)
+    finally:
+        await backend.on_shutdown()
+
+    record_property("elapsed", elapsed)
+    record_property("throughput", COUNT / elapsed)
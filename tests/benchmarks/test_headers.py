@@ -0,0 +1,51 @@
+from collections.abc import Sequence
+from datetime import UTC, datetime, timedelta
+
+from numbat.api.routes.prerecordings import models as m
+from numbat.api.routes.prerecordings.controller import DownloadHeadersEncoder
+from numbat.benchmarks import legacy
+from numbat.utils.mime import MimeType
+from numbat.utils.time import httpparse
+
+COUNT = 10_000
+
+RESPONSE = m.HeadDownloadResponse(
+    type=MimeType.parse("audio/ogg; codecs=opus"),
+    size=123456789,
+    tag='"d41d8cd98f00b204e9800998ecf8427e"',
+    modified=datetime(2000, 1, 1, 12, 30, 15, tzinfo=UTC),
+)
+
+
+def _make_responses(count: int) -> Sequence[m.HeadDownloadResponse]:
+    types = [MimeType.parse("audio/ogg"), RESPONSE.type]
+    return [
+        m.HeadDownloadResponse(
+            type=types[i % len(types)],
+            size=i,
+            tag=f'"{i:032x}"',
+            modified=RESPONSE.modified + timedelta(seconds=i),
+        )
+        for i in range(count)
+    ]
+
+
+def test_encode_equivalent() -> None:
+    """Test if the encoder produces the same headers as per-request models."""
+    headers = DownloadHeadersEncoder(head=True).encode(RESPONSE)
+
+    assert headers == legacy.encode_download_headers(RESPONSE)
+    assert headers["Last-Modified"] == "Sat, 01 Jan 2000 12:30:15 GMT"
+    assert httpparse(headers["Last-Modified"]) == RESPONSE.modified
+
+
+def test_encode_many() -> None:
+    """Test if encoding 10k responses gives the same headers as per-request models."""
+    responses = _make_responses(COUNT)
+
+    encoder = DownloadHeadersEncoder(head=True)
+    headers = [encoder.encode(response) for response in responses]
+
+    assert headers == [
+        legacy.encode_download_headers(response) for response in responses
+    ]
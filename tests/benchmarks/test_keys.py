@@ -0,0 +1,67 @@
+from collections.abc import Sequence
+from datetime import datetime, timedelta
+from uuid import UUID, uuid4
+
+from numbat.benchmarks import legacy
+from numbat.services.entities.prerecordings.utils import KeyCodec
+
+COUNT = 100_000
+
+SAMPLE = 10_000
+
+
+def _make_items(count: int) -> Sequence[tuple[UUID, datetime]]:
+    events = [uuid4() for _ in range(10)]
+    start = datetime(2024, 1, 1, 12, 0, 0)
+    return [
+        (events[i % len(events)], start + timedelta(minutes=15 * i, microseconds=i % 3))
+        for i in range(count)
+    ]
+
+
+def test_roundtrip() -> None:
+    """Test if keys round-trip exactly like the legacy format."""
+    codec = KeyCodec()
+    items = _make_items(SAMPLE)
+
+    for event, start in items:
+        key = codec.encode(event, start)
+
+        assert key == legacy.encode_key(event, start)
+        assert codec.decode(key) == (event, start)
+        assert codec.decode(key) == legacy.decode_key(key)
+
+
+def test_fallback() -> None:
+    """Test if non-canonical keys are decoded like the legacy format."""
+    codec = KeyCodec()
+    event = uuid4()
+
+    for name in ["2024-01-01", "2024-01-01 10:00:00", "2024-01-01T10:00:00Z", "x"]:
+        key = f"{event}/{name}"
+        assert codec.decode(key) == legacy.decode_key(key)
+
+
+def test_decode_many() -> None:
+    """Test if decoding 100k keys parses the prefix of each event only once."""
+    codec = KeyCodec()
+    items = _make_items(COUNT)
+    keys = [codec.encode(event, start) for event, start in items]
+
+    KeyCodec.decode_prefix.cache_clear()
+
+    assert [codec.decode(key) for key in keys] == items
+    assert KeyCodec.decode_prefix.cache_info().misses == len(
+        {event for event, _ in items}
+    )
+
+
+def test_encode_many() -> None:
+    """Test if 100k encoded keys are all distinct and decode back to their items."""
+    codec = KeyCodec()
+    items = _make_items(COUNT)
+
+    keys = [codec.encode(event, start) for event, start in items]
+
+    assert len(set(keys)) == COUNT
+    assert [codec.decode(key) for key in keys] == items
@@ -0,0 +1,54 @@
+import threading
+
+from numbat.benchmarks import legacy
+from numbat.utils.metrics import Registry
+
+COUNT = 1_000_000
+
+THREADS = 4
+
+
+def test_observe_threads() -> None:
+    """Test if observations from many threads are all counted."""
+    registry = Registry()
+    histogram = registry.histogram("histogram", "Histogram.", buckets=[1, 2])
+    counter = registry.counter("counter", "Counter.")
+
+    def observe() -> None:
+        for i in range(COUNT // 100):
+            histogram.observe(i % 4)
+            counter.inc()
+
+    threads = [threading.Thread(target=observe) for _ in range(THREADS)]
+
+    for thread in threads:
+        thread.start()
+
+    for thread in threads:
+        thread.join()
+
+    total = THREADS * (COUNT // 100)
+    lines = registry.render().splitlines()
+
+    assert f"counter_total {total}" in lines
+    assert f'histogram_bucket{{le="1"}} {total // 2}' in lines
+    assert f'histogram_bucket{{le="+Inf"}} {total}' in lines
+    assert f"histogram_count {total}" in lines
+
+
+def test_observe_many() -> None:
+    """Test if 1M observations are counted like in a locked histogram."""
+    registry = Registry()
+    child = registry.histogram("histogram", "Histogram.").labels()
+    locked = legacy.LockedHistogram()
+    values = [(i % 100) / 10 for i in range(COUNT)]
+
+    for value in values:
+        child.observe(value)
+        locked.observe(value)
+
+    samples = [
+        line for line in registry.render().splitlines() if not line.startswith("#")
+    ]
+
+    assert samples == locked.render("histogram")
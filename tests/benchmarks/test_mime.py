@@ -0,0 +1,56 @@
+from collections.abc import Sequence
+
+from numbat.benchmarks import legacy
+from numbat.services.entities.prerecordings.utils import ContentTypeChecker
+from numbat.utils.mime import MimeType
+
+COUNT = 100_000
+
+VALUES = [
+    "audio/ogg",
+    "audio/ogg; codecs=opus",
+    "audio/mpeg",
+    "application/octet-stream",
+    'text/plain; charset="utf-8"',
+]
+
+
+def _make_values(count: int) -> Sequence[str]:
+    return [VALUES[i % len(VALUES)] for i in range(count)]
+
+
+def test_parse_equivalent() -> None:
+    """Test if cached parsing returns the same results as the parser."""
+    checker = ContentTypeChecker()
+
+    for value in VALUES:
+        assert MimeType.parse(value) == legacy.parse_content_type(value)
+        assert checker.parse(value) == legacy.check_content_type(value)
+
+    assert checker.parse(None) is None
+    assert checker.parse("not a mime type") is None
+
+
+def test_parse_many() -> None:
+    """Test if parsing 100k content types reuses a cached result for each value."""
+    values = _make_values(COUNT)
+    expected = {value: legacy.parse_content_type(value) for value in VALUES}
+
+    results = [MimeType.parse(value) for value in values]
+
+    assert results == [expected[value] for value in values]
+    assert len({id(result) for result in results}) == len(VALUES)
+
+
+def test_check_many() -> None:
+    """Test if checking 100k content types reuses a cached result for each value."""
+    values = _make_values(COUNT)
+    expected = {value: legacy.check_content_type(value) for value in VALUES}
+
+    checker = ContentTypeChecker()
+    results = [checker.parse(value) for value in values]
+
+    assert results == [expected[value] for value in values]
+    assert len({id(result) for result in results if result is not None}) == len(
+        [value for value in expected.values() if value is not None]
+    )
@@ -0,0 +1,90 @@
+from collections.abc import Callable
+from datetime import UTC, datetime
+from pathlib import Path
+
+import pytest
+
+from numbat.benchmarks import models as m
+from numbat.benchmarks.base import BenchmarkGroup
+from numbat.benchmarks.runner import (
+    BaselineComparator,
+    BaselineStore,
+    BenchmarkRunner,
+    BenchmarkSuite,
+)
+
+
+def _make_report(times: dict[str, float]) -> m.Report:
+    return m.Report(
+        created=datetime(2024, 1, 1, tzinfo=UTC),
+        python="3.13.0",
+        platform="test",
+        results=[
+            m.Result(
+                name=name,
+                group=BenchmarkGroup.MICRO,
+                rounds=[m.Round(operations=10, seconds=time * 10, bytes=0)],
+            )
+            for name, time in times.items()
+        ],
+    )
+
+
+def test_compare() -> None:
+    """Test if changes beyond the tolerance are flagged."""
+    baseline = _make_report({"slower": 1.0, "faster": 1.0, "same": 1.0, "gone": 1.0})
+    current = _make_report({"slower": 1.5, "faster": 0.5, "same": 1.1, "added": 1.0})
+
+    comparison = BaselineComparator(tolerance=0.2).compare(baseline, current)
+    statuses = {change.name: change.status for change in comparison.changes}
+
+    assert statuses == {
+        "slower": m.ChangeStatus.REGRESSION,
+        "faster": m.ChangeStatus.IMPROVEMENT,
+        "same": m.ChangeStatus.UNCHANGED,
+        "added": m.ChangeStatus.NEW,
+        "gone": m.ChangeStatus.MISSING,
+    }
+    assert [change.name for change in comparison.regressions] == ["slower"]
+
+
+def test_baseline_roundtrip(tmp_path: Path) -> None:
+    """Test if baselines are loaded the same as they were saved."""
+    store = BaselineStore()
+    report = _make_report({"a": 1.0, "b": 2.0})
+
+    store.save(tmp_path / "baseline.json", report)
+
+    assert store.load(tmp_path / "baseline.json") == report
+
+
+@pytest.mark.asyncio
+async def test_suite(
+    request: pytest.FixtureRequest, record_property: Callable[[str, object], None]
+) -> None:
+    """Run the benchmark suite and compare it with a baseline if one is given."""
+    options = request.config.option
+    full: bool = options.benchmark_full
+    save: Path | None = options.benchmark_save
+    compare: Path | None = options.benchmark_compare
+    tolerance: float = options.benchmark_tolerance
+
+    benchmarks = BenchmarkSuite(quick=not full).build()
+    report = await BenchmarkRunner().run(benchmarks)
+
+    assert [result.name for result in report.results] == [
+        benchmark.name for benchmark in benchmarks
+    ]
+
+    for result in report.results:
+        assert result.time > 0
+        record_property(result.name, result.time)
+
+    if save is not None:
+        BaselineStore().save(save, report)
+
+    if compare is not None:
+        baseline = BaselineStore().load(compare)
+        comparison = BaselineComparator(tolerance).compare(baseline, report)
+
+        assert not comparison.regressions, comparison.regressions
@@ -0,0 +1,47 @@
+from http import HTTPStatus
+
+import pytest
+from pydantic import ValidationError
+
+from numbat.benchmarks.macro import OfflineApp
+from numbat.config.models import AdminConfig
+
+PATH = "/admin/memory/stop"
+
+
+def test_token_required() -> None:
+    """Test if admin endpoints can't be enabled without a token."""
+    with pytest.raises(ValidationError):
+        AdminConfig(enabled=True)
+
+    AdminConfig(enabled=True, token="token")
+
+
+@pytest.mark.asyncio
+async def test_guard() -> None:
+    """Test if admin endpoints are only open to clients with the token."""
+    app = OfflineApp()
+    await app.start()
+
+    try:
+        state = app.app.state
+        state.config = state.config.model_copy(
+            update={"admin": AdminConfig.model_construct(enabled=True, token=None)}
+        )
+
+        response = await app.client.post(PATH)
+        assert response.status_code == HTTPStatus.UNAUTHORIZED
+
+        state.config = state.config.model_copy(
+            update={"admin": AdminConfig(enabled=True, token="token")}
+        )
+
+        response = await app.client.post(PATH)
+        assert response.status_code == HTTPStatus.UNAUTHORIZED
+
+        response = await app.client.post(
+            PATH, headers={"Authorization": "Bearer token"}
+        )
+        assert response.status_code == HTTPStatus.NO_CONTENT
+    finally:
+        await app.stop()
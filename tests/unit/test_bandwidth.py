@@ -0,0 +1,158 @@
+import asyncio
+from collections.abc import AsyncGenerator, Sequence
+from types import SimpleNamespace
+
+import pytest
+
+from numbat.api import bandwidth
+from numbat.api.bandwidth import BandwidthLimiter, TokenBucket
+from numbat.api.streams import Direction
+from numbat.config.models import BandwidthConfig, PriorityConfig
+from numbat.utils.metrics import Registry
+from numbat.utils.priority import Priority, prioritize
+
+
+class _Clock:
+    """Fake clock that only moves when sleeping."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+        self.sleeps: list[float] = []
+
+    def monotonic(self) -> float:
+        return self.now
+
+    async def sleep(self, delay: float) -> None:
+        self.sleeps.append(delay)
+        self.now += delay
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> _Clock:
+    """Replace time in the bandwidth module with a fake clock."""
+    clock = _Clock()
+    monkeypatch.setattr(bandwidth, "time", SimpleNamespace(monotonic=clock.monotonic))
+    monkeypatch.setattr(bandwidth, "asyncio", SimpleNamespace(sleep=clock.sleep))
+    return clock
+
+
+def _make_limiter(
+    config: BandwidthConfig, trusted: str | Sequence[str] | None = "*"
+) -> BandwidthLimiter:
+    return BandwidthLimiter(config, PriorityConfig(reserved=0.25), trusted, Registry())
+
+
+async def _transfer(
+    limiter: BandwidthLimiter, client: str, priority: Priority, chunks: int
+) -> None:
+    async def data() -> AsyncGenerator[bytes]:
+        for _ in range(chunks):
+            yield b"x" * 100
+
+    async def run() -> None:
+        prioritize(priority)
+        async for _ in limiter.limit(data(), client, Direction.DOWNLOAD):
+            pass
+
+    await asyncio.create_task(run())
+
+
+def test_bucket_debt(clock: _Clock) -> None:
+    """Test if a token bucket goes into debt and refills over time."""
+    bucket = TokenBucket(100, 100)
+
+    assert bucket.take(100) == 0
+    assert bucket.take(50) == 0.5  # noqa: PLR2004
+    assert not bucket.full
+
+    clock.now = 1
+
+    assert bucket.take(50) == 0
+    assert not bucket.full
+
+    clock.now = 2
+
+    assert bucket.full
+
+
+@pytest.mark.asyncio
+async def test_client_limit(clock: _Clock) -> None:
+    """Test if each client is limited separately."""
+    limiter = _make_limiter(BandwidthConfig(client=100, clients={"fast": 200}))
+
+    await _transfer(limiter, "a", Priority.NORMAL, 1)
+    await _transfer(limiter, "b", Priority.NORMAL, 1)
+    await _transfer(limiter, "fast", Priority.NORMAL, 2)
+
+    assert clock.sleeps == []
+
+    await _transfer(limiter, "a", Priority.NORMAL, 1)
+
+    assert clock.sleeps == [1]
+
+
+@pytest.mark.asyncio
+async def test_total_limit(clock: _Clock) -> None:
+    """Test if all clients share the total limit."""
+    limiter = _make_limiter(BandwidthConfig(total=200))
+
+    await _transfer(limiter, "a", Priority.NORMAL, 1)
+    await _transfer(limiter, "b", Priority.NORMAL, 1)
+
+    assert clock.sleeps == []
+
+    await _transfer(limiter, "c", Priority.NORMAL, 1)
+
+    assert clock.sleeps == [0.5]
+
+
+@pytest.mark.asyncio
+async def test_bulk_limit(clock: _Clock) -> None:
+    """Test if bulk transfers can't use the reserved share of the total limit."""
+    limiter = _make_limiter(BandwidthConfig(total=200))
+
+    await _transfer(limiter, "a", Priority.NORMAL, 2)
+
+    assert clock.sleeps == []
+
+    limiter = _make_limiter(BandwidthConfig(total=200))
+
+    await _transfer(limiter, "a", Priority.BULK, 2)
+
+    assert clock.sleeps == [pytest.approx(50 / 150)]
+
+
+@pytest.mark.asyncio
+async def test_urgent_bypass(clock: _Clock) -> None:
+    """Test if urgent transfers are not limited per client."""
+    limiter = _make_limiter(BandwidthConfig(client=100, total=1000))
+
+    await _transfer(limiter, "a", Priority.URGENT, 3)
+
+    assert clock.sleeps == []
+
+    await _transfer(limiter, "a", Priority.NORMAL, 2)
+
+    assert clock.sleeps == [1]
+
+
+def test_identify() -> None:
+    """Test if the identity header is only honoured from trusted addresses."""
+    config = BandwidthConfig(identity="X-Client")
+    headers = {"X-Client": "client"}
+
+    limiter = _make_limiter(config, "10.0.0.0/8, proxy")
+
+    assert limiter.identify(headers, "10.1.2.3") == "client"
+    assert limiter.identify(headers, "proxy") == "client"
+    assert limiter.identify(headers, "192.168.0.1") == "192.168.0.1"
+    assert limiter.identify(headers, None) == ""
+    assert limiter.identify({}, "10.1.2.3") == "10.1.2.3"
+
+    limiter = _make_limiter(config, "*")
+
+    assert limiter.identify(headers, "192.168.0.1") == "client"
+
+    limiter = _make_limiter(config, None)
+
+    assert limiter.identify(headers, "10.1.2.3") == "10.1.2.3"
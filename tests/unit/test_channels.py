@@ -0,0 +1,136 @@
+import asyncio
+from pathlib import Path
+
+import pytest
+
+from numbat.api.channels import (
+    FrameCodec,
+    Operation,
+    SocketChannelsBackend,
+    SocketChannelsBroker,
+)
+from numbat.utils.stamps import Stamper
+
+CHANNEL = "events"
+
+
+@pytest.mark.asyncio
+async def test_broker_stamps(tmp_path: Path) -> None:
+    """Test if events from all clients are numbered in the order they are forwarded."""
+    path = tmp_path / "channels.sock"
+    broker = SocketChannelsBroker(path, stamped=[CHANNEL])
+    await broker.start()
+
+    first = SocketChannelsBackend(path)
+    second = SocketChannelsBackend(path)
+    await first.on_startup()
+    await second.on_startup()
+
+    try:
+        await first.subscribe([CHANNEL])
+        events = first.stream_events()
+
+        # The second client stamps its event first, but publishes it last
+        late = Stamper().stamp(b"late")
+        early = Stamper().stamp(b"early")
+
+        await first.publish(early, [CHANNEL])
+        _, received = await anext(events)
+        await second.publish(late, [CHANNEL])
+        _, other = await anext(events)
+
+        stamped = [Stamper.unstamp(received), Stamper.unstamp(other)]
+
+        assert [stamp[1] for stamp in stamped if stamp] == [b"early", b"late"]
+        assert [stamp[0] for stamp in stamped if stamp] == sorted(
+            stamp[0] for stamp in stamped if stamp
+        )
+    finally:
+        await second.on_shutdown()
+        await first.on_shutdown()
+        await broker.stop()
+
+
+@pytest.mark.asyncio
+async def test_slow_client(tmp_path: Path) -> None:
+    """Test if a client that doesn't read holds up no one and gets disconnected."""
+    path = tmp_path / "channels.sock"
+    broker = SocketChannelsBroker(path, queue=4, timeout=0.1)
+    await broker.start()
+
+    codec = FrameCodec()
+    reader, writer = await asyncio.open_unix_connection(path)
+    writer.write(codec.encode(Operation.SUBSCRIBE, [CHANNEL]))
+    await writer.drain()
+
+    backend = SocketChannelsBackend(path)
+    await backend.on_startup()
+
+    try:
+        await backend.subscribe([CHANNEL])
+        events = backend.stream_events()
+        payload = bytes(1024**2)
+
+        for _ in range(32):
+            await backend.publish(payload, [CHANNEL])
+            _, received = await asyncio.wait_for(anext(events), 5)
+
+            assert received == payload
+
+        # Everything the slow client got before it was disconnected
+        await asyncio.wait_for(reader.read(), 5)
+
+        assert reader.at_eof()
+    finally:
+        writer.close()
+        await backend.on_shutdown()
+        await broker.stop()
+
+
+@pytest.mark.asyncio
+async def test_reconnect(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test if a backend reconnects to the broker and marks the gap in events."""
+    monkeypatch.setattr(SocketChannelsBackend, "DELAYS", (0.01, 0.01))
+
+    path = tmp_path / "channels.sock"
+    broker = SocketChannelsBroker(path)
+    await broker.start()
+
+    backend = SocketChannelsBackend(path)
+    await backend.on_startup()
+
+    try:
+        await backend.subscribe([CHANNEL])
+        events = backend.stream_events()
+
+        await broker.stop()
+
+        assert await asyncio.wait_for(anext(events), 5) == (CHANNEL, Stamper.GAP)
+
+        await backend.publish(b"lost", [CHANNEL])
+        await broker.start()
+
+        assert await asyncio.wait_for(anext(events), 5) == (CHANNEL, Stamper.GAP)
+
+        await backend.publish(b"event", [CHANNEL])
+
+        assert await asyncio.wait_for(anext(events), 5) == (CHANNEL, b"event")
+    finally:
+        await backend.on_shutdown()
+        await broker.stop()
+
+
+def test_restamp() -> None:
+    """Test if restamping keeps the payload and increases the identifier."""
+    stamper = Stamper()
+    message = stamper.stamp(b"payload")
+    restamped = stamper.restamp(message)
+
+    first = Stamper.unstamp(message)
+    second = Stamper.unstamp(restamped)
+
+    assert first is not None
+    assert second is not None
+    assert second[1] == first[1] == b"payload"
+    assert second[0] > first[0]
+    assert Stamper.unstamp(b"short") is None
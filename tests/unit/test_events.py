@@ -0,0 +1,207 @@
+import time
+from datetime import datetime
+from uuid import UUID, uuid4
+
+import pytest
+from litestar.channels import ChannelsPlugin
+
+from numbat.benchmarks.macro import OfflineApp
+from numbat.config.models import EventsConfig, SlowSubscriberPolicy
+from numbat.models.events import prerecordings as pev
+from numbat.models.events import test as ev
+from numbat.models.events.enums import EventType
+from numbat.services.events import models as m
+from numbat.services.events.channels import EventsChannels
+from numbat.services.events.dispatcher import Subscription
+from numbat.services.events.service import EventsService
+from numbat.utils.metrics import Registry
+from numbat.utils.stamps import Stamper
+
+
+def _make_message(number: int, event: UUID) -> m.Message:
+    return m.Message(
+        id=number,
+        event=pev.PrerecordingUploadedEvent(
+            data=pev.PrerecordingUploadedEventData(
+                event=event, start=datetime(2024, 1, 1), size=1, tag="tag"
+            )
+        ),
+        frame=b"frame",
+    )
+
+
+def _make_subscription(
+    config: EventsConfig, event: UUID | None = None, registry: Registry | None = None
+) -> Subscription:
+    registry = registry if registry is not None else Registry()
+    evictions = registry.counter("evictions", "Evictions.", ["policy"])
+    return Subscription(None, event, config, evictions)
+
+
+@pytest.mark.asyncio
+async def test_replay_types() -> None:
+    """Test if a client resuming with a filter gets all missed events of its types."""
+    app = OfflineApp()
+    await app.start()
+
+    try:
+        service = EventsService(app.app.state.dispatcher)
+
+        # Recording of history starts with the first event
+        await app.upload(b"data", 0)
+        last = str(time.time_ns())
+
+        await app.upload(b"data", 1)
+        await app.client.delete(app.path(0))
+        await app.upload(b"data", 2)
+
+        response = await service.subscribe(
+            m.SubscribeRequest(types={EventType.PRERECORDING_UPLOADED}, last=last)
+        )
+        messages = aiter(response.messages)
+        replayed = [await anext(messages) for _ in range(2)]
+
+        assert [
+            message.event.type if isinstance(message, m.Message) else None
+            for message in replayed
+        ] == [EventType.PRERECORDING_UPLOADED] * 2
+    finally:
+        await app.stop()
+
+
+@pytest.mark.asyncio
+async def test_replay_resync() -> None:
+    """Test if a client too far behind is told to resync and the stream ends."""
+    app = OfflineApp()
+    await app.start()
+
+    try:
+        service = EventsService(app.app.state.dispatcher)
+        response = await service.subscribe(m.SubscribeRequest(last="1"))
+
+        assert isinstance(await anext(response.messages), m.Resync)
+
+        with pytest.raises(StopAsyncIteration):
+            await anext(response.messages)
+    finally:
+        await app.stop()
+
+
+@pytest.mark.asyncio
+async def test_routing() -> None:
+    """Test if events are only queued for subscriptions that want their type."""
+    app = OfflineApp()
+    await app.start()
+
+    try:
+        dispatcher = app.app.state.dispatcher
+
+        async with (
+            dispatcher.subscribe({EventType.TEST}) as typed,
+            dispatcher.subscribe(None) as untyped,
+        ):
+            await app.upload(b"data", 0)
+            await dispatcher.publish(ev.TestEvent(data=ev.TestEventData(message="x")))
+
+            received = [await untyped.get() for _ in range(2)]
+
+            assert [
+                message.event.type if isinstance(message, m.Message) else None
+                for message in received
+            ] == [EventType.PRERECORDING_UPLOADED, EventType.TEST]
+
+            message = await typed.get()
+
+            assert isinstance(message, m.Message)
+            assert message.event.type == EventType.TEST
+            assert typed.depth == 0
+    finally:
+        await app.stop()
+
+
+@pytest.mark.asyncio
+async def test_gap() -> None:
+    """Test if subscriptions resync and history is forgotten when events are lost."""
+    app = OfflineApp()
+    await app.start()
+
+    try:
+        dispatcher = app.app.state.dispatcher
+
+        await app.upload(b"data", 0)
+        last = str(time.time_ns())
+
+        async with dispatcher.subscribe(None) as subscription:
+            app.app.plugins.get(ChannelsPlugin).publish(Stamper.GAP, EventsChannels.ALL)
+
+            assert isinstance(await subscription.get(), m.Resync)
+
+        async with dispatcher.subscribe(None, last) as subscription:
+            assert [type(message) for message in subscription.replay] == [m.Resync]
+    finally:
+        await app.stop()
+
+
+@pytest.mark.asyncio
+async def test_event_filter() -> None:
+    """Test if events about other events don't take up room in the queue."""
+    wanted = uuid4()
+    subscription = _make_subscription(EventsConfig(queue=1), wanted)
+
+    for i in range(10):
+        subscription.offer(_make_message(i, uuid4()))
+
+    subscription.offer(_make_message(10, wanted))
+
+    message = await subscription.get()
+
+    assert isinstance(message, m.Message)
+    assert message.id == 10  # noqa: PLR2004
+    assert subscription.depth == 0
+
+
+@pytest.mark.asyncio
+async def test_overflow_drop() -> None:
+    """Test if a full queue drops the oldest events and counts the evictions."""
+    registry = Registry()
+    event = uuid4()
+    subscription = _make_subscription(
+        EventsConfig(queue=2, policy=SlowSubscriberPolicy.DROP), registry=registry
+    )
+
+    for i in range(5):
+        subscription.offer(_make_message(i, event))
+
+    received = [await subscription.get() for _ in range(subscription.depth)]
+
+    assert [
+        message.id if isinstance(message, m.Message) else None for message in received
+    ] == [3, 4]
+    assert 'evictions_total{policy="drop"} 3' in registry.render().splitlines()
+
+
+@pytest.mark.asyncio
+async def test_overflow_disconnect() -> None:
+    """Test if a full queue is replaced with a resync marker and nothing after it."""
+    registry = Registry()
+    event = uuid4()
+    subscription = _make_subscription(
+        EventsConfig(queue=2, policy=SlowSubscriberPolicy.DISCONNECT),
+        registry=registry,
+    )
+
+    for i in range(5):
+        subscription.offer(_make_message(i, event))
+
+    assert subscription.depth == 1
+    assert isinstance(await subscription.get(), m.Resync)
+    assert subscription.size == 0
+    assert 'evictions_total{policy="disconnect"} 1' in registry.render().splitlines()
+
+
+@pytest.mark.asyncio
+async def test_heartbeat() -> None:
+    """Test if an idle subscription gets a heartbeat."""
+    subscription = _make_subscription(EventsConfig(heartbeat=0.01))
+
+    assert isinstance(await subscription.get(), m.Heartbeat)
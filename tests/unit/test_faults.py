@@ -0,0 +1,199 @@
+import statistics
+from collections.abc import AsyncGenerator
+from http import HTTPStatus
+from typing import override
+
+import pytest
+from httpx import AsyncBaseTransport, AsyncClient, Request, Response
+from minio.error import S3Error
+
+from numbat.benchmarks.macro import OfflineApp
+from numbat.config.models import (
+    AmberBackendType,
+    AmberConfig,
+    AmberMemoryConfig,
+    FaultConfig,
+    FaultsConfig,
+    LatencyDistribution,
+    PriorityConfig,
+)
+from numbat.services.apis.beaver.faults import FaultyBeaverTransport
+from numbat.services.data.amber import errors as ae
+from numbat.services.data.amber import models as am
+from numbat.services.data.amber.fake import MemoryMinio
+from numbat.services.data.amber.faults import FaultyMinio
+from numbat.services.data.amber.service import AmberService
+from numbat.utils.faults import FaultInjector, FaultOutcome
+from numbat.utils.metrics import Registry
+from numbat.utils.tracing import Tracer
+
+COUNT = 10_000
+
+
+def _make_config(seed: int | None) -> FaultsConfig:
+    return FaultsConfig(
+        enabled=True,
+        seed=seed,
+        operations={
+            "get": FaultConfig(
+                distribution=LatencyDistribution.LOGNORMAL,
+                latency=0.1,
+                deviation=0.2,
+                errors=0.1,
+                timeouts=0.05,
+            )
+        },
+    )
+
+
+def test_reproducible() -> None:
+    """Test if faults with the same seed are the same, however operations interleave."""
+    first = FaultInjector(_make_config(seed=1))
+    second = FaultInjector(_make_config(seed=1))
+    other = FaultInjector(_make_config(seed=2))
+
+    drawn = [first.draw("get") for _ in range(100)]
+    interleaved = []
+
+    for _ in range(100):
+        second.draw("stat")
+        interleaved.append(second.draw("get"))
+
+    assert drawn == interleaved
+    assert drawn != [other.draw("get") for _ in range(100)]
+
+
+def test_distribution() -> None:
+    """Test if drawn faults follow the configured rates and latency distribution."""
+    injector = FaultInjector(_make_config(seed=1))
+    faults = [injector.draw("get") for _ in range(COUNT)]
+    latencies = [fault.latency for fault in faults]
+    outcomes = [fault.outcome for fault in faults]
+
+    assert statistics.mean(latencies) == pytest.approx(0.1, rel=0.2)
+    assert statistics.stdev(latencies) == pytest.approx(0.2, rel=0.5)
+    assert outcomes.count(FaultOutcome.ERROR) / COUNT == pytest.approx(0.1, abs=0.02)
+    assert outcomes.count(FaultOutcome.TIMEOUT) / COUNT == pytest.approx(0.05, abs=0.02)
+
+    other = injector.draw("stat")
+
+    assert other.latency == 0
+    assert other.outcome == FaultOutcome.SUCCESS
+
+
+def test_minio_errors() -> None:
+    """Test if injected errors look like server errors of the amber database."""
+    client = FaultyMinio(
+        MemoryMinio(AmberMemoryConfig()),
+        FaultsConfig(enabled=True, operations={"stat": FaultConfig(errors=1)}),
+    )
+
+    with pytest.raises(S3Error) as error:
+        client.stat_object("bucket", "object")
+
+    assert error.value.response.status == 503  # noqa: PLR2004
+
+    client.remove_object("bucket", "object")
+
+
+async def _generate(data: bytes) -> AsyncGenerator[bytes]:
+    yield data
+
+
+@pytest.mark.asyncio
+async def test_amber_service_errors() -> None:
+    """Test if injected faults reach callers of the amber service as service errors."""
+    config = AmberConfig(
+        backend=AmberBackendType.MEMORY,
+        faults=FaultsConfig(
+            enabled=True,
+            operations={
+                "delete": FaultConfig(errors=1),
+                "get": FaultConfig(timeouts=1),
+                "stat": FaultConfig(errors=1),
+            },
+        ),
+    )
+    amber = AmberService(config, PriorityConfig(), Registry(), Tracer())
+
+    try:
+        await amber.upload(
+            am.UploadRequest(
+                name="object",
+                content=am.UploadContent(type="audio/ogg", data=_generate(b"data")),
+            )
+        )
+
+        for call in [
+            amber.get(am.GetRequest(name="object")),
+            amber.download(am.DownloadRequest(name="object")),
+            amber.delete(am.DeleteRequest(name="object")),
+        ]:
+            with pytest.raises(ae.ServiceError) as error:
+                await call
+
+            assert not isinstance(error.value, ae.NotFoundError)
+    finally:
+        amber.close()
+
+
+@pytest.mark.asyncio
+async def test_app_failed_delete() -> None:
+    """Test if a delete that failed in the amber database fails the request."""
+    app = OfflineApp(
+        amber=FaultsConfig(enabled=True, operations={"delete": FaultConfig(errors=1)})
+    )
+
+    await app.start()
+
+    try:
+        await app.upload(b"data")
+
+        response = await app.client.delete(app.path())
+        assert response.status_code == HTTPStatus.INTERNAL_SERVER_ERROR
+
+        response = await app.client.head(app.path())
+        assert response.status_code == HTTPStatus.OK
+    finally:
+        await app.stop()
+
+
+@pytest.mark.asyncio
+async def test_app_upload_without_details() -> None:
+    """Test if an upload succeeds when its details can't be read back."""
+    app = OfflineApp(
+        amber=FaultsConfig(enabled=True, operations={"stat": FaultConfig(errors=1)})
+    )
+
+    await app.start()
+
+    try:
+        await app.upload(b"data")
+    finally:
+        await app.stop()
+
+
+class _ClosingTransport(AsyncBaseTransport):
+    def __init__(self) -> None:
+        self.closed = False
+
+    @override
+    async def handle_async_request(self, request: Request) -> Response:
+        return Response(HTTPStatus.OK, content=b"{}")
+
+    @override
+    async def aclose(self) -> None:
+        self.closed = True
+
+
+@pytest.mark.asyncio
+async def test_beaver_transport_closed() -> None:
+    """Test if the transport wrapped with faults is closed together with the client."""
+    inner = _ClosingTransport()
+    transport = FaultyBeaverTransport(inner, FaultInjector(FaultsConfig(enabled=True)))
+
+    async with AsyncClient(base_url="http://beaver", transport=transport) as client:
+        response = await client.get("/events/event")
+
+    assert response.status_code == HTTPStatus.OK
+    assert inner.closed
@@ -0,0 +1,14 @@
+from numbat.utils.metrics import Registry
+
+
+def test_constant_labels() -> None:
+    """Test if labels of the registry are added to all samples."""
+    registry = Registry(labels={"worker": "1"})
+    registry.counter("counter", "Counter.", ["kind"]).labels(kind="a").inc()
+    registry.histogram("histogram", "Histogram.", buckets=[1]).observe(0.5)
+
+    lines = registry.render().splitlines()
+
+    assert 'counter_total{worker="1",kind="a"} 1' in lines
+    assert 'histogram_bucket{worker="1",le="1"} 1' in lines
+    assert 'histogram_count{worker="1"} 1' in lines
@@ -0,0 +1,35 @@
+import asyncio
+import threading
+
+import pytest
+
+from numbat.config.models import MonitorConfig
+from numbat.utils.metrics import Registry
+from numbat.utils.monitor import LoopMonitor
+
+
+@pytest.mark.asyncio
+async def test_default_executor() -> None:
+    """Test if replaced default executors are shut down."""
+    monitor = LoopMonitor(config=MonitorConfig(), executors={}, metrics=Registry())
+    threads: list[threading.Thread] = []
+
+    def work() -> None:
+        threads.append(threading.current_thread())
+
+    await asyncio.to_thread(work)
+
+    monitor.start()
+    await asyncio.to_thread(work)
+
+    monitor.stop()
+    await asyncio.to_thread(work)
+
+    first, instrumented, plain = threads
+
+    first.join(timeout=5)
+    instrumented.join(timeout=5)
+
+    assert not first.is_alive()
+    assert not instrumented.is_alive()
+    assert plain.is_alive()
@@ -0,0 +1,91 @@
+import asyncio
+from contextlib import AsyncExitStack
+
+import pytest
+
+from numbat.utils.metrics import Registry
+from numbat.utils.priority import Priority, PriorityLimiter
+
+
+def _make_limiter(capacity: int, reserved: float = 0) -> PriorityLimiter:
+    wait = Registry().histogram("wait", "Wait.", ["priority"])
+    return PriorityLimiter(capacity, reserved, wait)
+
+
+async def _settle() -> None:
+    for _ in range(10):
+        await asyncio.sleep(0)
+
+
+@pytest.mark.asyncio
+async def test_urgent_first() -> None:
+    """Test if urgent work waiting for a slot goes before bulk work queued earlier."""
+    limiter = _make_limiter(1)
+    order: list[Priority] = []
+
+    async def work(priority: Priority) -> None:
+        async with limiter.slot(priority):
+            order.append(priority)
+
+    async with limiter.slot(Priority.NORMAL):
+        bulk = asyncio.create_task(work(Priority.BULK))
+        await _settle()
+        urgent = asyncio.create_task(work(Priority.URGENT))
+        await _settle()
+
+        assert limiter.waiting == 2  # noqa: PLR2004
+
+    await asyncio.gather(bulk, urgent)
+
+    assert order == [Priority.URGENT, Priority.BULK]
+
+
+@pytest.mark.asyncio
+async def test_bulk_cap() -> None:
+    """Test if bulk work can't use the reserved share of the capacity."""
+    limiter = _make_limiter(4, reserved=0.25)
+
+    async with AsyncExitStack() as stack:
+        for _ in range(3):
+            await stack.enter_async_context(limiter.slot(Priority.BULK))
+
+        bulk = asyncio.create_task(
+            stack.enter_async_context(limiter.slot(Priority.BULK))
+        )
+        await _settle()
+
+        assert not bulk.done()
+        assert limiter.waiting == 1
+
+        async with asyncio.timeout(1), limiter.slot(Priority.URGENT):
+            assert limiter.waiting == 1
+
+        bulk.cancel()
+
+        with pytest.raises(asyncio.CancelledError):
+            await bulk
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter() -> None:
+    """Test if a waiter cancelled right after getting a slot gives the slot back."""
+    limiter = _make_limiter(1)
+    holder = limiter.slot(Priority.NORMAL)
+    await holder.__aenter__()
+
+    async def work() -> None:
+        async with limiter.slot(Priority.NORMAL):
+            pass
+
+    waiter = asyncio.create_task(work())
+    await _settle()
+
+    # The slot is handed over to the waiter, which is cancelled before it runs
+    await holder.__aexit__(None, None, None)
+    waiter.cancel()
+
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+
+    async with asyncio.timeout(1), limiter.slot(Priority.NORMAL):
+        assert limiter.waiting == 0
@@ -0,0 +1,37 @@
+from datetime import UTC, datetime, timedelta
+
+from numbat.services.entities.prerecordings.utils import WindowPlanner
+
+
+def _make_planner() -> WindowPlanner:
+    return WindowPlanner(gap=timedelta(days=1), span=timedelta(days=31))
+
+
+def _day(day: int, hour: int = 0) -> datetime:
+    return datetime(2024, 1, 1, hour, tzinfo=UTC) + timedelta(days=day)
+
+
+def test_adjacent() -> None:
+    """Test if adjacent days are merged into one window."""
+    windows = _make_planner().plan([_day(1, 12), _day(0, 8), _day(0, 20)])
+
+    assert windows == [(_day(0), _day(2))]
+
+
+def test_gapped() -> None:
+    """Test if days are merged only across gaps of at most one day."""
+    windows = _make_planner().plan([_day(0), _day(2), _day(5)])
+
+    assert windows == [(_day(0), _day(3)), (_day(5), _day(6))]
+
+
+def test_overlong() -> None:
+    """Test if windows are split when they would span more than 31 days."""
+    windows = _make_planner().plan([_day(day) for day in range(0, 40, 2)])
+
+    assert windows == [(_day(0), _day(31)), (_day(32), _day(39))]
+
+
+def test_empty() -> None:
+    """Test if no windows are planned without any days."""
+    assert _make_planner().plan([]) == []